@@ -0,0 +1,89 @@
+"""Cache hit ratio on a replayed query log, with and without canonical keys.
+
+Usage:
+    python benchmarks/bench_cache_hit_ratio.py
+    python benchmarks/bench_cache_hit_ratio.py --log my_queries.jsonl
+
+The log holds one `search_uniprot` call per line, as JSON with `query`,
+`fields`, `size` and optionally `include_isoform` and `sort`. The verbatim
+ratio counts a hit when the exact same parameters were seen before, which
+is how requests were keyed before canonicalization. The canonical ratio is
+measured by replaying the log through `search_uniprot` against a stand-in
+server with an empty cache, counting the requests that reached it.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from fake_uniprot import FakeUniProt, search_handler
+
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "query_log.jsonl")
+
+
+def load_log(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def verbatim_hits(calls: List[Dict[str, Any]]) -> int:
+    from uniprot_mcp.tools.search_uniprot import build_search_params
+
+    seen, hits = set(), 0
+    for call in calls:
+        params = build_search_params(
+            call["query"], call.get("fields"), call.get("size"), call.get("include_isoform"), call.get("sort")
+        )
+        key = json.dumps(params, sort_keys=True)
+        hits += key in seen
+        seen.add(key)
+    return hits
+
+
+async def replay(base_url: str, server: FakeUniProt, calls: List[Dict[str, Any]]) -> tuple[int, float]:
+    from uniprot_mcp.tools import search_uniprot as module
+
+    module.BASE_URL = f"{base_url}/uniprotkb"
+    start = time.perf_counter()
+    for call in calls:
+        await module.search_uniprot(
+            call["query"],
+            call.get("fields"),
+            call.get("size"),
+            call.get("include_isoform"),
+            call.get("sort"),
+        )
+        # Let background cache writes land before the next call, as they
+        # would between the turns of an agent
+        await asyncio.sleep(0.002)
+    return len(calls) - server.requests, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", default=DEFAULT_LOG)
+    args = parser.parse_args()
+
+    os.environ["CACHE_DIR"] = tempfile.mkdtemp(prefix="uniprot-bench-")
+    from uniprot_mcp.settings import settings
+    from uniprot_mcp.utils.cache import get_cache_stats
+
+    settings.RATE_LIMIT_PER_SECOND = 0
+    calls = load_log(args.log)
+
+    with FakeUniProt(search_handler(10)) as server:
+        canonical, elapsed = asyncio.run(replay(server.url, server, calls))
+
+    verbatim = verbatim_hits(calls)
+    superset_hits = get_cache_stats()["superset"]["hits"]
+    print(f"{len(calls)} calls replayed from {os.path.basename(args.log)} in {elapsed:.2f} s")
+    print(f"verbatim keys   hits {verbatim:>5}  ratio {verbatim / len(calls):6.1%}")
+    print(f"canonical keys  hits {canonical:>5}  ratio {canonical / len(calls):6.1%}  (superset hits {superset_hits})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure event-loop stalls caused by disk cache access under concurrent load.
+
+Usage:
+    python benchmarks/bench_cache_stall.py --tasks 50 --ops 40 --size 40000
+
+A ticker task sleeps 1 ms in a loop and records how late it wakes up; any
+lateness is time the loop spent blocked. The same read/write workload runs
+once with direct (blocking) diskcache calls and once through the async facade.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+from uniprot_mcp.settings import settings
+
+TICK = 0.001
+
+
+async def ticker(stalls: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        stalls.append(max(0.0, time.perf_counter() - start - TICK))
+
+
+async def blocking_worker(worker: int, ops: int, content: str) -> None:
+    from uniprot_mcp.utils.cache import cache_response, get_cache_response
+
+    for op in range(ops):
+        key = f"blocking-{worker}-{op % 8}"
+        if get_cache_response(key)[0] is None:
+            cache_response(key, content, 60)
+        await asyncio.sleep(0.002)
+
+
+async def async_worker(worker: int, ops: int, content: str) -> None:
+    from uniprot_mcp.utils.cache import aget_cache_response, cache_response_in_background
+
+    for op in range(ops):
+        key = f"async-{worker}-{op % 8}"
+        if (await aget_cache_response(key))[0] is None:
+            cache_response_in_background(key, content, 60)
+        await asyncio.sleep(0.002)
+
+
+async def run(worker, tasks: int, ops: int, content: str) -> List[float]:
+    stalls: List[float] = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(stalls, stop))
+    await asyncio.gather(*(worker(i, ops, content) for i in range(tasks)))
+    stop.set()
+    await tick
+    return stalls
+
+
+def report(name: str, stalls: List[float], elapsed: float) -> None:
+    quantiles = statistics.quantiles(stalls, n=100) if len(stalls) > 1 else [0.0] * 99
+    print(
+        f"{name:<10} elapsed {elapsed:>6.2f} s  ticks {len(stalls):>6}"
+        f"  stall p50 {quantiles[49] * 1000:>7.2f} ms  p99 {quantiles[98] * 1000:>7.2f} ms"
+        f"  max {max(stalls, default=0) * 1000:>7.2f} ms  total {sum(stalls):>6.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--ops", type=int, default=40)
+    parser.add_argument("--size", type=int, default=40_000, help="bytes per cached response")
+    args = parser.parse_args()
+
+    settings.CACHE_DIR = tempfile.mkdtemp(prefix="uniprot-bench-")
+    content = os.urandom(args.size // 2).hex()
+
+    for name, worker in (("blocking", blocking_worker), ("async", async_worker)):
+        start = time.perf_counter()
+        stalls = asyncio.run(run(worker, args.tasks, args.ops, content))
+        report(name, stalls, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
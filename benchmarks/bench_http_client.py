@@ -0,0 +1,75 @@
+"""Compare a fresh client per request against the shared pooled client.
+
+Usage:
+    python benchmarks/bench_http_client.py --requests 200 --concurrency 10 --connect-delay 0.05
+
+`--connect-delay` stalls every new connection on the stand-in server to
+emulate the TCP + TLS handshake round trips to rest.uniprot.org.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+import httpx
+from fake_uniprot import FakeUniProt
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.utils.http import call_http, close_http_client
+
+
+async def per_request_client(url: str) -> int:
+    """The previous behaviour: a new client (and connection) for every call."""
+    async with httpx.AsyncClient(verify=False, http2=False, timeout=10, trust_env=False) as client:
+        resp = await client.get(url, params={"query": "insulin"})
+        return resp.status_code
+
+
+async def shared_client(url: str) -> int:
+    status, _, _ = await call_http("GET", url, params={"query": "insulin"})
+    return status
+
+
+async def drive(fetch: Callable[[str], Awaitable[int]], url: str, requests: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await fetch(url)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    await close_http_client()
+    return latencies
+
+
+def report(name: str, latencies: List[float], elapsed: float, connections: int) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<20} {len(latencies) / elapsed:>9.1f} req/s"
+        f"  p50 {quantiles[49] * 1000:>7.2f} ms  p99 {quantiles[98] * 1000:>7.2f} ms"
+        f"  connections {connections:>5}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--connect-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    settings.RATE_LIMIT_PER_SECOND = 0  # measure the client, not the limiter
+    for name, fetch in (("per-request client", per_request_client), ("shared client", shared_client)):
+        with FakeUniProt(connect_delay=args.connect_delay) as server:
+            start = time.perf_counter()
+            latencies = asyncio.run(drive(fetch, f"{server.url}/uniprotkb/search", args.requests, args.concurrency))
+            report(name, latencies, time.perf_counter() - start, server.connections)
+
+
+if __name__ == "__main__":
+    main()
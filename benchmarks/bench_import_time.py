@@ -0,0 +1,91 @@
+"""Cold-start import time of the CLI and server, checked against a budget.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --runs 9 --update
+
+Each target module is imported in a fresh interpreter under
+`python -X importtime`, and the median cumulative time over several runs is
+compared with `import_budget.json`. The check also fails if a module that
+is meant to load lazily (the model graph, diskcache, ...) was imported.
+The exit status is non-zero if any budget is exceeded.
+
+Budgets are in milliseconds and depend on the machine; after a deliberate
+change, re-baseline with `--update` (which writes the measured medians
+plus `--headroom`).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of `module` in a fresh interpreter."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    for line in stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"{module} missing from -X importtime output")
+
+
+def loaded_modules(module: str, candidates: List[str]) -> List[str]:
+    """Return which of `candidates` are in sys.modules after importing `module`."""
+    code = f"import sys, {module}; print(','.join(m for m in {candidates!r} if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return [name for name in output.split(",") if name]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update", action="store_true", help="Rewrite the budget from this machine's medians")
+    parser.add_argument("--headroom", type=float, default=1.5)
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE) as f:
+        budget: Dict[str, Dict] = json.load(f)
+
+    failed = False
+    for module, target in budget.items():
+        import_time_ms(module)  # warm the OS file cache
+        median = statistics.median(import_time_ms(module) for _ in range(args.runs))
+        eager = loaded_modules(module, target.get("lazy", []))
+
+        if args.update:
+            target["budget_ms"] = round(median * args.headroom)
+        over = median > target["budget_ms"]
+        failed |= over or bool(eager)
+        print(
+            f"{module:<22} median {median:>7.1f} ms  budget {target['budget_ms']:>5} ms"
+            f"  {'OVER BUDGET' if over else 'ok'}"
+        )
+        if eager:
+            print(f"{'':<22} imported eagerly: {', '.join(eager)}")
+
+    if args.update:
+        with open(BUDGET_FILE, "w") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+    sys.exit(1 if failed and not args.update else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Parse throughput of the full search response model vs. field projections.
+
+Usage:
+    python benchmarks/bench_projection.py --entries 500
+    python benchmarks/bench_projection.py --payload recorded.json --fields accession,sequence
+
+Without --payload, synthetic full entries are used. Each field set is parsed
+twice: from the full payload, as when a broad cached response is reused or
+UniProt returns more than asked for, and from a payload trimmed to the keys
+the fields populate, as UniProt sends for that request.
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from fake_uniprot import make_entry
+
+from uniprot_mcp.tools.models import UniProtSearchResponse
+from uniprot_mcp.tools.projection import entry_keys, projected_response_model
+
+FIELD_SETS = [
+    "accession",
+    "accession,gene_names,organism_name",
+    "accession,sequence,length",
+    "accession,protein_name,cc_function,ft_chain",
+]
+
+
+def entries_per_second(fn: Callable[[], Any], entries: int, min_time: float = 0.5) -> float:
+    runs, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time:
+        fn()
+        runs += 1
+    return runs * entries / elapsed
+
+
+def trim(payload: Dict[str, Any], keys: tuple[str, ...]) -> Dict[str, Any]:
+    return {"results": [{k: v for k, v in entry.items() if k in keys} for entry in payload["results"]]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=500)
+    parser.add_argument("--payload", help="Recorded UniProt search response (JSON)")
+    parser.add_argument("--fields", nargs="+", default=FIELD_SETS)
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload) as f:
+            payload = json.load(f)
+    else:
+        payload = {"results": [make_entry(i) for i in range(args.entries)]}
+    entries = len(payload["results"])
+
+    print(f"{entries} entries; entries/s with the full model vs. the projection")
+    print(f"{'fields':<44} {'payload':<8} {'full':>10} {'projected':>10} {'speedup':>8}")
+    for fields in args.fields:
+        field_list: List[str] = fields.split(",")
+        keys = entry_keys(field_list)
+        model = projected_response_model(field_list)
+        for name, body in (("full", payload), ("trimmed", trim(payload, keys or ()))):
+            if keys is None and name == "trimmed":
+                continue
+            text = json.dumps(body)
+            full = entries_per_second(lambda: UniProtSearchResponse.model_validate_json(text), entries)
+            projected = entries_per_second(lambda: model.model_validate_json(text), entries)
+            print(f"{fields:<44} {name:<8} {full:>10.0f} {projected:>10.0f} {projected / full:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Size and cost of serializing search_uniprot results.
+
+Usage:
+    python benchmarks/bench_serialization.py --entries 1 25 500
+
+Compares the former output (each entry dumped to a JSON string, then the
+list of strings dumped again) with a single `model_dump_json` pass and with
+the `raw=True` passthrough of the upstream body. "serialize" starts from an
+already parsed response, as on an in-memory cache hit; "parse+serialize"
+starts from the upstream text, as on a disk cache hit or a fresh request.
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from fake_uniprot import make_entry
+
+from uniprot_mcp.tools.models import UniProtSearchResponse
+
+
+def double_encoded(parsed: UniProtSearchResponse) -> str:
+    return json.dumps({"results": [entry.model_dump_json(exclude_none=True) for entry in parsed.results]})
+
+
+def single_pass(parsed: UniProtSearchResponse) -> str:
+    return parsed.model_dump_json(exclude_none=True)
+
+
+def per_entry_us(fn: Callable[[], str], entries: int, min_time: float = 0.5) -> float:
+    runs, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time:
+        fn()
+        runs += 1
+    return elapsed / runs / entries * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 25, 500])
+    args = parser.parse_args()
+
+    print(f"{'entries':>7}  {'mode':<13} {'bytes/entry':>11}  {'serialize':>12}  {'parse+serialize':>15}")
+    for entries in args.entries:
+        body = json.dumps({"results": [make_entry(i) for i in range(entries)]})
+        parsed = UniProtSearchResponse.model_validate_json(body)
+
+        modes = {
+            "double": lambda: double_encoded(parsed),
+            "single": lambda: single_pass(parsed),
+            "raw": lambda: body,
+        }
+        cold = {
+            "double": lambda: double_encoded(UniProtSearchResponse.model_validate_json(body)),
+            "single": lambda: single_pass(UniProtSearchResponse.model_validate_json(body)),
+            "raw": lambda: body,
+        }
+        for mode, fn in modes.items():
+            size = len(fn().encode()) / entries
+            print(
+                f"{entries:>7}  {mode:<13} {size:>11.0f}  {per_entry_us(fn, entries):>9.2f} us"
+                f"  {per_entry_us(cold[mode], entries):>12.2f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Peak memory of buffered search vs. incremental /stream parsing.
+
+Usage:
+    python benchmarks/bench_stream.py --entries 1000 10000 50000
+
+The stand-in server emits a synthetic `{"results": [...]}` body of the
+requested size as a chunked stream. Each mode runs in a fresh child process
+so its peak RSS is measured in isolation.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, Iterator
+
+from fake_uniprot import Body, FakeUniProt, make_entry
+
+
+def stream_handler(method: str, path: str, query: Dict[str, str]) -> tuple[int, Dict[str, str], Body]:
+    # Queries look like "total:<number of entries>"
+    total = int(query["query"].partition(":")[2])
+
+    def body() -> Iterator[bytes]:
+        yield b'{"results":['
+        for i in range(total):
+            yield (b"," if i else b"") + json.dumps(make_entry(i)).encode()
+        yield b"]}"
+
+    return 200, {"Content-Type": "application/json"}, body()
+
+
+async def run_buffered(base_url: str, total: int) -> int:
+    from uniprot_mcp.tools.models import UniProtSearchResponse
+    from uniprot_mcp.utils.http import call_http, parse_response
+
+    url = f"{base_url}/uniprotkb/stream"
+    status, content, _ = await call_http("GET", url, params={"query": f"total:{total}"}, timeout=600)
+    parsed, error = parse_response(status, content, UniProtSearchResponse)
+    return len(parsed.results)
+
+
+async def run_stream(base_url: str, total: int) -> int:
+    from uniprot_mcp.tools import search_uniprot as module
+
+    module.BASE_URL = f"{base_url}/uniprotkb"
+    count = 0
+    async for _ in module.stream_uniprot(f"total:{total}"):
+        count += 1
+    return count
+
+
+def child(mode: str, base_url: str, total: int) -> None:
+    runner = run_buffered if mode == "buffered" else run_stream
+    start = time.perf_counter()
+    count = asyncio.run(runner(base_url, total))
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"count": count, "elapsed": elapsed, "peak_rss_mb": peak_mb}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "URL", "TOTAL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, base_url, total = args.child
+        child(mode, base_url, int(total))
+        return
+
+    with FakeUniProt(stream_handler) as server:
+        for total in args.entries:
+            for mode in ("buffered", "stream"):
+                output = subprocess.run(
+                    [sys.executable, "-W", "ignore", __file__, "--child", mode, server.url, str(total)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(
+                    f"{mode:<9} entries {result['count']:>7}  elapsed {result['elapsed']:>6.2f} s"
+                    f"  peak RSS {result['peak_rss_mb']:>8.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
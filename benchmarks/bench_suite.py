@@ -0,0 +1,301 @@
+"""Throughput, latency, memory and cache hit rate of the request stack.
+
+Usage:
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --latency 0.05 --error-rate 0.05 --concurrency 1 16 64
+    python benchmarks/bench_suite.py --output new.json --compare old.json
+    python benchmarks/bench_suite.py --input new.json --compare old.json
+
+Each scenario runs one target at one concurrency level against a stand-in
+server (see `fake_uniprot.py`) with the configured latency, error rate,
+page size and per-entry payload padding:
+
+- request_api:    `request_api` on /uniprotkb/search, parsed into the
+                  search response model, with the cache tiers in front
+- parse_response: `parse_response` on a page of the configured size, with
+                  no I/O (run at concurrency 1 only)
+- search_uniprot: the `search_uniprot` tool, including serialization
+
+Calls pick among `--distinct` queries at random, so repeated queries are
+answered from the cache; the hit rate counts calls served by the memory,
+disk, superset or negative cache. Every scenario runs in a fresh process
+with an empty cache, so scenarios do not share caches, connections or
+memory; peak RSS is that process's, measured from before the first call.
+One untimed call with a query outside the workload warms up the client
+first. The stand-in server runs on a thread of the same process.
+
+`--output` writes the results and the run's settings as JSON. `--compare`
+prints the change against an earlier results file and exits with status 1
+if a scenario's throughput dropped, or its p95 latency rose, by more than
+`--threshold`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+TARGETS = ("request_api", "parse_response", "search_uniprot")
+# Results must match on these to be compared
+CONFIG_KEYS = ("requests", "distinct", "page_size", "padding", "latency", "error_rate")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of unsorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6
+
+
+# --------------------------------
+# WORKER: one scenario per process
+# --------------------------------
+async def drive(
+    call: Callable[[str], Awaitable[bool]],
+    queries: List[str],
+    concurrency: int,
+) -> Tuple[List[float], int]:
+    """Run `call` once per query, `concurrency` at a time; return latencies and the number of failed calls."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one(query: str) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            ok = await call(query)
+            latencies.append(time.perf_counter() - start)
+            failures += not ok
+
+    await asyncio.gather(*(one(query) for query in queries))
+    return latencies, failures
+
+
+async def run_target(spec: Dict[str, Any], base_url: str, queries: List[str]) -> Tuple[List[float], int, float]:
+    from uniprot_mcp.tools import search_uniprot as module
+    from uniprot_mcp.tools.models import UniProtSearchResponse
+    from uniprot_mcp.utils.http import close_http_client, request_api
+
+    module.BASE_URL = f"{base_url}/uniprotkb"
+
+    async def api_call(query: str) -> bool:
+        request = {"query": query, "size": spec["page_size"]}
+        _, error = await request_api(f"{module.BASE_URL}/search", request, UniProtSearchResponse)
+        return error is None
+
+    async def tool_call(query: str) -> bool:
+        result = await module.search_uniprot(query, fields=None, size=spec["page_size"])
+        return not result.startswith('{"error"')
+
+    call = api_call if spec["target"] == "request_api" else tool_call
+    # Pay for lazy imports and the client's creation outside the measurement
+    await call("gene:WARMUP")
+    start = time.perf_counter()
+    latencies, failures = await drive(call, queries, spec["concurrency"])
+    elapsed = time.perf_counter() - start
+    await close_http_client()
+    return latencies, failures, elapsed
+
+
+def run_parse(spec: Dict[str, Any], body: str) -> Tuple[List[float], int, float]:
+    from uniprot_mcp.tools.models import UniProtSearchResponse
+    from uniprot_mcp.utils.http import parse_response
+
+    latencies: List[float] = []
+    failures = 0
+    start = time.perf_counter()
+    for _ in range(spec["requests"]):
+        call_start = time.perf_counter()
+        _, error = parse_response(200, body, UniProtSearchResponse)
+        latencies.append(time.perf_counter() - call_start)
+        failures += error is not None
+    return latencies, failures, time.perf_counter() - start
+
+
+def run_scenario(spec: Dict[str, Any]) -> Dict[str, Any]:
+    from fake_uniprot import FakeUniProt, search_handler
+
+    from uniprot_mcp.utils.cache import get_cache_stats
+
+    rng = random.Random(spec["seed"])
+    queries = [f"gene:GENE{rng.randrange(spec['distinct'])}" for _ in range(spec["requests"])]
+    handler = search_handler(spec["page_size"], spec["padding"])
+    server = FakeUniProt(handler, latency=spec["latency"], error_rate=spec["error_rate"], seed=spec["seed"])
+
+    with server:
+        baseline_rss = peak_rss_mb()
+        if spec["target"] == "parse_response":
+            body = bytes(handler("GET", "/uniprotkb/search", {})[2]).decode()
+            latencies, failures, elapsed = run_parse(spec, body)
+        else:
+            latencies, failures, elapsed = asyncio.run(run_target(spec, server.url, queries))
+        rss = peak_rss_mb()
+    # The warm-up call's request
+    upstream_requests = server.requests - (spec["target"] != "parse_response")
+
+    stats = get_cache_stats()
+    hits = sum(stats[tier]["hits"] for tier in ("memory", "disk", "superset", "negative"))
+    calls = len(latencies)
+    return {
+        **spec,
+        "elapsed_s": elapsed,
+        "throughput_rps": calls / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "failures": failures,
+        "upstream_requests": upstream_requests,
+        "upstream_errors": server.errors,
+        "cache_hit_rate": None if spec["target"] == "parse_response" else hits / calls,
+        "peak_rss_mb": rss,
+        "rss_growth_mb": rss - baseline_rss,
+    }
+
+
+# --------------------------------
+# DRIVER
+# --------------------------------
+def spawn(spec: Dict[str, Any], retry_backoff: float | None) -> Dict[str, Any]:
+    """Run a scenario in a fresh interpreter with its own empty cache."""
+    with tempfile.TemporaryDirectory(prefix="uniprot-bench-") as cache_dir:
+        env = {**os.environ, "CACHE_DIR": cache_dir, "RATE_LIMIT_PER_SECOND": "0"}
+        if retry_backoff is not None:
+            env["RETRY_BACKOFF_FACTOR"] = str(retry_backoff)
+        stdout = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", json.dumps(spec)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    return json.loads(stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    columns = ("req/s", "p50 ms", "p95 ms", "p99 ms", "hit rate", "upstream", "failed", "peak MB")
+    print(f"{'target':<15} {'conc':>4} " + " ".join(f"{column:>9}" for column in columns))
+    for r in results:
+        hit_rate = "-" if r["cache_hit_rate"] is None else f"{r['cache_hit_rate']:.1%}"
+        print(
+            f"{r['target']:<15} {r['concurrency']:>4} {r['throughput_rps']:>9.1f} {r['p50_ms']:>9.2f}"
+            f" {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {hit_rate:>9} {r['upstream_requests']:>9}"
+            f" {r['failures']:>9} {r['peak_rss_mb']:>9.1f}"
+        )
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> bool:
+    """Print the change of each scenario against the baseline; return True if any regressed."""
+    base = {(r["target"], r["concurrency"]): r for r in baseline}
+    regressed = False
+    print(f"{'target':<15} {'conc':>4} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for r in results:
+        old = base.get((r["target"], r["concurrency"]))
+        if old is None or any(old.get(key) != r.get(key) for key in CONFIG_KEYS):
+            print(f"{r['target']:<15} {r['concurrency']:>4}  no comparable baseline")
+            continue
+        keys = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+        changes = [r[key] / old[key] - 1 if old[key] else 0.0 for key in keys]
+        slower = changes[0] < -threshold or changes[2] > threshold
+        regressed = regressed or slower
+        print(
+            f"{r['target']:<15} {r['concurrency']:>4} " + " ".join(f"{change:>+9.1%}" for change in changes)
+            + ("  REGRESSION" if slower else "")
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=500, help="calls per scenario")
+    parser.add_argument("--distinct", type=int, default=100, help="distinct queries the calls pick from")
+    parser.add_argument("--page-size", type=int, default=25, help="entries per response")
+    parser.add_argument("--padding", type=int, default=0, help="extra bytes per entry")
+    parser.add_argument("--latency", type=float, default=0.01, help="upstream latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream requests failing with 503")
+    parser.add_argument("--retry-backoff", type=float, default=None, help="override RETRY_BACKOFF_FACTOR")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--input", help="load results from this file instead of running the scenarios")
+    parser.add_argument("--compare", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change counted as a regression")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(json.loads(args.worker))))
+        return
+
+    if args.input:
+        with open(args.input) as f:
+            report = json.load(f)
+    else:
+        specs = [
+            {
+                "target": target,
+                "concurrency": concurrency,
+                "requests": args.requests,
+                "distinct": args.distinct,
+                "page_size": args.page_size,
+                "padding": args.padding,
+                "latency": args.latency,
+                "error_rate": args.error_rate,
+                "seed": args.seed,
+            }
+            for target in args.targets
+            for concurrency in ([1] if target == "parse_response" else args.concurrency)
+        ]
+        report = {
+            "commit": git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "retry_backoff": args.retry_backoff,
+            "results": [spawn(spec, args.retry_backoff) for spec in specs],
+        }
+
+    print_results(report["results"])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nchange against {baseline.get('commit') or args.compare}")
+        if compare(report["results"], baseline["results"], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Parse time and memory of tabular results: JSON + models vs. TSV parsers.
+
+Usage:
+    python benchmarks/bench_tsv_columnar.py
+    python benchmarks/bench_tsv_columnar.py --rows 50000
+
+The same synthetic result set is parsed three ways, as `search_uniprot`
+would for `fields=accession,gene_names,length,organism_id`:
+
+- json:     the JSON response validated into the projected response model
+- dictrows: the TSV response through `csv.DictReader`, one dict per row
+            (the generic branch of `parse_response`)
+- columnar: the TSV response into a `ColumnarTable`
+
+For each, the table reports the payload size, the time to parse and to
+serialize the result back for the client, the peak memory while parsing
+and the memory still held by the parsed result.
+"""
+
+import argparse
+import csv
+import gc
+import json
+import time
+import tracemalloc
+from io import StringIO
+from typing import Any, Callable, Dict, List
+
+from fake_uniprot import make_entry
+
+from uniprot_mcp.tools.projection import entry_keys, projected_response_model
+from uniprot_mcp.utils.columnar import ColumnarTable
+
+FIELDS = ["accession", "gene_names", "length", "organism_id"]
+TSV_HEADER = ["Entry", "Gene Names", "Length", "Organism (ID)"]
+
+
+def payloads(rows: int) -> tuple[str, str]:
+    keys = entry_keys(FIELDS) or ()
+    entries: List[Dict[str, Any]] = []
+    lines = ["\t".join(TSV_HEADER)]
+    for i in range(rows):
+        entry = {key: value for key, value in make_entry(i).items() if key in keys}
+        # Keep only the requested values of nested objects, to not overstate the JSON size
+        entry["sequence"] = {"length": entry["sequence"]["length"]}
+        entry["organism"] = {"taxonId": entry["organism"]["taxonId"]}
+        entries.append(entry)
+        gene = entry["genes"][0]
+        gene_names = " ".join([gene["geneName"]["value"], *(s["value"] for s in gene.get("synonyms", []))])
+        lines.append(
+            f"{entry['primaryAccession']}\t{gene_names}\t{entry['sequence']['length']}\t{entry['organism']['taxonId']}"
+        )
+    return json.dumps({"results": entries}), "\n".join(lines) + "\n"
+
+
+def best_time(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def memory(parse: Callable[[], Any]) -> tuple[int, int]:
+    """Return (peak bytes while parsing, bytes retained by the result)."""
+    gc.collect()
+    tracemalloc.start()
+    result = parse()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    json_body, tsv_body = payloads(args.rows)
+    model = projected_response_model(FIELDS)
+
+    paths: Dict[str, tuple[str, Callable[[], Any], Callable[[Any], str]]] = {
+        "json": (
+            json_body,
+            lambda: model.model_validate_json(json_body),
+            lambda result: result.model_dump_json(exclude_none=True),
+        ),
+        "dictrows": (tsv_body, lambda: list(csv.DictReader(StringIO(tsv_body), delimiter="\t")), json.dumps),
+        "columnar": (tsv_body, lambda: ColumnarTable.from_tsv(tsv_body), lambda result: result.to_json()),
+    }
+
+    print(f"{args.rows} rows, fields={','.join(FIELDS)}")
+    columns = ("payload", "parse", "serialize", "peak mem", "retained", "output")
+    print(f"{'path':<10} " + " ".join(f"{column:>10}" for column in columns))
+    for name, (body, parse, serialize) in paths.items():
+        parsed = parse()
+        parse_time = best_time(parse, args.repeat)
+        serialize_time = best_time(lambda: serialize(parsed), args.repeat)
+        peak, retained = memory(parse)
+        print(
+            f"{name:<10} {len(body) / 1e6:>8.2f}MB {parse_time * 1000:>8.1f}ms {serialize_time * 1000:>8.1f}ms"
+            f" {peak / 1e6:>8.2f}MB {retained / 1e6:>8.2f}MB {len(serialize(parsed)) / 1e6:>8.2f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
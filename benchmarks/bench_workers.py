@@ -0,0 +1,204 @@
+"""Throughput of the streamable-http server with 1..N worker processes.
+
+Usage:
+    python benchmarks/bench_workers.py
+    python benchmarks/bench_workers.py --workers 1 2 4 8 --clients 4 --concurrency 64
+
+The disk cache is filled beforehand with a search response for each of
+`--distinct` queries, so no request reaches UniProt and the benchmark
+measures what workers parallelize: reading the shared cache, validating
+responses into models and serializing tool results. With more distinct
+queries than `MEMORY_CACHE_MAX_ENTRIES`, most calls also parse from disk.
+
+For each worker count the server is started with `mcp-uniprot run
+--workers N`, loaded by `--clients` client processes calling
+`search_uniprot` over MCP, and stopped with SIGTERM; the table reports the
+throughput, latency percentiles and speedup over the first worker count.
+Run it on a machine with at least as many cores as workers plus clients.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from fake_uniprot import search_handler
+
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def fill_cache(distinct: int, page_size: int) -> None:
+    """Cache a search response for each benchmark query, under the key `search_uniprot` will look up."""
+    from uniprot_mcp.tools.search_uniprot import BASE_URL, build_search_params
+    from uniprot_mcp.utils.cache import cache_response, generate_cache_key
+    from uniprot_mcp.utils.canonical import canonicalize_params
+
+    body = bytes(search_handler(page_size)("GET", "/uniprotkb/search", {})[2]).decode()
+    for i in range(distinct):
+        params = canonicalize_params(build_search_params(f"gene:GENE{i}", None, page_size))
+        cache_response(generate_cache_key("GET", f"{BASE_URL}/search", params), body, 86400)
+
+
+def rpc(method: str, params: Dict[str, Any], request_id: int | None) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method, "params": params}
+    if request_id is not None:
+        message["id"] = request_id
+    return message
+
+
+def result_of(response_text: str) -> Dict[str, Any]:
+    """Return the JSON-RPC message of a plain JSON or single-event SSE response."""
+    if response_text.lstrip().startswith("{"):
+        return json.loads(response_text)
+    data = [line[5:].strip() for line in response_text.splitlines() if line.startswith("data:")]
+    return json.loads(data[-1])
+
+
+async def client_load(url: str, calls: List[str], concurrency: int, page_size: int) -> Tuple[List[float], int]:
+    import httpx
+
+    async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=concurrency)) as client:
+        # Initialize a session; stateless servers (several workers) don't return an ID
+        init_params = {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "bench_workers", "version": "0"},
+        }
+        resp = await client.post(url, json=rpc("initialize", init_params, 0), headers=HEADERS)
+        headers = dict(HEADERS)
+        if session_id := resp.headers.get("mcp-session-id"):
+            headers["mcp-session-id"] = session_id
+        await client.post(url, json=rpc("notifications/initialized", {}, None), headers=headers)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+        failures = 0
+
+        async def call(request_id: int, query: str) -> None:
+            nonlocal failures
+            arguments = {"query": query, "fields": None, "size": page_size}
+            message = rpc("tools/call", {"name": "search_uniprot", "arguments": arguments}, request_id)
+            async with semaphore:
+                start = time.perf_counter()
+                resp = await client.post(url, json=message, headers=headers)
+                latencies.append(time.perf_counter() - start)
+            result = result_of(resp.text) if resp.status_code == 200 else {}
+            failures += "result" not in result or result["result"].get("isError", False)
+
+        await asyncio.gather(*(call(i + 1, query) for i, query in enumerate(calls)))
+    return latencies, failures
+
+
+def run_client(args: Tuple[str, List[str], int, int]) -> Tuple[List[float], int]:
+    return asyncio.run(client_load(*args))
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/metrics", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def measure(workers: int, args: argparse.Namespace, env: Dict[str, str]) -> Dict[str, Any]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [sys.executable, "-m", "uniprot_mcp", "run", "--transport", "streamable-http"]
+    command += ["--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(base_url, server)
+        queries = [f"gene:GENE{i % args.distinct}" for i in range(args.requests)]
+        shares = [
+            (f"{base_url}/mcp/", queries[i :: args.clients], max(1, args.concurrency // args.clients), args.page_size)
+            for i in range(args.clients)
+        ]
+        with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+            start = time.perf_counter()
+            results = pool.map(run_client, shares)
+            elapsed = time.perf_counter() - start
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            exit_code = server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            exit_code = None
+
+    latencies = [latency for client_latencies, _ in results for latency in client_latencies]
+    return {
+        "workers": workers,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "failures": sum(failures for _, failures in results),
+        "shutdown_exit_code": exit_code,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32, help="calls in flight, over all clients")
+    parser.add_argument("--clients", type=int, default=2, help="client processes generating the load")
+    parser.add_argument("--distinct", type=int, default=2000, help="distinct queries, all cached beforehand")
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="uniprot-bench-")
+    env = {**os.environ, "CACHE_DIR": cache_dir, "RATE_LIMIT_PER_SECOND": "0"}
+    os.environ["CACHE_DIR"] = cache_dir
+    fill_cache(args.distinct, args.page_size)
+
+    print(f"{args.requests} calls, {args.concurrency} in flight from {args.clients} clients, {os.cpu_count()} CPUs")
+    columns = ("req/s", "p50 ms", "p95 ms", "p99 ms", "speedup")
+    print(f"{'workers':>7} " + " ".join(f"{column:>9}" for column in columns) + f" {'failed':>7} {'exit':>5}")
+    results = []
+    for workers in args.workers:
+        result = measure(workers, args, env)
+        results.append(result)
+        speedup = result["throughput_rps"] / results[0]["throughput_rps"]
+        print(
+            f"{workers:>7} {result['throughput_rps']:>9.1f} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f}"
+            f" {result['p99_ms']:>9.2f} {speedup:>8.2f}x {result['failures']:>7} {result['shutdown_exit_code']!s:>5}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"cpus": os.cpu_count(), "args": vars(args), "results": results}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
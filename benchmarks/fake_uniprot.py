@@ -0,0 +1,226 @@
+"""Local stand-in for rest.uniprot.org used by the benchmarks.
+
+The server runs its own event loop on a background thread so the benchmark
+client and the fake upstream don't compete for the same loop. It speaks just
+enough HTTP/1.1 (keep-alive, Content-Length and chunked bodies) for httpx.
+"""
+
+import asyncio
+import json
+import random
+import threading
+from typing import Any, Callable, Dict, Iterable, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+Body = bytes | Iterable[bytes]
+Handler = Callable[[str, str, Dict[str, str]], Tuple[int, Dict[str, str], Body]]
+
+
+def make_entry(i: int) -> Dict[str, Any]:
+    """Build a synthetic UniProtKB entry with a realistic shape."""
+    accession = f"Q{i:05d}"
+    return {
+        "entryType": "UniProtKB reviewed (Swiss-Prot)",
+        "primaryAccession": accession,
+        "uniProtkbId": f"PROT{i}_HUMAN",
+        "annotationScore": 5.0,
+        "organism": {
+            "scientificName": "Homo sapiens",
+            "commonName": "Human",
+            "taxonId": 9606,
+            "lineages": ["Eukaryota", "Metazoa", "Chordata", "Mammalia", "Primates", "Hominidae", "Homo"],
+        },
+        "proteinExistence": "1: Evidence at protein level",
+        "proteinDescription": {
+            "recommendedName": {"fullName": {"value": f"Synthetic protein {i}"}},
+            "alternativeNames": [{"fullName": {"value": f"Alt name {i}"}}],
+        },
+        "genes": [{"geneName": {"value": f"GENE{i}"}, "synonyms": [{"value": f"SYN{i}"}]}],
+        "comments": [
+            {
+                "commentType": "FUNCTION",
+                "texts": [{"value": "Catalyzes a synthetic reaction used for benchmarking. " * 4}],
+            }
+        ],
+        "features": [
+            {
+                "type": "Chain",
+                "location": {"start": {"value": 1, "modifier": "EXACT"}, "end": {"value": 110, "modifier": "EXACT"}},
+                "description": f"Synthetic chain {i}",
+                "featureId": f"PRO_{i:010d}",
+            }
+        ],
+        "keywords": [{"id": "KW-0002", "category": "Technical term", "name": "3D-structure"}],
+        "uniProtKBCrossReferences": [
+            {"database": "PDB", "id": f"{i % 10}ABC", "properties": [{"key": "Method", "value": "X-ray"}]},
+            {"database": "Proteomes", "id": "UP000005640", "properties": [{"key": "Component", "value": "Chr 1"}]},
+        ],
+        "sequence": {
+            "value": "MALWMRLLPLLALLALWGPDPAAAFVNQHLCGSHLVEALYLVCGERGFFYTPKTRREAEDLQVGQVELGGGPGAGSLQPLALEGSLQKRGIVEQCCTSICSLYQLENYCN",
+            "length": 110,
+            "molWeight": 11981,
+            "crc64": "C2C3B23B85E520E5",
+            "md5": "DE2E3D7F35C0F3E0D6C1C8E1B2A7B09E",
+        },
+        "extraAttributes": {"uniParcId": f"UPI{i:010d}"},
+    }
+
+
+def search_handler(results_per_request: int = 25, padding: int = 0) -> Handler:
+    """Return a handler answering every request with a page of synthetic entries.
+
+    `padding` adds that many bytes of function text to each entry, to emulate
+    larger payloads.
+    """
+    entries = [make_entry(i) for i in range(results_per_request)]
+    if padding:
+        for entry in entries:
+            entry["comments"][0]["texts"].append({"value": "x" * padding})
+    body = json.dumps({"results": entries}).encode()
+
+    def handler(method: str, path: str, query: Dict[str, str]) -> Tuple[int, Dict[str, str], Body]:
+        return 200, {"Content-Type": "application/json"}, body
+
+    return handler
+
+
+class FakeUniProt:
+    """A tiny HTTP/1.1 server emulating the UniProt REST API.
+
+    Args:
+        handler: Callable producing `(status, headers, body)` for a request.
+        connect_delay: Seconds to stall every new connection before serving it,
+            emulating the TCP/TLS handshake round trips of a remote host.
+        latency: Seconds to wait before answering each request.
+        error_rate: Fraction of requests answered with `error_status` instead
+            of calling the handler.
+        error_status: Status code of the injected errors.
+        seed: Seed for choosing which requests fail, for repeatable runs.
+    """
+
+    def __init__(
+        self,
+        handler: Handler | None = None,
+        connect_delay: float = 0.0,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ):
+        self.handler = handler or search_handler()
+        self.connect_delay = connect_delay
+        self.latency = latency
+        self.host = host
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.port = 0
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.base_events.Server | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "FakeUniProt":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> "FakeUniProt":
+        self._thread = threading.Thread(target=self._run, name="fake-uniprot", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._serve, self.host, 0, backlog=1024))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if length := int(headers.get("content-length", 0)):
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                parts = urlsplit(target)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                if self.error_rate and self._random.random() < self.error_rate:
+                    self.errors += 1
+                    status, response_headers, body = self.error_status, {}, b"Injected error"
+                else:
+                    status, response_headers, body = self.handler(method, parts.path, query)
+                await self._write_response(writer, status, response_headers, body)
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write_response(
+        writer: asyncio.StreamWriter,
+        status: int,
+        headers: Dict[str, str],
+        body: Body,
+    ) -> None:
+        head = [f"HTTP/1.1 {status} X"] + [f"{k}: {v}" for k, v in headers.items()]
+        if isinstance(body, bytes):
+            head.append(f"Content-Length: {len(body)}")
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            return
+
+        head.append("Transfer-Encoding: chunked")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        for chunk in body:
+            if chunk:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
@@ -1,32 +1,86 @@
 import logging
 import sys
-from typing import cast
+from typing import Annotated, Literal, cast
 
 import typer
 
-from uniprot_mcp.server import UniprotMCP
-from uniprot_mcp.settings import settings
-
-
 logger = logging.getLogger(__name__)
 app = typer.Typer()
 
+# Options of `run`, also accepted without a command
+ServerNameOption = Annotated[str | None, typer.Option(help="Server name (default: SERVER_NAME)")]
+HostOption = Annotated[
+    str | None, typer.Option(help="Address to listen on, for streamable-http (default: SERVER_HOST)")
+]
+PortOption = Annotated[int | None, typer.Option(help="Port to listen on, for streamable-http (default: SERVER_PORT)")]
+TransportOption = Annotated[
+    str | None, typer.Option(help="Transport mode for MCP server; can be 'stdio' or 'streamable-http'")
+]
+ProfileOption = Annotated[
+    str | None,
+    typer.Option(help="Profile tool calls with cProfile: 'call' writes one profile per call, 'aggregate' one in total"),
+]
+ProfileDirOption = Annotated[
+    str | None,
+    typer.Option(help="Directory to write profiles to (default: PROFILE_DIR, or `profiles` next to the cache)"),
+]
+WorkersOption = Annotated[
+    int | None, typer.Option(help="Server processes sharing the port, for streamable-http (default: WORKERS)")
+]
+
+
+@app.callback(invoke_without_command=True)
+def main(
+    ctx: typer.Context,
+    server_name: ServerNameOption = None,
+    host: HostOption = None,
+    port: PortOption = None,
+    transport: TransportOption = None,
+    profile: ProfileOption = None,
+    profile_dir: ProfileDirOption = None,
+    workers: WorkersOption = None,
+) -> None:
+    """UniProt MCP server. Without a command, runs the server (same as `run`)."""
+    if ctx.invoked_subcommand is None:
+        run(**ctx.params)
+
 
 @app.command()
 def run(
-    server_name: str | None = None,
-    host: str | None = None,
-    port: int | None = None,
-    transport: str | None = typer.Option(
-        None,
-        help="Transport mode for MCP server; can be 'stdio' or 'streamable-http'",
-    ),
+    server_name: ServerNameOption = None,
+    host: HostOption = None,
+    port: PortOption = None,
+    transport: TransportOption = None,
+    profile: ProfileOption = None,
+    profile_dir: ProfileDirOption = None,
+    workers: WorkersOption = None,
 ) -> None:
     """Run the MCP server."""
+    from uniprot_mcp.server import UniprotMCP, run_workers
+    from uniprot_mcp.settings import settings
+
+    if profile not in (None, "off", "call", "aggregate"):
+        raise typer.BadParameter(f"Invalid profile mode: {profile}")
+    if profile is not None:
+        settings.PROFILE = cast(Literal["off", "call", "aggregate"], profile)
+    if profile_dir is not None:
+        settings.PROFILE_DIR = profile_dir
+    transport = transport or settings.TRANSPORT
+    workers = workers or settings.WORKERS
+    if workers > 1 and transport != "streamable-http":
+        raise typer.BadParameter("--workers needs the streamable-http transport")
+
     try:
-        server = UniprotMCP(name=server_name or settings.SERVER_NAME)
-        transport = transport or settings.TRANSPORT
+        if workers > 1:
+            run_workers(
+                name=server_name or settings.SERVER_NAME,
+                host=host or settings.SERVER_HOST,
+                port=port or settings.SERVER_PORT,
+                workers=workers,
+            )
+            return
 
+        server = UniprotMCP(name=server_name or settings.SERVER_NAME)
         if transport == "stdio":
             server.run(transport=transport)
         elif transport == "streamable-http":
@@ -42,4 +96,117 @@ def run(
         sys.exit(1)
 
 
+@app.command()
+def warm(
+    queries: str | None = typer.Option(None, help="File with one UniProt search query per line"),
+    accessions: str | None = typer.Option(None, help="File with accessions, separated by whitespace or commas"),
+    proteome: str | None = typer.Option(None, help="Proteome ID whose entries to cache, e.g. UP000005640"),
+    fields: str | None = typer.Option(
+        None, help="Comma-separated fields to request, as clients will (default: as the matching tool does)"
+    ),
+    size: int | None = typer.Option(None, help="Number of results cached per query (default: as search_uniprot)"),
+    concurrency: int = typer.Option(8, help="Requests in flight at once (the rate limit still applies)"),
+    restart: bool = typer.Option(False, help="Ignore progress saved by an interrupted run"),
+) -> None:
+    """Fill the cache from a list of queries, a list of accessions or a proteome."""
+    import asyncio
+    from functools import partial
+
+    from uniprot_mcp.utils.http import close_http_client
+    from uniprot_mcp.warm import (
+        WarmState,
+        read_accessions,
+        read_lines,
+        warm_accessions,
+        warm_proteome,
+        warm_queries,
+        warm_state_path,
+    )
+
+    if sum(source is not None for source in (queries, accessions, proteome)) != 1:
+        raise typer.BadParameter("Pass exactly one of --queries, --accessions or --proteome")
+    field_list = fields.split(",") if fields else None
+
+    def report(line: str) -> None:
+        typer.echo(line, err=True)
+
+    if queries is not None:
+        state = WarmState(warm_state_path("queries", queries, fields=fields, size=size), restart)
+        # Unset options keep search_uniprot's defaults, so default tool calls read what is cached
+        options = {name: value for name, value in (("fields", field_list), ("size", size)) if value is not None}
+        job = partial(warm_queries, read_lines(queries), state, concurrency=concurrency, report=report, **options)
+    elif accessions is not None:
+        state = WarmState(warm_state_path("accessions", accessions, fields=fields), restart)
+        job = partial(warm_accessions, read_accessions(accessions), state, field_list, concurrency, report)
+    else:
+        state = WarmState(warm_state_path("proteome", cast(str, proteome), fields=fields), restart)
+        job = partial(warm_proteome, cast(str, proteome), state, field_list, report=report)
+
+    async def run_job():
+        try:
+            return await job()
+        finally:
+            await close_http_client()
+
+    try:
+        progress = asyncio.run(run_job())
+    except KeyboardInterrupt:
+        state.save()
+        report(f"Interrupted; progress saved to {state.path}")
+        sys.exit(130)
+
+    report(progress.line())
+    if progress.errors:
+        state.save()
+        report(f"Progress saved to {state.path}; run again to retry the failures")
+        sys.exit(1)
+    state.clear()
+
+
+@app.command()
+def ingest(
+    path: str | None = typer.Argument(
+        None, help="UniProtKB dump: JSON from the stream endpoint or TSV, optionally gzipped"
+    ),
+    query: str | None = typer.Option(None, help="Stream the entries matching this UniProt query instead of a dump"),
+    dump_format: str | None = typer.Option(None, "--format", help="'json' or 'tsv'; guessed from the file name"),
+    store: str | None = typer.Option(None, help="SQLite file to load into (default: LOCAL_STORE_PATH)"),
+    batch_size: int | None = typer.Option(None, help="Entries written per transaction (default: INGEST_BATCH_SIZE)"),
+) -> None:
+    """Load a UniProtKB dump, or the results of a query, into the local store used by SEARCH_BACKEND=local."""
+    from uniprot_mcp.ingest import ingest as ingest_dump
+    from uniprot_mcp.ingest import ingest_query
+    from uniprot_mcp.settings import settings
+    from uniprot_mcp.store import LocalStore, get_store_path
+
+    if (path is None) == (query is None):
+        raise typer.BadParameter("Pass exactly one of a dump path or --query")
+    if dump_format not in (None, "json", "tsv"):
+        raise typer.BadParameter(f"Invalid format: {dump_format}")
+
+    def report(line: str) -> None:
+        typer.echo(line, err=True)
+
+    size = batch_size or settings.INGEST_BATCH_SIZE
+    try:
+        local_store = LocalStore(store or get_store_path())
+        if query is not None:
+            import asyncio
+
+            from uniprot_mcp.utils.http import close_http_client
+
+            async def run_query(query: str) -> int:
+                try:
+                    return await ingest_query(query, local_store, size, report)
+                finally:
+                    await close_http_client()
+
+            asyncio.run(run_query(query))
+        else:
+            ingest_dump(cast(str, path), local_store, cast(Literal["json", "tsv"] | None, dump_format), size, report)
+    except (OSError, ValueError, RuntimeError) as e:
+        report(f"Failed to ingest {path or query}: {e}")
+        sys.exit(1)
+
+
 __all__ = ["app"]
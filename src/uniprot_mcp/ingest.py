@@ -0,0 +1,231 @@
+"""Load UniProtKB dumps into the local store.
+
+Two dump formats are read, plain or gzipped: JSON as returned by UniProt's
+`/stream` endpoint (`{"results": [...]}`) and TSV with UniProt's column
+headers. `ingest_query` reads the same JSON straight from `/stream` instead
+of a file. All are read incrementally and written in batches, so memory
+stays bounded by the batch size whatever the size of the dump.
+
+TSV rows are converted to the JSON entry shape; only the columns listed in
+`tsv_row_to_entry` are kept.
+"""
+
+import csv
+import gzip
+import io
+import sys
+import time
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterator, List, Literal, cast
+
+from uniprot_mcp.store import LocalStore
+from uniprot_mcp.utils.jsonstream import JSONArrayItemDecoder
+
+DumpFormat = Literal["json", "tsv"]
+Report = Callable[[str], None]
+# Seconds between progress lines
+REPORT_INTERVAL = 2.0
+CHUNK_SIZE = 1024 * 1024
+
+PROTEIN_EXISTENCE = {
+    "Evidence at protein level": "1: Evidence at protein level",
+    "Evidence at transcript level": "2: Evidence at transcript level",
+    "Inferred from homology": "3: Inferred from homology",
+    "Predicted": "4: Predicted",
+    "Uncertain": "5: Uncertain",
+}
+
+
+def open_dump(path: str) -> IO[bytes]:
+    """Open a dump for binary reading, decompressing it if it is gzipped."""
+    with open(path, "rb") as f:
+        gzipped = f.read(2) == b"\x1f\x8b"
+    if gzipped:
+        # GzipFile provides the IO[bytes] methods, though typeshed does not declare it one
+        return cast(IO[bytes], gzip.open(path, "rb"))
+    return open(path, "rb")
+
+
+def detect_format(path: str) -> DumpFormat:
+    """Guess a dump's format from its file name."""
+    name = path.lower().removesuffix(".gz")
+    if name.endswith((".tsv", ".tab", ".txt")):
+        return "tsv"
+    if name.endswith(".json"):
+        return "json"
+    raise ValueError(f"Cannot tell the format of {path}; pass it explicitly")
+
+
+def read_json_entries(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the entries of a `{"results": [...]}` JSON dump."""
+    decoder = JSONArrayItemDecoder("results")
+    with open_dump(path) as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+def read_tsv_entries(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a TSV dump, converted to entries."""
+    csv.field_size_limit(sys.maxsize)
+    with open_dump(path) as f:
+        for row in csv.DictReader(io.TextIOWrapper(f, encoding="utf-8"), delimiter="\t"):
+            yield tsv_row_to_entry(row)
+
+
+def _split(value: str | None, separator: str) -> List[str]:
+    return [item.strip() for item in (value or "").split(separator) if item.strip()]
+
+
+def tsv_row_to_entry(row: Dict[str, str]) -> Dict[str, Any]:
+    """Convert a row of a UniProtKB TSV download to the JSON entry shape.
+
+    Columns are recognised by UniProt's headers (`Entry`, `Entry Name`,
+    `Reviewed`, `Protein names`, `Gene Names`, `Gene Names (primary)`,
+    `Organism`, `Organism (ID)`, `Function [CC]`, `Keywords`, `Keyword ID`,
+    `Proteomes`, `Protein existence`, `Annotation`, `Length`, `Mass` and
+    `Sequence`); others are ignored.
+    """
+    entry: Dict[str, Any] = {"primaryAccession": row["Entry"]}
+    if row.get("Entry Name"):
+        entry["uniProtkbId"] = row["Entry Name"]
+    if row.get("Reviewed"):
+        reviewed = row["Reviewed"] == "reviewed"
+        entry["entryType"] = "UniProtKB reviewed (Swiss-Prot)" if reviewed else "UniProtKB unreviewed (TrEMBL)"
+    if row.get("Annotation"):
+        entry["annotationScore"] = float(row["Annotation"])
+    if row.get("Protein existence") in PROTEIN_EXISTENCE:
+        entry["proteinExistence"] = PROTEIN_EXISTENCE[row["Protein existence"]]
+
+    if names := row.get("Protein names"):
+        # "Insulin (Alternative name) [Cleaved into: ...]": the first name is the recommended one
+        full_name, _, rest = names.split(" [")[0].partition(" (")
+        alternatives = [name.rstrip(")") for name in rest.split(" (")] if rest else []
+        entry["proteinDescription"] = {
+            "recommendedName": {"fullName": {"value": full_name}},
+            **({"alternativeNames": [{"fullName": {"value": name}} for name in alternatives]} if alternatives else {}),
+        }
+
+    gene_names = _split(row.get("Gene Names"), " ")
+    if gene_names:
+        primary = row.get("Gene Names (primary)") or gene_names[0]
+        gene: Dict[str, Any] = {"geneName": {"value": primary}}
+        if synonyms := [name for name in gene_names if name != primary]:
+            gene["synonyms"] = [{"value": name} for name in synonyms]
+        entry["genes"] = [gene]
+
+    if row.get("Organism") or row.get("Organism (ID)"):
+        scientific_name, _, common_name = (row.get("Organism") or "").partition(" (")
+        organism: Dict[str, Any] = {"scientificName": scientific_name}
+        if common_name:
+            organism["commonName"] = common_name.rstrip(")")
+        if (row.get("Organism (ID)") or "").isdigit():
+            organism["taxonId"] = int(row["Organism (ID)"])
+        entry["organism"] = organism
+
+    if function := row.get("Function [CC]"):
+        entry["comments"] = [{"commentType": "FUNCTION", "texts": [{"value": function.removeprefix("FUNCTION: ")}]}]
+
+    keywords = _split(row.get("Keywords"), ";")
+    keyword_ids = _split(row.get("Keyword ID"), ";")
+    if keywords:
+        if len(keyword_ids) != len(keywords):
+            keyword_ids = [""] * len(keywords)
+        entry["keywords"] = [
+            {"name": name, **({"id": keyword_id} if keyword_id else {})}
+            for name, keyword_id in zip(keywords, keyword_ids, strict=True)
+        ]
+
+    if proteomes := _split(row.get("Proteomes"), ";"):
+        # "UP000005640: Chromosome 11"
+        entry["uniProtKBCrossReferences"] = [
+            {
+                "database": "Proteomes",
+                "id": proteome.partition(":")[0].strip(),
+                **({"properties": [{"key": "Component", "value": component.strip()}]} if component else {}),
+            }
+            for proteome in proteomes
+            for component in [proteome.partition(":")[2]]
+        ]
+
+    sequence: Dict[str, Any] = {}
+    if row.get("Sequence"):
+        sequence["value"] = row["Sequence"]
+    if (row.get("Length") or "").isdigit():
+        sequence["length"] = int(row["Length"])
+    if (row.get("Mass") or "").replace(",", "").isdigit():
+        sequence["molWeight"] = int(row["Mass"].replace(",", ""))
+    if sequence:
+        entry["sequence"] = sequence
+    return entry
+
+
+class _Loader:
+    """Write batches of entries to the store, reporting progress."""
+
+    def __init__(self, store: LocalStore, report: Report):
+        self.store = store
+        self.report = report
+        self.started = self.last_report = time.monotonic()
+        self.written = 0
+
+    def add(self, batch: List[Dict[str, Any]]) -> None:
+        self.written += self.store.add_entries(batch)
+        if time.monotonic() - self.last_report >= REPORT_INTERVAL:
+            self.last_report = time.monotonic()
+            self.report(f"ingested {self.written} entries, {self.written / (self.last_report - self.started):.0f}/s")
+
+    def finish(self) -> int:
+        self.report("building indexes")
+        self.store.finish()
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        self.report(
+            f"ingested {self.written} entries in {elapsed:.0f}s ({self.written / elapsed:.0f}/s);"
+            f" {self.store.count()} in {self.store.path}"
+        )
+        return self.written
+
+
+def ingest(
+    path: str,
+    store: LocalStore,
+    dump_format: DumpFormat | None = None,
+    batch_size: int = 5000,
+    report: Report = print,
+) -> int:
+    """Load a dump into the store in batches, returning the number of entries written.
+
+    Entries already in the store are replaced. Secondary indexes are
+    (re)built once every batch is written.
+    """
+    dump_format = dump_format or detect_format(path)
+    entries = read_json_entries(path) if dump_format == "json" else read_tsv_entries(path)
+
+    loader = _Loader(store, report)
+    while batch := list(islice(entries, batch_size)):
+        loader.add(batch)
+    return loader.finish()
+
+
+async def ingest_query(query: str, store: LocalStore, batch_size: int = 5000, report: Report = print) -> int:
+    """Load every entry matching a UniProt query into the store, returning the number written.
+
+    Entries are streamed from UniProt's `/stream` endpoint, with all their
+    fields, and written as in `ingest`.
+
+    Raises:
+        QuerySyntaxError: If the query is malformed.
+        RuntimeError: If the request fails or returns a non-200 status.
+    """
+    from uniprot_mcp.tools.search_uniprot import stream_uniprot
+
+    loader = _Loader(store, report)
+    batch: List[Dict[str, Any]] = []
+    async for entry in stream_uniprot(query, raw=True):
+        batch.append(cast(Dict[str, Any], entry))
+        if len(batch) == batch_size:
+            loader.add(batch)
+            batch = []
+    if batch:
+        loader.add(batch)
+    return loader.finish()
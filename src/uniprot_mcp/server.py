@@ -1,38 +1,92 @@
 import logging
+import os
 import signal
 import sys
-from contextlib import contextmanager
-from typing import Literal 
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Literal
 
+import anyio
 from fastmcp import FastMCP
 
 from uniprot_mcp.prompts.prompts import get_prompt
-from uniprot_mcp.tools.search_uniprot import search_uniprot
+from uniprot_mcp.settings import settings
+from uniprot_mcp.tools.fetch_entries import fetch_entries
+from uniprot_mcp.tools.get_sequences import get_sequences
+from uniprot_mcp.tools.search_uniprot import search_uniprot, search_uniprot_page
+from uniprot_mcp.utils.http import close_http_client
+from uniprot_mcp.utils.metrics import render, timed_tool
+from uniprot_mcp.utils.profiling import profiled_tool, write_aggregate_profile
+
+if TYPE_CHECKING:
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import Response
 
 logger = logging.getLogger(__name__)
 
+# Seconds a worker waits for open connections to finish when stopped
+WORKER_SHUTDOWN_TIMEOUT = 5
+
 
 class UniprotMCP:
     def __init__(self, name: str | None = None):
         self.app: FastMCP = FastMCP(name=name)
-        # self._register_tools()
+        self._register_tools()
+        self._register_routes()
         # self._register_prompts()
         self._shutdown_requested: bool = False
     
     def _register_tools(self):
-        self.app.add_tool(search_uniprot)
+        for tool in (search_uniprot, search_uniprot_page, fetch_entries, get_sequences):
+            self.app.tool(timed_tool(profiled_tool(tool)))
+
+    def _register_routes(self):
+        """Serve Prometheus metrics at `/metrics`, next to `/mcp/` (streamable-http only)."""
+        self.app.custom_route("/metrics", methods=["GET"])(self._metrics)
+
+    async def _metrics(self, request: "Request") -> "Response":
+        from starlette.responses import PlainTextResponse
+
+        return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
     def _register_prompts(self):
         self.app.add_prompt(get_prompt)
+
+    def http_app(self, stateless: bool = False) -> "Starlette":
+        """Return the streamable-http ASGI app, which releases shared resources when it shuts down.
+
+        Args:
+            stateless: Serve each request without a session, so that requests
+                of one client can be answered by different processes.
+        """
+        self.app.settings.stateless_http = stateless
+        app = self.app.http_app(path="/mcp/", transport="streamable-http")
+        lifespan = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def release_on_shutdown(app: "Starlette") -> AsyncIterator[None]:
+            async with lifespan(app):
+                try:
+                    yield
+                finally:
+                    await close_http_client()
+                    write_aggregate_profile()
+
+        app.router.lifespan_context = release_on_shutdown
+        return app
     
-    def _handle_shutdown(self):
+    def _handle_shutdown(self, signum, frame):
         """Handle shutdown signals gracefully.
 
+        Raising SystemExit unwinds the running event loop through `_serve`,
+        which closes the shared HTTP client before the process exits.
+
         Args:
             signum: Signal number
             frame: Current stack frame
         """
-        logger.info("")
+        logger.info(f"Received signal {signum}, shutting down")
         self._shutdown_requested = True
         sys.exit(0)
     
@@ -53,6 +107,14 @@ class UniprotMCP:
             signal.signal(signal.SIGINT, previous_sigint)
             signal.signal(signal.SIGTERM, previous_sigterm)
 
+    async def _serve(self, transport: Literal["stdio", "streamable-http"], **transport_kwargs: Any):
+        """Serve the app, releasing shared resources once it stops."""
+        try:
+            await self.app.run_async(transport=transport, **transport_kwargs)
+        finally:
+            await close_http_client()
+            write_aggregate_profile()
+
     def run(
         self,
         transport: Literal["stdio", "streamable-http"],
@@ -69,17 +131,69 @@ class UniprotMCP:
         with self._setup_signal_handlers():
             try:
                 if transport == "stdio":
-                    self.app.run(transport=transport)
+                    anyio.run(partial(self._serve, transport))
                 elif transport == "streamable-http":
                     if host is None or port is None:
                         raise ValueError("host and port are required for streamable-http transport")
 
-                    self.app.run(
-                        host=host, 
-                        port=port, 
-                        transport=transport,
-                        path="/mcp/",
+                    anyio.run(
+                        partial(
+                            self._serve,
+                            transport,
+                            host=host,
+                            port=port,
+                            path="/mcp/",
+                        )
                     )
             except Exception as e:
                 logger.error(f"Error running MCP server: {e}")
                 sys.exit(1)
+
+
+def create_http_app() -> "Starlette":
+    """Build the app of one worker process started by `run_workers`.
+
+    Sessions would live in the memory of the worker that created them, while
+    the next request of a client may reach any worker, so workers serve the
+    stateless transport.
+    """
+    return UniprotMCP(name=settings.SERVER_NAME).http_app(stateless=True)
+
+
+def run_workers(name: str, host: str, port: int, workers: int) -> None:
+    """Serve streamable-http from `workers` processes accepting on one listening socket.
+
+    uvicorn's supervisor binds the socket before starting the workers, restarts
+    workers that die, and on SIGINT or SIGTERM stops every worker gracefully
+    and waits for them to exit. Each worker builds its own app with
+    `create_http_app`.
+
+    Workers read their settings from the environment, so the server name and
+    settings changed on the command line are passed down as environment
+    variables. The disk cache is shared between workers; in-memory caches,
+    circuit breakers and metrics are per worker. The rate limit is split
+    between the workers so that together they keep to `RATE_LIMIT_PER_SECOND`.
+    """
+    import uvicorn
+
+    os.environ.update(
+        {
+            "SERVER_NAME": name,
+            "PROFILE": settings.PROFILE,
+            "RATE_LIMIT_PER_SECOND": str(settings.RATE_LIMIT_PER_SECOND / workers),
+            "RATE_LIMIT_BURST": str(max(1, settings.RATE_LIMIT_BURST // workers)),
+        }
+    )
+    if settings.PROFILE_DIR:
+        os.environ["PROFILE_DIR"] = settings.PROFILE_DIR
+
+    logger.info(f"Starting {workers} workers of MCP server {name!r} on http://{host}:{port}/mcp/")
+    uvicorn.run(
+        "uniprot_mcp.server:create_http_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        lifespan="on",
+        timeout_graceful_shutdown=WORKER_SHUTDOWN_TIMEOUT,
+    )
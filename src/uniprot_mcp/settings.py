@@ -11,14 +11,64 @@ class Settings(BaseSettings):
     SERVER_HOST: str = "0.0.0.0"
     SERVER_PORT: int = 9000
     TRANSPORT: Literal["stdio", "streamable-http"] = "streamable-http"
+    WORKERS: int = 1  # server processes sharing the port (streamable-http only)
 
     # API settings
     MAX_RETIRES: int = 3
+    RETRY_BACKOFF_FACTOR: float = 0.5
+    RETRY_BUDGET: float = 30.0  # max seconds a call may spend waiting between retries
     REQUEST_TIMEOUT: int = 10
+    BATCH_SIZE: int = 100
+    BATCH_CONCURRENCY: int = 4
+    MAX_URL_LENGTH: int = 4000
+    RATE_LIMIT_PER_SECOND: float = 10.0  # 0 disables rate limiting
+    RATE_LIMIT_BURST: int = 20
+
+    # Circuit breaker settings
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_FAILURE_THRESHOLD: float = 0.5
+    CIRCUIT_WINDOW: int = 20
+    CIRCUIT_MIN_REQUESTS: int = 10
+    CIRCUIT_RESET_TIMEOUT: float = 30.0
+
+    # HTTP client settings
+    HTTP2: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
 
     # Cache settings
-    CACHE_TTL: int = 86400  # 24 hours
+    CACHE_TTL: int = 86400  # 24 hours; soft TTL, entries are fresh for this long
+    CACHE_STALE_WHILE_REVALIDATE: int = 3600  # past the soft TTL, serve stale and refresh in the background
+    CACHE_HARD_TTL: int = 7 * 86400  # stale entries are kept this long to serve while UniProt fails
+    NEGATIVE_CACHE_TTL: int = 300  # empty results and 400/404/410 responses; 0 disables
+    NEGATIVE_CACHE_MAX_ENTRIES: int = 4096
     CACHE_DIR: str | None = None
+    MEMORY_CACHE_MAX_ENTRIES: int = 1024
+    MEMORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MB
+    CACHE_IO_WORKERS: int = 4
+    CACHE_SIZE_LIMIT: int = 1024 * 1024 * 1024  # 1 GB on disk, after compression
+    CACHE_SHARDS: int = 8  # SQLite files the disk cache is split over, so concurrent writers rarely wait
+    CACHE_EVICTION_POLICY: Literal[
+        "least-recently-stored",
+        "least-recently-used",
+        "least-frequently-used",
+        "none",
+    ] = "least-recently-stored"
+    CACHE_COMPRESSION: Literal["none", "zlib", "bz2", "lzma"] = "zlib"
+    CACHE_COMPRESSION_LEVEL: int = 6
+
+    # Local store settings
+    SEARCH_BACKEND: Literal["remote", "local"] = "remote"  # local answers searches from the store when it can
+    LOCAL_STORE_PATH: str | None = None  # SQLite file filled by `mcp-uniprot ingest`
+    INGEST_BATCH_SIZE: int = 5000
+    FASTA_PATH: str | None = None  # uncompressed UniProt FASTA download served by `get_sequences`
+
+    # Profiling, off by default (see utils/profiling.py)
+    PROFILE: Literal["off", "call", "aggregate"] = "off"  # call: one profile per tool call; aggregate: one in total
+    PROFILE_DIR: str | None = None  # defaults to a `profiles` directory next to the disk cache
+    PROFILE_SAMPLE_RATE: float = 1.0  # fraction of tool calls profiled
+    PROFILE_TOP: int = 20  # functions listed in the logged summary of each profile
 
     # SSL/TLS settings
     SSL_CERT_FILE: str | None = None
@@ -0,0 +1,428 @@
+"""Local UniProtKB store: entries in SQLite, searchable without UniProt.
+
+The store is filled from UniProtKB dumps by `mcp-uniprot ingest` (see
+`uniprot_mcp.ingest`) and, with `SEARCH_BACKEND=local`, answers
+`search_uniprot` calls. Entries are kept as zlib-compressed JSON in the
+shape UniProt returns them, so results look the same whichever backend
+produced them.
+
+Protein names, gene names, function comments and keywords are indexed
+with FTS5; accession, taxon ID, proteome and exact gene names have B-tree
+indexes. Free text is matched against the full-text columns and, when it
+looks like an accession, taxon ID or proteome ID, against those keys. The store
+is a `PostingIndex`: queries are parsed and planned by `utils.query`, and
+queries using fields the store does not index raise
+`UnsupportedQueryError`, so the caller can ask UniProt instead.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import zlib
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.utils.canonical import ACCESSION
+from uniprot_mcp.utils.query import And, Node, QueryPlanner, Range, Term, UnsupportedQueryError, parse_query
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    accession TEXT NOT NULL,
+    taxon_id INTEGER,
+    reviewed INTEGER NOT NULL,
+    entry BLOB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS entries_accession ON entries (accession);
+CREATE TABLE IF NOT EXISTS entry_proteomes (
+    proteome TEXT NOT NULL,
+    entry_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entry_genes (
+    name TEXT NOT NULL COLLATE NOCASE,
+    entry_id INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+    protein_name, gene, function, keyword,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Built once loading is done rather than maintained row by row
+INDEXES = """
+CREATE INDEX IF NOT EXISTS entries_taxon_id ON entries (taxon_id);
+CREATE INDEX IF NOT EXISTS entries_reviewed ON entries (reviewed);
+CREATE INDEX IF NOT EXISTS entry_proteomes_proteome ON entry_proteomes (proteome, entry_id);
+CREATE INDEX IF NOT EXISTS entry_proteomes_entry_id ON entry_proteomes (entry_id);
+CREATE INDEX IF NOT EXISTS entry_genes_name ON entry_genes (name, entry_id);
+CREATE INDEX IF NOT EXISTS entry_genes_entry_id ON entry_genes (entry_id);
+"""
+
+# Query field -> full-text column it is matched against
+TEXT_FIELDS = {
+    "protein_name": "protein_name",
+    "gene": "gene",
+    "cc_function": "function",
+    "keyword": "keyword",
+}
+
+# Sort parameter -> ORDER BY clause
+SORTS = {
+    "accession asc": "e.accession ASC",
+    "accession desc": "e.accession DESC",
+}
+
+# Query field -> SQL selecting the IDs of the entries with a given value
+KEY_FIELDS = {
+    "accession": "SELECT id FROM entries WHERE accession = ?",
+    "organism_id": "SELECT id FROM entries WHERE taxon_id = ?",
+    "reviewed": "SELECT id FROM entries WHERE reviewed = ?",
+    "proteome": "SELECT entry_id FROM entry_proteomes WHERE proteome = ?",
+    "gene_exact": "SELECT DISTINCT entry_id FROM entry_genes WHERE name = ?",
+}
+
+# Characters the unicode61 tokenizer keeps in tokens
+_fts_token = re.compile(r"[^\W_]+")
+# UniProtKB accession, optionally of an isoform (`P01308-2`)
+_proteome = re.compile(r"UP\d{9}", re.I)
+
+
+def get_store_path() -> str:
+    """Return the path of the local store's SQLite file."""
+    from platformdirs import user_data_dir
+
+    return settings.LOCAL_STORE_PATH or os.path.join(user_data_dir("uniprot-mcp"), "uniprot.sqlite")
+
+
+def index_terms(entry: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """Return the protein name, gene, function and keyword text indexed for an entry."""
+    names: List[str] = []
+    _collect_values(entry.get("proteinDescription"), names)
+
+    functions = [
+        text.get("value") or ""
+        for comment in entry.get("comments") or []
+        if comment.get("commentType") == "FUNCTION"
+        for text in comment.get("texts") or []
+    ]
+    keywords = [
+        f"{keyword.get('id') or ''} {keyword.get('name') or ''}".strip() for keyword in entry.get("keywords") or []
+    ]
+    return " ; ".join(names), " ".join(gene_names(entry)), " ".join(functions), " ; ".join(keywords)
+
+
+def gene_names(entry: Dict[str, Any]) -> List[str]:
+    """Return an entry's gene names, synonyms, ORF names and ordered locus names."""
+    names: List[str] = []
+    for gene in entry.get("genes") or []:
+        if gene.get("geneName"):
+            names.append(gene["geneName"].get("value") or "")
+        for key in ("synonyms", "orfNames", "orderedLocusNames"):
+            names.extend(name.get("value") or "" for name in gene.get(key) or [])
+    return [name for name in names if name]
+
+
+def _collect_values(node: Any, values: List[str]) -> None:
+    if isinstance(node, list):
+        for item in node:
+            _collect_values(item, values)
+    elif isinstance(node, dict):
+        for key, item in node.items():
+            if key == "value" and isinstance(item, str):
+                values.append(item)
+            elif key not in ("ecNumbers", "evidences"):
+                _collect_values(item, values)
+
+
+def entry_proteomes(entry: Dict[str, Any]) -> List[str]:
+    """Return the proteome IDs an entry belongs to, from its cross-references."""
+    return [
+        xref["id"]
+        for xref in entry.get("uniProtKBCrossReferences") or []
+        if xref.get("database") == "Proteomes" and xref.get("id")
+    ]
+
+
+def fts_expression(term: Term) -> str:
+    """Translate a text term to an FTS5 MATCH expression on its column."""
+    value = term.value.rstrip("*") if term.prefix else term.value
+    phrase = '"' + value.replace('"', '""') + '"' + ("*" if term.prefix else "")
+    return f"{TEXT_FIELDS[term.field.lower()]} : {phrase}" if term.field else phrase
+
+
+def fts_tokens(value: str) -> List[str]:
+    """Approximate the tokens unicode61 (with diacritics removed) produces for `value`."""
+    folded = "".join(c for c in unicodedata.normalize("NFKD", value.lower()) if not unicodedata.combining(c))
+    return _fts_token.findall(folded)
+
+
+def key_value(field: str, value: str) -> Any:
+    """Convert a term's value to what is stored in a key column.
+
+    Raises:
+        UnsupportedQueryError: If the value cannot be stored in that column.
+    """
+    if field == "accession" and "*" not in value:
+        return value.upper()
+    if field == "organism_id" and value.isdigit():
+        return int(value)
+    if field == "reviewed" and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    if field == "proteome" and "*" not in value:
+        return value.upper()
+    if field == "gene_exact" and "*" not in value and "?" not in value:
+        return value
+    raise UnsupportedQueryError(f"Unsupported value for {field}: {value}")
+
+
+def free_text_keys(term: Term) -> List[Tuple[str, Any]]:
+    """Return the key fields, and values, a free-text term is matched against besides the text columns.
+
+    UniProt matches free text against all fields, so an accession, taxon ID
+    or proteome ID given without a field finds the entries it identifies.
+
+    Raises:
+        UnsupportedQueryError: For an isoform accession, which the store does not index.
+    """
+    if term.field or term.prefix:
+        return []
+    match = ACCESSION.fullmatch(term.value)
+    if match and match[2]:
+        raise UnsupportedQueryError(f"Unsupported isoform accession: {term}")
+    if match:
+        return [("accession", term.value.upper())]
+    if term.value.isdigit():
+        return [("organism_id", int(term.value))]
+    if _proteome.fullmatch(term.value):
+        return [("proteome", term.value.upper())]
+    return []
+
+
+class LocalStore:
+    """A SQLite database of UniProtKB entries.
+
+    Connections are opened per thread, so one store can serve searches from
+    the cache thread pool.
+
+    Args:
+        path: SQLite file.
+        readonly: Open the file read-only; it must already exist.
+    """
+
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self.readonly:
+                connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                connection = sqlite3.connect(self.path)
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.execute("PRAGMA synchronous = NORMAL")
+                connection.executescript(SCHEMA)
+            connection.execute("PRAGMA cache_size = -65536")  # 64 MB
+            # Per-term document counts, for the planner's estimates
+            connection.execute("CREATE VIRTUAL TABLE temp.entries_vocab USING fts5vocab(main, entries_fts, 'row')")
+            self._local.connection = connection
+        return connection
+
+    def add_entries(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace a batch of entries in one transaction; return how many were written."""
+        batch = {entry["primaryAccession"]: entry for entry in entries}
+        if not batch:
+            return 0
+
+        connection = self.connection
+        with connection:
+            accessions = list(batch)
+            placeholders = ",".join("?" * len(accessions))
+            replaced = [
+                row[0]
+                for row in connection.execute(f"SELECT id FROM entries WHERE accession IN ({placeholders})", accessions)
+            ]
+            if replaced:
+                self._delete(replaced)
+
+            next_id = connection.execute("SELECT coalesce(max(id), 0) + 1 FROM entries").fetchone()[0]
+            rows: List[Tuple[int, str, int | None, bool, bytes]] = []
+            texts: List[Tuple[int, str, str, str, str]] = []
+            proteomes: List[Tuple[str, int]] = []
+            genes: List[Tuple[str, int]] = []
+            for entry_id, (accession, entry) in enumerate(batch.items(), start=next_id):
+                rows.append((
+                    entry_id,
+                    accession,
+                    (entry.get("organism") or {}).get("taxonId"),
+                    str(entry.get("entryType", "")).startswith("UniProtKB reviewed"),
+                    zlib.compress(json.dumps(entry, separators=(",", ":")).encode()),
+                ))
+                texts.append((entry_id, *index_terms(entry)))
+                proteomes.extend((proteome, entry_id) for proteome in entry_proteomes(entry))
+                genes.extend((name, entry_id) for name in gene_names(entry))
+
+            connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+            connection.executemany(
+                "INSERT INTO entries_fts (rowid, protein_name, gene, function, keyword) VALUES (?, ?, ?, ?, ?)", texts
+            )
+            connection.executemany("INSERT INTO entry_proteomes VALUES (?, ?)", proteomes)
+            connection.executemany("INSERT INTO entry_genes VALUES (?, ?)", genes)
+        return len(batch)
+
+    def _delete(self, entry_ids: List[int]) -> None:
+        placeholders = ",".join("?" * len(entry_ids))
+        self.connection.execute(f"DELETE FROM entries WHERE id IN ({placeholders})", entry_ids)
+        self.connection.execute(f"DELETE FROM entries_fts WHERE rowid IN ({placeholders})", entry_ids)
+        self.connection.execute(f"DELETE FROM entry_proteomes WHERE entry_id IN ({placeholders})", entry_ids)
+        self.connection.execute(f"DELETE FROM entry_genes WHERE entry_id IN ({placeholders})", entry_ids)
+
+    def finish(self) -> None:
+        """Build the secondary indexes and optimize the full-text index after loading."""
+        connection = self.connection
+        connection.executescript(INDEXES)
+        connection.execute("INSERT INTO entries_fts (entries_fts) VALUES ('optimize')")
+        connection.execute("ANALYZE")
+        connection.commit()
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT count(*) FROM entries").fetchone()[0]
+
+    def search(self, query: str, size: int | None = None, sort: str | None = None) -> List[Dict[str, Any]]:
+        """Return the entries matching a UniProt query.
+
+        Conjunctive text queries are ordered best match first, others by
+        reviewed status then accession.
+
+        Raises:
+            QuerySyntaxError: If the query is malformed.
+            UnsupportedQueryError: If the query or sort order cannot be evaluated locally.
+        """
+        node = parse_query(query)
+        if sort and sort.lower() not in SORTS:
+            raise UnsupportedQueryError(f"Unsupported sort: {sort}")
+        entry_ids = QueryPlanner(self).evaluate(node)
+        if not entry_ids.ids and not entry_ids.complement:
+            return []
+
+        # Complements are resolved here rather than by listing every entry ID
+        membership = "NOT IN" if entry_ids.complement else "IN"
+        params: List[Any] = [json.dumps(sorted(entry_ids.ids))]
+        rank = None if sort else self._rank_expression(node)
+        if rank is not None:
+            sql = (
+                "SELECT e.entry FROM entries_fts f JOIN entries e ON e.id = f.rowid"
+                # `+` stops FTS5 from re-running the match once per candidate rowid
+                f" WHERE entries_fts MATCH ? AND +f.rowid {membership} (SELECT value FROM json_each(?)) ORDER BY f.rank"
+            )
+            params.insert(0, rank)
+        else:
+            order = SORTS[sort.lower()] if sort else "e.reviewed DESC, e.accession"
+            sql = f"SELECT e.entry FROM entries e WHERE e.id {membership} (SELECT value FROM json_each(?)) ORDER BY {order}"
+        if size is not None:
+            sql += " LIMIT ?"
+            params.append(size)
+        return [json.loads(zlib.decompress(row[0])) for row in self.connection.execute(sql, params)]
+
+    @staticmethod
+    def _rank_expression(node: Node) -> str | None:
+        """MATCH expression to rank by, when every result is known to match it."""
+        children = node.children if isinstance(node, And) else (node,)
+        text_terms = [
+            child
+            for child in children
+            if isinstance(child, Term)
+            and child.value != "*"
+            and (child.field or "").lower() in ("", *TEXT_FIELDS)
+            # Entries found through a key column need not match the text
+            and not free_text_keys(child)
+        ]
+        return " AND ".join(fts_expression(term) for term in text_terms) if text_terms else None
+
+    # PostingIndex
+    def estimate(self, term: Term | Range) -> int:
+        if isinstance(term, Range):
+            raise UnsupportedQueryError(f"Unsupported range: {term}")
+        field = (term.field or "").lower()
+        if not field and term.value == "*":
+            return self.count()
+        if not field:
+            return self._free_text_estimate(term)
+        if field in TEXT_FIELDS:
+            return self._text_estimate(term)
+        if field not in KEY_FIELDS:
+            raise UnsupportedQueryError(f"Unsupported query field: {term}")
+        return self._key_count(field, key_value(field, term.value))
+
+    def _free_text_estimate(self, term: Term) -> int:
+        keys = free_text_keys(term)
+        if any(field == "accession" and not self._key_count(field, value) for field, value in keys):
+            # Possibly a secondary accession, or an entry that was not ingested
+            raise UnsupportedQueryError(f"Accession not in the local store: {term}")
+        return self._text_estimate(term) + sum(self._key_count(field, value) for field, value in keys)
+
+    def _key_count(self, field: str, value: Any) -> int:
+        try:
+            return self.connection.execute(f"SELECT count(*) FROM ({KEY_FIELDS[field]})", [value]).fetchone()[0]
+        except sqlite3.OperationalError as e:
+            # A store ingested before the table existed
+            raise UnsupportedQueryError(f"The local store does not index {field}; re-run `mcp-uniprot ingest`") from e
+
+    def _text_estimate(self, term: Term) -> int:
+        """Smallest document count of the term's tokens, from the FTS vocabulary."""
+        value = term.value[:-1] if term.prefix else term.value
+        tokens = fts_tokens(value)
+        if not tokens or (not term.phrase and ("*" in value or "?" in value)):
+            raise UnsupportedQueryError(f"Unsupported text term: {term}")
+
+        def documents(sql: str, *params: str) -> int:
+            return self.connection.execute(sql, params).fetchone()[0]
+
+        counts = [documents("SELECT coalesce(max(doc), 0) FROM temp.entries_vocab WHERE term = ?", t) for t in tokens]
+        if term.prefix:
+            counts[-1] = documents(
+                "SELECT coalesce(sum(doc), 0) FROM temp.entries_vocab WHERE term >= ? AND term < ?",
+                tokens[-1],
+                tokens[-1] + "\U0010ffff",
+            )
+        return min(counts)
+
+    def postings(self, term: Term | Range) -> Set[int]:
+        assert isinstance(term, Term)
+        field = (term.field or "").lower()
+        if field in KEY_FIELDS:
+            return {row[0] for row in self.connection.execute(KEY_FIELDS[field], [key_value(field, term.value)])}
+        sql = "SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?"
+        ids = {row[0] for row in self.connection.execute(sql, [fts_expression(term)])}
+        for key_field, value in free_text_keys(term):
+            ids.update(row[0] for row in self.connection.execute(KEY_FIELDS[key_field], [value]))
+        return ids
+
+    async def asearch(self, query: str, size: int | None = None, sort: str | None = None) -> List[Dict[str, Any]]:
+        """Run `search` on the cache thread pool, without blocking the event loop."""
+        from uniprot_mcp.utils.cache import get_cache_executor
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_cache_executor(), self.search, query, size, sort)
+
+
+_store: LocalStore | None = None
+
+
+def get_local_store() -> LocalStore | None:
+    """Return the read-only local store, or None if nothing has been ingested yet."""
+    global _store
+    if _store is None:
+        path = get_store_path()
+        if not os.path.exists(path):
+            return None
+        _store = LocalStore(path, readonly=True)
+    return _store
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.tools.search_uniprot import BASE_URL
+from uniprot_mcp.utils.cache import (
+    aget_cache_response,
+    cache_negative_response,
+    cache_response_in_background,
+    generate_cache_key,
+    get_negative_cache,
+)
+from uniprot_mcp.utils.canonical import ACCESSION, canonicalize_fields
+from uniprot_mcp.utils.http import call_http, is_upstream_failure, parse_response
+
+logger = logging.getLogger(__name__)
+
+
+def entry_cache_key(accession: str, fields: str | None) -> str:
+    """Cache key of a single entry, as served by UniProt's `/uniprotkb/{accession}`."""
+    return generate_cache_key("GET", f"{BASE_URL}/{accession}", {"fields": fields})
+
+
+def chunk_accessions(accessions: List[str], fields: str | None) -> List[List[str]]:
+    """Split accessions into batches that respect the batch size and URL length limits."""
+    url_length = len(f"{BASE_URL}/accessions?accessions=&size=000")
+    if fields:
+        url_length += len(f"&fields={fields}") + 2 * fields.count(",")
+
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    length = url_length
+    for accession in accessions:
+        added = len(accession) + (3 if chunk else 0)  # "," is sent as %2C
+        if chunk and (len(chunk) >= settings.BATCH_SIZE or length + added > settings.MAX_URL_LENGTH):
+            chunks.append(chunk)
+            chunk, length, added = [], url_length, len(accession)
+        chunk.append(accession)
+        length += added
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+async def fetch_entries(
+    accessions: List[str],
+    fields: List[str] | None = None,
+) -> str:
+    """
+    Retrieve many UniProtKB entries by accession in as few requests as possible.
+
+    Prefer this over calling `search_uniprot` once per accession. Entries are
+    served from the cache when possible; the rest are fetched in batches.
+    Accessions recently found missing are not looked up again until the
+    negative cache expires, and malformed accessions are never looked up.
+
+    Args:
+        accessions: UniProtKB accession numbers, e.g. ["P01308", "P69905"].
+        fields: Optional list of fields to include for each entry.
+
+    Returns:
+        JSON string with `results` in the same order as `accessions` (null for
+        accessions that were not found), the list of `not_found` accessions,
+        malformed ones included, and `errors` for batches that failed.
+        Accessions answered from outdated cache entries because UniProt
+        failed are listed in `stale`.
+    """
+    from pydantic import ValidationError
+
+    from uniprot_mcp.tools.models import UniProtKBEntry, UniProtSearchResponse
+
+    requested = [accession.strip().upper() for accession in accessions]
+    unique = list(dict.fromkeys(accession for accession in requested if accession))
+    fields_param = canonicalize_fields(fields) if fields else None
+    # Secondary accessions are needed to recognize the entry an obsolete accession was merged into
+    request_fields = canonicalize_fields([*fields, "sec_acc"]) if fields else None
+    drop_secondary = request_fields != fields_param
+
+    def read_entry(accession: str, content: str) -> UniProtKBEntry | None:
+        try:
+            return UniProtKBEntry.model_validate_json(content)
+        except ValidationError as e:
+            # Corrupt, or written for an older shape of the model
+            logger.warning(f"Ignoring unreadable cache entry for {accession}: {e}")
+            return None
+
+    entries: Dict[str, UniProtKBEntry] = {}
+    negative_cache = get_negative_cache()
+    # A malformed accession would make UniProt reject its whole batch
+    valid = [a for a in unique if ACCESSION.fullmatch(a)]
+    lookup = [a for a in valid if negative_cache.get(entry_cache_key(a, fields_param)) is None]
+    cached = await asyncio.gather(*(aget_cache_response(entry_cache_key(a, fields_param)) for a in lookup))
+    misses: List[str] = []
+    stale_entries: Dict[str, UniProtKBEntry] = {}
+    now = time.time()
+    for accession, (content, _, fresh_until) in zip(lookup, cached, strict=True):
+        entry = read_entry(accession, content) if content else None
+        if entry is not None and (fresh_until is None or fresh_until > now):
+            entries[accession] = entry
+        else:
+            misses.append(accession)
+            if entry is not None:
+                stale_entries[accession] = entry
+
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    errors: List[Dict[str, Any]] = []
+    stale: List[str] = []
+
+    async def fetch_chunk(chunk: List[str]) -> None:
+        params: Dict[str, Any] = {"accessions": ",".join(chunk), "size": len(chunk)}
+        if request_fields:
+            params["fields"] = request_fields
+
+        async with semaphore:
+            status, content, _ = await call_http("GET", f"{BASE_URL}/accessions", params=params)
+        parsed_data, error_obj = parse_response(status, content, UniProtSearchResponse)
+        if error_obj:
+            logger.error(f"Error fetching {len(chunk)} accessions: {error_obj.message}")
+            if is_upstream_failure(error_obj.code):
+                # Answer from outdated entries while UniProt is failing
+                for accession in chunk:
+                    if accession in stale_entries:
+                        entries[accession] = stale_entries[accession]
+                        stale.append(accession)
+            errors.append({
+                "accessions": chunk,
+                "error": f"API Error {error_obj.code}",
+                "details": error_obj.message,
+            })
+            return
+
+        wanted = set(chunk)
+        for entry in parsed_data.results:
+            # Obsolete accessions resolve to the entry they were merged into
+            matched = [entry.primaryAccession, *(entry.secondaryAccessions or [])]
+            if drop_secondary:
+                entry = entry.model_copy(update={"secondaryAccessions": None})
+            for accession in matched:
+                if accession in wanted:
+                    entries[accession] = entry
+                    cache_response_in_background(
+                        entry_cache_key(accession, fields_param),
+                        entry.model_dump_json(exclude_none=True),
+                        settings.CACHE_TTL,
+                    )
+        for accession in chunk:
+            if accession not in entries:
+                cache_negative_response(entry_cache_key(accession, fields_param), 404, "", {})
+
+    await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunk_accessions(misses, request_fields)))
+
+    failed = {accession for error in errors for accession in error["accessions"]}
+    data_to_return: Dict[str, Any] = {
+        "results": [
+            entries[accession].model_dump(mode="json", exclude_none=True) if accession in entries else None
+            for accession in requested
+        ],
+        "not_found": [accession for accession in unique if accession not in entries and accession not in failed],
+    }
+    if stale:
+        data_to_return["stale"] = stale
+    if errors:
+        data_to_return["errors"] = errors
+
+    return json.dumps(data_to_return)
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.tools.fetch_entries import chunk_accessions
+from uniprot_mcp.tools.search_uniprot import BASE_URL
+from uniprot_mcp.utils.cache import (
+    aget_cache_response,
+    cache_negative_response,
+    cache_response_in_background,
+    generate_cache_key,
+    get_negative_cache,
+)
+from uniprot_mcp.utils.canonical import ACCESSION
+from uniprot_mcp.utils.fasta import aget_fasta_index, split_fasta
+from uniprot_mcp.utils.http import call_http, is_upstream_failure, parse_response
+
+logger = logging.getLogger(__name__)
+
+
+def sequence_cache_key(accession: str) -> str:
+    """Cache key of a single FASTA record, as served by UniProt's `/uniprotkb/{accession}.fasta`."""
+    return generate_cache_key("GET", f"{BASE_URL}/{accession}.fasta", None)
+
+
+async def get_sequences(accessions: List[str]) -> str:
+    """
+    Retrieve protein sequences in FASTA format for many UniProtKB accessions.
+
+    Use this instead of `fetch_entries` when only sequences are needed. They
+    are read from the local FASTA file when one is configured, then from the
+    cache, and the rest are fetched from UniProt in batches. Obsolete
+    accessions are answered with the record of the entry they were merged
+    into.
+
+    Args:
+        accessions: UniProtKB accession numbers, e.g. ["P01308", "P69905"].
+
+    Returns:
+        JSON string with `fasta` (the records, in the order of `accessions`),
+        the list of `not_found` accessions, malformed ones included, and
+        `errors` for batches that failed. Accessions answered from outdated cache entries because
+        UniProt failed are listed in `stale`.
+    """
+    requested = [accession.strip().upper() for accession in accessions]
+    unique = list(dict.fromkeys(accession for accession in requested if accession))
+
+    records: Dict[str, str] = {}
+    index = await aget_fasta_index()
+    if index is not None:
+        for accession in unique:
+            if (record := index.get(accession)) is not None:
+                records[accession] = record
+
+    negative_cache = get_negative_cache()
+    # A malformed accession would make UniProt reject its whole batch
+    valid = [a for a in unique if a not in records and ACCESSION.fullmatch(a)]
+    lookup = [a for a in valid if negative_cache.get(sequence_cache_key(a)) is None]
+    cached = await asyncio.gather(*(aget_cache_response(sequence_cache_key(a)) for a in lookup))
+    misses: List[str] = []
+    stale_content: Dict[str, str] = {}
+    now = time.time()
+    for accession, (content, _, fresh_until) in zip(lookup, cached, strict=True):
+        if content and (fresh_until is None or fresh_until > now):
+            records[accession] = content
+        else:
+            misses.append(accession)
+            if content:
+                stale_content[accession] = content
+
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    errors: List[Dict[str, Any]] = []
+    stale: List[str] = []
+
+    async def resolve_secondary(missing: List[str], unclaimed: Dict[str, str]) -> bool:
+        """Match records returned under another accession to the obsolete accessions merged into it.
+
+        FASTA headers only carry the primary accession, so the mapping is
+        looked up separately. Returns False, recording an error, if that fails.
+        """
+        from uniprot_mcp.tools.models import UniProtSearchResponse
+
+        params = {"accessions": ",".join(missing), "size": len(missing), "fields": "accession,sec_acc"}
+        async with semaphore:
+            status, content, _ = await call_http("GET", f"{BASE_URL}/accessions", params=params)
+        parsed_data, error_obj = parse_response(status, content, UniProtSearchResponse)
+        if error_obj:
+            logger.error(f"Error resolving {len(missing)} secondary accessions: {error_obj.message}")
+            errors.append({
+                "accessions": missing,
+                "error": f"API Error {error_obj.code}",
+                "details": error_obj.message,
+            })
+            return False
+
+        wanted = set(missing)
+        for entry in parsed_data.results:
+            record = unclaimed.get(entry.primaryAccession)
+            for accession in entry.secondaryAccessions or []:
+                if record is not None and accession in wanted:
+                    records[accession] = record
+                    cache_response_in_background(sequence_cache_key(accession), record, settings.CACHE_TTL)
+        return True
+
+    async def fetch_chunk(chunk: List[str]) -> None:
+        params: Dict[str, Any] = {"accessions": ",".join(chunk), "size": len(chunk), "format": "fasta"}
+        async with semaphore:
+            status, content, _ = await call_http("GET", f"{BASE_URL}/accessions", params=params)
+        text, error_obj = parse_response(status, content, str)
+        if error_obj:
+            logger.error(f"Error fetching {len(chunk)} sequences: {error_obj.message}")
+            if is_upstream_failure(error_obj.code):
+                # Answer from outdated records while UniProt is failing
+                for accession in chunk:
+                    if accession in stale_content:
+                        records[accession] = stale_content[accession]
+                        stale.append(accession)
+            errors.append({
+                "accessions": chunk,
+                "error": f"API Error {error_obj.code}",
+                "details": error_obj.message,
+            })
+            return
+
+        wanted = set(chunk)
+        unclaimed: Dict[str, str] = {}
+        for accession, record in split_fasta(text).items():
+            if accession in wanted:
+                records[accession] = record
+                cache_response_in_background(sequence_cache_key(accession), record, settings.CACHE_TTL)
+            else:
+                unclaimed[accession] = record
+        missing = [accession for accession in chunk if accession not in records]
+        if unclaimed and missing and not await resolve_secondary(missing, unclaimed):
+            return
+        for accession in missing:
+            if accession not in records:
+                cache_negative_response(sequence_cache_key(accession), 404, "", {})
+
+    await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunk_accessions(misses, None)))
+
+    failed = {accession for error in errors for accession in error["accessions"]}
+    data_to_return: Dict[str, Any] = {
+        "fasta": "".join(records[accession] for accession in dict.fromkeys(requested) if accession in records),
+        "not_found": [accession for accession in unique if accession not in records and accession not in failed],
+    }
+    if stale:
+        data_to_return["stale"] = stale
+    if errors:
+        data_to_return["errors"] = errors
+
+    return json.dumps(data_to_return)
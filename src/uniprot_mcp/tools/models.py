@@ -622,6 +622,11 @@ class Keyword(BaseModel):
 class Sequence(BaseModel):
     type: str | None = None
     ref: str | None = None
+    value: str | None = None
+    length: int | None = None
+    molWeight: int | None = None
+    crc64: str | None = None
+    md5: str | None = None
 
 
 class InternalLine(BaseModel):
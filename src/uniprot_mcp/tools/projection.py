@@ -0,0 +1,112 @@
+"""Search response models narrowed to the fields requested from UniProt.
+
+`tools.models` is imported on first use rather than at import time; building
+its model graph is the most expensive part of starting the server.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type, cast
+
+from pydantic import BaseModel, create_model
+
+# Keys UniProt includes in every entry, whatever fields were requested
+ALWAYS_RETURNED = ("primaryAccession", "entryType", "extraAttributes", "active", "inactiveReason")
+
+# Return field name -> JSON keys of the entry it populates
+FIELD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "accession": ("primaryAccession",),
+    "id": ("uniProtkbId",),
+    "sec_acc": ("secondaryAccessions",),
+    "reviewed": ("entryType",),
+    "annotation_score": ("annotationScore",),
+    "protein_existence": ("proteinExistence",),
+    "protein_name": ("proteinDescription",),
+    "ec": ("proteinDescription",),
+    "gene_names": ("genes",),
+    "gene_primary": ("genes",),
+    "gene_synonym": ("genes",),
+    "gene_oln": ("genes",),
+    "gene_orf": ("genes",),
+    "organism_name": ("organism",),
+    "organism_id": ("organism",),
+    "lineage": ("organism", "lineages"),
+    "lineage_ids": ("organism", "lineages"),
+    "virus_hosts": ("organismHosts",),
+    "organelle": ("geneLocations",),
+    "length": ("sequence",),
+    "mass": ("sequence",),
+    "sequence": ("sequence",),
+    "fragment": ("sequence", "fragment"),
+    "keyword": ("keywords",),
+    "keywordid": ("keywords",),
+    "lit_pubmed_id": ("references",),
+    "lit_doi_id": ("references",),
+    "date_created": ("entryAudit",),
+    "date_modified": ("entryAudit",),
+    "date_sequence_modified": ("entryAudit",),
+    "version": ("entryAudit",),
+    "sequence_version": ("entryAudit",),
+}
+
+# Return field name prefix -> JSON keys, for the families of comment,
+# feature and cross-reference fields
+PREFIX_KEYS: Dict[str, Tuple[str, ...]] = {
+    "cc_": ("comments",),
+    "ft_": ("features",),
+    "xref_": ("uniProtKBCrossReferences",),
+}
+
+
+def entry_keys(fields: List[str] | str | None) -> Tuple[str, ...] | None:
+    """Return the entry keys a field list populates, or None if it cannot be narrowed.
+
+    No fields means the full entry, and so does any field this module does
+    not know about: the projection must never drop data UniProt returned.
+    """
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+
+    keys = set(ALWAYS_RETURNED)
+    for field in fields:
+        field = field.strip()
+        if field in FIELD_KEYS:
+            keys.update(FIELD_KEYS[field])
+            continue
+        prefix = next((prefix for prefix in PREFIX_KEYS if field.startswith(prefix)), None)
+        if prefix is None:
+            return None
+        keys.update(PREFIX_KEYS[prefix])
+
+    from uniprot_mcp.tools.models import UniProtKBEntry
+
+    # Keep the declaration order of UniProtKBEntry so output looks the same
+    return tuple(name for name in UniProtKBEntry.model_fields if name in keys)
+
+
+@lru_cache(maxsize=256)
+def _projected_response(keys: Tuple[str, ...]) -> Type[BaseModel]:
+    from uniprot_mcp.tools.models import UniProtKBEntry
+
+    entry_fields = UniProtKBEntry.model_fields
+    field_definitions: Dict[str, Any] = {name: (entry_fields[name].annotation, entry_fields[name]) for name in keys}
+    entry_model: Type[BaseModel] = create_model(f"UniProtKBEntry[{','.join(keys)}]", **field_definitions)
+    # The entry model only exists at runtime, so its list type is built the same way
+    results = cast(Any, List)[entry_model]
+    return create_model(f"UniProtSearchResponse[{','.join(keys)}]", results=(results, ...))
+
+
+def projected_response_model(fields: List[str] | str | None) -> Type[BaseModel]:
+    """Return a search response model that only validates the requested fields.
+
+    Sub-trees of an entry that were not requested are skipped while parsing
+    instead of being validated against the full `UniProtKBEntry` tree. The
+    model for each field set is built once and reused.
+    """
+    keys = entry_keys(fields)
+    if keys is None:
+        from uniprot_mcp.tools.models import UniProtSearchResponse
+
+        return UniProtSearchResponse
+    return _projected_response(keys)
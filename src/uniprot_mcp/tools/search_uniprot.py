@@ -1,20 +1,148 @@
 import json
 import logging
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Literal
+from urllib.parse import parse_qs, urlsplit
 
-from uniprot_mcp.tools.models import UniProtSearchResponse
-from uniprot_mcp.utils.http import request_api, RequestError
+from pydantic import BaseModel
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.tools.projection import entry_keys, projected_response_model
+from uniprot_mcp.utils.cache import STALE_WARNING
+from uniprot_mcp.utils.columnar import ColumnarTable
+from uniprot_mcp.utils.http import (
+    RequestError,
+    parse_next_link,
+    request_api_with_headers,
+    stream_http,
+)
+from uniprot_mcp.utils.jsonstream import JSONArrayItemDecoder
+from uniprot_mcp.utils.metrics import stage
+from uniprot_mcp.utils.query import QuerySyntaxError, parse_query
+
+if TYPE_CHECKING:
+    from uniprot_mcp.tools.models import UniProtKBEntry
 
 BASE_URL = "https://rest.uniprot.org/uniprotkb"
+# Defaults of `search_uniprot`, also used by `warm` so it fills the cache keys default calls read
+DEFAULT_FIELDS = "accession"
+DEFAULT_SIZE = 1
 logger = logging.getLogger(__name__)
 
 
+def build_search_params(
+    query: str,
+    fields: List[str] | str | None = None,
+    size: int | None = None,
+    include_isoform: bool | None = None,
+    sort: str | None = None,
+    cursor: str | None = None,
+) -> Dict[str, Any]:
+    """Build the query parameters of a UniProtKB search request."""
+    params: Dict[str, Any] = {
+        "query": query,
+        "size": size,
+    }
+
+    if fields:
+        if isinstance(fields, str):
+            fields = [fields]
+        params["fields"] = ",".join(fields)
+
+    if include_isoform is not None:
+        params["includeIsoform"] = str(include_isoform).lower()
+
+    if sort:
+        params["sort"] = sort
+
+    if cursor:
+        params["cursor"] = cursor
+
+    return params
+
+
+def search_request(
+    query: str,
+    fields: List[str] | str | None = DEFAULT_FIELDS,
+    size: int | None = DEFAULT_SIZE,
+    include_isoform: bool | None = None,
+    sort: str | None = None,
+    raw: bool = False,
+    tabular: bool = False,
+) -> Dict[str, Any]:
+    """Return the `request_api_with_headers` arguments, apart from the response model, of a `search_uniprot` call."""
+    params = build_search_params(query, fields, size, include_isoform, sort)
+    if tabular:
+        params["format"] = "tsv"
+    return {
+        "url": f"{BASE_URL}/search",
+        "method": "GET",
+        "request": params,
+        # Columns follow the requested fields, so TSV bodies cannot be reused for other field sets
+        "superset_lookup": not raw and not tabular and entry_keys(fields) is not None,
+    }
+
+
+def query_syntax_error(query: str) -> str | None:
+    """Return the error response for a malformed query, or None if it parses."""
+    try:
+        parse_query(query)
+    except QuerySyntaxError as e:
+        return json.dumps({"error": "Invalid query", "details": str(e)})
+    return None
+
+
+def next_cursor(headers: Dict[str, str]) -> str | None:
+    """Extract the continuation cursor from the `Link: rel="next"` header."""
+    next_link = parse_next_link(headers)
+    if next_link is None:
+        return None
+    return parse_qs(urlsplit(next_link).query).get("cursor", [None])[0]
+
+
+async def search_local(
+    query: str,
+    fields: List[str] | None = None,
+    size: int | None = None,
+    include_isoform: bool | None = None,
+    sort: str | None = None,
+    raw: bool = False,
+) -> str | None:
+    """Answer a search from the local store, or return None if it cannot.
+
+    The store cannot answer when nothing has been ingested, when isoforms are
+    requested, or when the query uses fields it does not index.
+    """
+    from uniprot_mcp.store import get_local_store
+    from uniprot_mcp.utils.query import UnsupportedQueryError
+
+    store = get_local_store()
+    if store is None:
+        logger.warning("SEARCH_BACKEND is local but the local store is empty; run `mcp-uniprot ingest`")
+        return None
+    if include_isoform:
+        return None
+    try:
+        entries = await store.asearch(query, size, sort)
+    except UnsupportedQueryError as e:
+        logger.info(f"Searching UniProt instead of the local store: {e}")
+        return None
+
+    if raw:
+        keys = entry_keys(fields)
+        if keys is not None:
+            entries = [{key: value for key, value in entry.items() if key in keys} for entry in entries]
+        return json.dumps({"results": entries})
+    return projected_response_model(fields).model_validate({"results": entries}).model_dump_json(exclude_none=True)
+
+
 async def search_uniprot(
     query: str,
-    fields: List[str] | None = "accession",
-    size: int | None = 1,
+    fields: List[str] | None = DEFAULT_FIELDS,
+    size: int | None = DEFAULT_SIZE,
     include_isoform: bool | None = None,
     sort: str | None = None,
+    raw: bool = False,
+    format: Literal["json", "tsv"] = "json",
 ) -> str:
     """
     Search UniProtKB for protein entries matching the specified query and parameters.
@@ -41,50 +169,155 @@ async def search_uniprot(
         sort: Optional sort order for results.
         include_isoform: Whether to include isoform data.
         size: Number of results to return.
+        raw: Return UniProt's response exactly as received, without
+             validating or re-serializing it.
+        format: "json" for entries, or "tsv" for a table with one column
+                per field, returned as `{"columns": [...], "rows": n,
+                "data": [[column values], ...]}`. Use "tsv" for flat fields
+                such as accession, gene_names, length or organism_id over
+                many results; it is much smaller and faster to produce.
 
     Returns:
-        JSON string of results or an error dictionary.
+        JSON string of results or an error dictionary. Results served from an
+        outdated cache entry (e.g. while UniProt is unavailable) include
+        `"stale": true`, except in raw mode. Malformed queries are rejected
+        with an `Invalid query` error without contacting UniProt.
     """
+    if (error := query_syntax_error(query)) is not None:
+        return error
+    if settings.SEARCH_BACKEND == "local" and format == "json":
+        local_result = await search_local(query, fields, size, include_isoform, sort, raw)
+        if local_result is not None:
+            return local_result
 
-    url = f"{BASE_URL}/search"
-    params = {
-        "query": query,
-        "size": size,
-    }
+    tabular = format == "tsv"
+    parsed_data: BaseModel | ColumnarTable | str | None
+    error_obj: RequestError | None
 
-    if fields:
-        params["fields"] = ",".join(fields)
+    parsed_data, error_obj, headers = await request_api_with_headers(
+        **search_request(query, fields, size, include_isoform, sort, raw, tabular),
+        response_model_type=str if raw else ColumnarTable if tabular else projected_response_model(fields),
+    )
 
-    if include_isoform is not None:
-        params["includeIsoform"] = str(include_isoform).lower()
-    
-    parsed_data: Dict[str, Any] | None
-    error_obj: RequestError | None
+    if error_obj:
+        logger.error(f"Error: {error_obj.message}")
+        return json.dumps(
+            {
+                "error": f"API Error {error_obj.code}",
+                "details": error_obj.message,
+            }
+        )
+    if isinstance(parsed_data, str):
+        return parsed_data
+    with stage("serialize"):
+        if isinstance(parsed_data, ColumnarTable):
+            if headers.get("warning") == STALE_WARNING:
+                return json.dumps({**parsed_data.to_dict(), "stale": True}, separators=(",", ":"))
+            return parsed_data.to_json()
+        if parsed_data and headers.get("warning") == STALE_WARNING:
+            # Formatted as model_dump_json formats fresh results
+            stale_data = {**parsed_data.model_dump(mode="json", exclude_none=True), "stale": True}
+            return json.dumps(stale_data, separators=(",", ":"), ensure_ascii=False)
+        if parsed_data:
+            return parsed_data.model_dump_json(exclude_none=True)
+    return json.dumps({"error": "No results found"})
+
+
+async def search_uniprot_page(
+    query: str,
+    fields: List[str] | None = None,
+    size: int = 25,
+    include_isoform: bool | None = None,
+    sort: str | None = None,
+    cursor: str | None = None,
+) -> str:
+    """
+    Fetch one page of UniProtKB search results, with a token for the next page.
+
+    Use this instead of `search_uniprot` when a query matches more entries than
+    fit in a single response. Call it again with the returned `next_cursor`
+    to continue; a `null` cursor means there are no more pages.
+
+    Args:
+        query (str): A search query string in UniProt's advanced search syntax,
+                     as described for `search_uniprot`.
+        fields: Optional list of fields to include in the response.
+        size: Number of results per page (at most 500).
+        include_isoform: Whether to include isoform data.
+        sort: Optional sort order for results.
+        cursor: Continuation token returned by the previous page.
+
+    Returns:
+        JSON string with `results` and `next_cursor`, or an error dictionary.
+        Pages served from an outdated cache entry include `"stale": true`.
+    """
+    if (error := query_syntax_error(query)) is not None:
+        return error
 
-    parsed_data, error_obj = await request_api(
+    url = f"{BASE_URL}/search"
+    params = build_search_params(query, fields, size, include_isoform, sort, cursor)
+
+    parsed_data, error_obj, headers = await request_api_with_headers(
         url=url,
         method="GET",
-        response_model_type=UniProtSearchResponse,
+        response_model_type=projected_response_model(fields),
         request=params,
+        superset_lookup=entry_keys(fields) is not None,
     )
 
-    logger.info(f"Parsed data: {parsed_data}")
-
-    data_to_return: Dict[str, Any]
-
     if error_obj:
         logger.error(f"Error: {error_obj.message}")
-        data_to_return = {
+        return json.dumps({
             "error": f"API Error {error_obj.code}",
             "details": error_obj.message,
+        })
+
+    with stage("serialize"):
+        data_to_return: Dict[str, Any] = {
+            "results": [entry.model_dump(mode="json", exclude_none=True) for entry in parsed_data.results],
+            "next_cursor": next_cursor(headers),
         }
-    elif parsed_data:
-        data_to_return = {
-            "results": [entry.model_dump_json(exclude_none=True) for entry in parsed_data.results],
-        }
-    else:
-        data_to_return = {
-            "error": "No results found",
-        }
-    
-    return json.dumps(data_to_return)
+        if headers.get("warning") == STALE_WARNING:
+            data_to_return["stale"] = True
+        return json.dumps(data_to_return)
+
+
+async def stream_uniprot(
+    query: str,
+    fields: List[str] | None = None,
+    include_isoform: bool | None = None,
+    sort: str | None = None,
+    raw: bool = False,
+) -> AsyncIterator["UniProtKBEntry | Dict[str, Any]"]:
+    """Yield every entry matching a query from UniProt's `/stream` endpoint.
+
+    Unlike `search_uniprot`, the whole result set arrives in one response
+    without pagination. It is parsed incrementally as bytes arrive, so memory
+    stays flat regardless of the number of results. Responses are not cached.
+
+    Args:
+        query: A search query string in UniProt's advanced search syntax.
+        fields: Optional list of fields to include for each entry.
+        include_isoform: Whether to include isoform data.
+        sort: Optional sort order for results.
+        raw: Yield plain dictionaries instead of validated `UniProtKBEntry` models.
+
+    Raises:
+        QuerySyntaxError: If the query is malformed.
+        RuntimeError: If the request fails or returns a non-200 status.
+    """
+    from uniprot_mcp.tools.models import UniProtKBEntry
+
+    parse_query(query)
+
+    url = f"{BASE_URL}/stream"
+    params = build_search_params(query, fields, include_isoform=include_isoform, sort=sort)
+    params.pop("size")
+    params["format"] = "json"
+
+    decoder = JSONArrayItemDecoder("results")
+    async for chunk in stream_http(url, params=params):
+        for item in decoder.feed(chunk):
+            yield item if raw else UniProtKBEntry.model_validate(item)
+    for item in decoder.close():
+        yield item if raw else UniProtKBEntry.model_validate(item)
@@ -0,0 +1,421 @@
+"""Two-tier cache for UniProt API responses.
+
+L1 is an in-process LRU holding already-parsed response models, so hot
+entries skip both disk I/O and pydantic validation. L2 is the on-disk
+diskcache holding the raw response text, compressed and size-bounded,
+shared across restarts.
+
+L2 is a `FanoutCache` split over `CACHE_SHARDS` SQLite files, so the
+worker processes of `mcp-uniprot run --workers N` share it with little
+write contention. A read that times out on a locked shard counts as a miss.
+
+Disk entries outlive their freshness: they are fresh for `CACHE_TTL` (the
+soft TTL) but kept until `CACHE_HARD_TTL`, so stale content can be served
+while it is revalidated or while UniProt is failing.
+
+Empty results and deterministic client errors are not written to L2; they
+go to a separate short-lived in-memory negative cache instead, so agents
+retrying a bad query in a loop don't hit UniProt every time. Async
+code reaches L2 through `aget_cache_response` and
+`cache_response_in_background`, which run the blocking SQLite calls on a
+small dedicated thread pool.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Tuple
+
+from pydantic import BaseModel
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.utils.metrics import CACHE_LOOKUPS
+
+if TYPE_CHECKING:
+    from diskcache import Cache, FanoutCache
+
+logger = logging.getLogger(__name__)
+_cache: "FanoutCache | None" = None
+_cache_executor: ThreadPoolExecutor | None = None
+_memory_cache: "MemoryCache | None" = None
+_negative_cache: "MemoryCache | None" = None
+
+# Response headers stored alongside cached content
+CACHED_HEADERS = ("link", "x-total-results")
+
+# Added to the headers of responses served from stale cache entries
+STALE_WARNING = '110 - "Response is Stale"'
+
+# Client errors that repeat for the same request, kept in the negative cache
+NEGATIVE_CACHE_STATUS_CODES = frozenset({400, 404, 410})
+
+
+class TierStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+
+
+def tier_stats(tier: str) -> TierStats:
+    """Hits and misses of a cache tier, as counted in `CACHE_LOOKUPS`; stale hits count as hits."""
+    hits = CACHE_LOOKUPS.value(tier, "hit") + CACHE_LOOKUPS.value(tier, "stale")
+    return TierStats(hits=int(hits), misses=int(CACHE_LOOKUPS.value(tier, "miss")))
+
+
+# --------------------------------
+# L1: IN-MEMORY CACHE
+# --------------------------------
+class MemoryCache:
+    """An LRU cache of parsed objects bounded by entry count and size.
+
+    Entries expire at an absolute timestamp, matching the expiry of the disk
+    entry they were loaded from. `size` is the length of the raw response the
+    object was parsed from, used as a proxy for its memory footprint.
+    `name` labels its lookups in the metrics, which its `stats` are read from.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, name: str = "memory"):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries: OrderedDict[Hashable, Tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    @property
+    def stats(self) -> TierStats:
+        return tier_stats(self.name)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None if missing or expired."""
+        item = self._entries.get(key)
+        if item is None:
+            CACHE_LOOKUPS.inc(self.name, "miss")
+            return None
+
+        value, expires_at, _ = item
+        if expires_at <= time.time():
+            self._discard(key)
+            CACHE_LOOKUPS.inc(self.name, "miss")
+            return None
+
+        self._entries.move_to_end(key)
+        CACHE_LOOKUPS.inc(self.name, "hit")
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float, size: int) -> None:
+        """Store a value, evicting least recently used entries to stay within bounds."""
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        self._discard(key)
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _discard(self, key: Hashable) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= item[2]
+
+
+def get_memory_cache() -> MemoryCache:
+    """Initialize and return the in-memory cache."""
+    global _memory_cache
+    if _memory_cache is None:
+        _memory_cache = MemoryCache(
+            max_entries=settings.MEMORY_CACHE_MAX_ENTRIES,
+            max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+        )
+    return _memory_cache
+
+
+def get_negative_cache() -> MemoryCache:
+    """Initialize and return the negative cache.
+
+    It maps cache keys to the `(status, content, headers)` of responses that
+    carried no data, and expires them after `NEGATIVE_CACHE_TTL`.
+    """
+    global _negative_cache
+    if _negative_cache is None:
+        _negative_cache = MemoryCache(
+            max_entries=settings.NEGATIVE_CACHE_MAX_ENTRIES,
+            max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+            name="negative",
+        )
+    return _negative_cache
+
+
+def cache_negative_response(cache_key: str, status: int, content: str, headers: Dict[str, str]) -> None:
+    """Remember a response without data (empty result or client error)."""
+    if settings.NEGATIVE_CACHE_TTL > 0:
+        get_negative_cache().set(
+            cache_key,
+            (status, content, headers),
+            expires_at=time.time() + settings.NEGATIVE_CACHE_TTL,
+            size=len(content),
+        )
+
+
+# --------------------------------
+# L2: DISK CACHE
+# --------------------------------
+def get_cache_dir() -> str:
+    """Return the directory holding the disk cache and related state."""
+    from platformdirs import user_cache_dir
+
+    return settings.CACHE_DIR or user_cache_dir("alphafold-mcp")
+
+
+def get_cache() -> "FanoutCache":
+    """Initialize and return the cache."""
+    global _cache
+    if _cache is None:
+        from diskcache import FanoutCache
+
+        from uniprot_mcp.utils.compressed_disk import CompressedDisk
+
+        cache_path = os.path.join(get_cache_dir(), "cache")
+        _cache = FanoutCache(
+            cache_path,
+            shards=max(1, settings.CACHE_SHARDS),
+            disk=CompressedDisk,
+            disk_codec=settings.CACHE_COMPRESSION,
+            disk_level=settings.CACHE_COMPRESSION_LEVEL,
+            size_limit=settings.CACHE_SIZE_LIMIT,
+            eviction_policy=settings.CACHE_EVICTION_POLICY,
+        )
+    return _cache
+
+
+def get_fields_index() -> "Cache":
+    """Return the cache recording which field selections are cached per request.
+
+    It is kept apart from the sharded responses so that updating it locks
+    only itself rather than every shard.
+    """
+    return get_cache().cache("fields")
+
+
+def generate_cache_key(
+    method: str,
+    url: str,
+    params: Dict[str, Any] | None = None,
+) -> str:
+    """Generate a cache key for a given HTTP request."""
+    sha256_hash = hashlib.sha256()
+    params_dump: str = json.dumps(params, sort_keys=True)
+    key_source: str = f"{method.upper()}:{url}:{params_dump}"
+    data: bytes = key_source.encode("utf-8")
+    sha256_hash.update(data)
+    return sha256_hash.hexdigest()
+
+
+def get_cache_response(cache_key: str) -> Tuple[str | None, Dict[str, str], float | None]:
+    """Retrieve the cache response, its headers and the time it stays fresh until.
+
+    Stale entries are returned too; compare the timestamp with `time.time()`
+    to tell them apart.
+    """
+    content, headers, fresh_until = _read_entry(cache_key)
+    if content:
+        fresh = fresh_until is None or fresh_until > time.time()
+        CACHE_LOOKUPS.inc("disk", "hit" if fresh else "stale")
+    else:
+        CACHE_LOOKUPS.inc("disk", "miss")
+    return content, headers, fresh_until
+
+
+def _read_entry(cache_key: str) -> Tuple[str | None, Dict[str, str], float | None]:
+    result = get_cache().get(cache_key, expire_time=True)
+    if result is None:
+        # The shard was locked by another writer for longer than its timeout
+        return None, {}, None
+    value, expire_time = result
+    if isinstance(value, tuple) and len(value) == 3:
+        return value
+    if isinstance(value, tuple):
+        # Entries written before stale serving are fresh until they expire
+        content, headers = value
+        return content, headers, expire_time
+    # Entries written before headers were cached hold the bare content
+    return value, {}, expire_time
+
+
+def cache_response(
+    cache_key: str,
+    content: str,
+    cache_ttl: int,
+    headers: Dict[str, str] | None = None,
+) -> None:
+    """Store the response content (and selected headers) in cache.
+
+    The entry is fresh for `cache_ttl` seconds and kept on disk until the
+    hard TTL, or the end of the stale-while-revalidate window if later.
+    """
+    expire = max(settings.CACHE_HARD_TTL, cache_ttl + settings.CACHE_STALE_WHILE_REVALIDATE)
+    get_cache().set(cache_key, (content, headers or {}, time.time() + cache_ttl), expire=expire, retry=True)
+
+
+# --------------------------------
+# FIELD SUPERSETS
+# --------------------------------
+# Keep the field selections of the most recent responses per request
+FIELDS_INDEX_MAX_ENTRIES = 16
+
+
+def index_cached_fields(base_key: str, fields: str) -> None:
+    """Record that a response selecting `fields` is cached for a request.
+
+    `base_key` is the cache key of the request without its `fields`, and
+    `fields` is a canonical (sorted) comma-separated selection.
+    """
+    cache = get_fields_index()
+    index_key = f"fields:{base_key}"
+    with cache.transact():
+        known = cache.get(index_key, default=())
+        if fields not in known:
+            cache.set(index_key, (*known, fields)[-FIELDS_INDEX_MAX_ENTRIES:], expire=settings.CACHE_HARD_TTL)
+
+
+def get_superset_response(
+    base_key: str,
+    fields: str,
+    key_for: Callable[[str | None], str],
+) -> Tuple[str | None, Dict[str, str], float | None]:
+    """Find a fresh cached response whose fields include all of `fields`.
+
+    Candidates are the selections recorded by `index_cached_fields` that
+    contain every requested field, smallest first, then the response to the
+    request without any field selection (which returns full entries).
+    `key_for` maps a candidate selection to its cache key.
+    """
+    wanted = set(fields.split(","))
+    known_fields = get_fields_index().get(f"fields:{base_key}", default=())
+    candidates = [known for known in known_fields if wanted < set(known.split(","))]
+    now = time.time()
+    for candidate in [*sorted(candidates, key=len), None]:
+        content, headers, fresh_until = _read_entry(key_for(candidate))
+        if content and (fresh_until is None or fresh_until > now):
+            CACHE_LOOKUPS.inc("superset", "hit")
+            return content, headers, fresh_until
+    CACHE_LOOKUPS.inc("superset", "miss")
+    return None, {}, None
+
+
+# --------------------------------
+# ASYNC DISK ACCESS
+# --------------------------------
+def get_cache_executor() -> ThreadPoolExecutor:
+    """Return the thread pool that runs blocking disk cache operations."""
+    global _cache_executor
+    if _cache_executor is None:
+        _cache_executor = ThreadPoolExecutor(
+            max_workers=settings.CACHE_IO_WORKERS,
+            thread_name_prefix="uniprot-cache",
+        )
+    return _cache_executor
+
+
+async def aget_cache_response(cache_key: str) -> Tuple[str | None, Dict[str, str], float | None]:
+    """Retrieve the cache response without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cache_executor(), get_cache_response, cache_key)
+
+
+async def aget_superset_response(
+    base_key: str,
+    fields: str,
+    key_for: Callable[[str | None], str],
+) -> Tuple[str | None, Dict[str, str], float | None]:
+    """Find a cached superset response without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cache_executor(), get_superset_response, base_key, fields, key_for)
+
+
+def cache_response_in_background(
+    cache_key: str,
+    content: str,
+    cache_ttl: int,
+    headers: Dict[str, str] | None = None,
+) -> Future:
+    """Store the response content in cache from the background thread pool.
+
+    The write is not awaited so the caller never waits on SQLite or fsync;
+    failures are logged. The returned future can be waited on if needed.
+    """
+    future = get_cache_executor().submit(cache_response, cache_key, content, cache_ttl, headers)
+    future.add_done_callback(_log_write_error)
+    return future
+
+
+def index_cached_fields_in_background(base_key: str, fields: str) -> Future:
+    """Run `index_cached_fields` on the background thread pool, logging failures."""
+    future = get_cache_executor().submit(index_cached_fields, base_key, fields)
+    future.add_done_callback(_log_write_error)
+    return future
+
+
+def _log_write_error(future: Future) -> None:
+    if (error := future.exception()) is not None:
+        logger.error(f"Failed to write cache entry: {error}")
+
+
+# --------------------------------
+# STATS
+# --------------------------------
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return hit/miss counters and occupancy for each cache tier.
+
+    Disk occupancy is read from SQLite, so call this off the event loop when
+    latency matters. The compression counters cover values written by this
+    process.
+    """
+    memory_cache = get_memory_cache()
+    negative_cache = get_negative_cache()
+    disk_cache = get_cache()
+    # FanoutCache only exposes its shards privately; each has its own Disk and counters
+    disks = [shard.disk for shard in disk_cache._shards]
+    raw_bytes = sum(disk.raw_bytes for disk in disks)
+    stored_bytes = sum(disk.stored_bytes for disk in disks)
+    return {
+        "memory": {
+            **memory_cache.stats.model_dump(),
+            "entries": len(memory_cache),
+            "bytes": memory_cache.nbytes,
+        },
+        "negative": {
+            **negative_cache.stats.model_dump(),
+            "entries": len(negative_cache),
+        },
+        "superset": tier_stats("superset").model_dump(),
+        "disk": {
+            **tier_stats("disk").model_dump(),
+            "entries": len(disk_cache),
+            "bytes": disk_cache.volume(),
+            "shards": len(disks),
+            "size_limit": settings.CACHE_SIZE_LIMIT,
+            "eviction_policy": disk_cache.eviction_policy,
+            "codec": disks[0].codec,
+            "raw_bytes_written": raw_bytes,
+            "stored_bytes_written": stored_bytes,
+            "compression_ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else 1.0,
+        },
+    }
@@ -0,0 +1,97 @@
+"""Canonical forms of UniProt request parameters, so equivalent requests share a cache key.
+
+Requests are rewritten before they are keyed and sent: empty parameters and
+UniProt defaults are dropped, `fields` are deduplicated (and sorted, when the
+response format does not depend on their order) and whitespace and redundant
+parentheses in `query` are removed.
+"""
+
+import re
+from typing import Any, Dict, List
+
+# Parameters whose value is UniProt's default, which is the same as omitting them
+DEFAULT_PARAMS = {
+    "includeIsoform": "false",
+    "format": "json",
+}
+
+# Formats whose columns follow the order of `fields`
+ORDERED_FIELD_FORMATS = frozenset({"tsv", "xlsx"})
+
+# A UniProtKB accession with an optional isoform suffix, see https://www.uniprot.org/help/accession_numbers
+ACCESSION = re.compile(r"([OPQ][0-9][A-Z0-9]{3}[0-9]|[A-NR-Z][0-9](?:[A-Z][A-Z0-9]{2}[0-9]){1,2})(-\d+)?", re.I)
+_query_token = re.compile(r'"(?:[^"\\]|\\.)*"?|\s+|[()]|[^\s()"]+')
+
+
+def canonicalize_params(params: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    """Return an equivalent, canonical version of a UniProt request's parameters."""
+    if params is None:
+        return None
+
+    canonical: Dict[str, Any] = {}
+    for name, value in params.items():
+        if value is None or value == "" or str(value).lower() == DEFAULT_PARAMS.get(name):
+            continue
+        canonical[name] = value
+
+    if "fields" in canonical:
+        keep_order = str(canonical.get("format", "json")).lower() in ORDERED_FIELD_FORMATS
+        canonical["fields"] = canonicalize_fields(canonical["fields"], keep_order)
+    if isinstance(canonical.get("query"), str):
+        canonical["query"] = normalize_query(canonical["query"])
+    return canonical
+
+
+def canonicalize_fields(fields: List[str] | str, keep_order: bool = False) -> str:
+    """Deduplicate a comma-separated (or list) field selection, sorting it unless `keep_order`."""
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    unique = list(dict.fromkeys(field.strip() for field in fields if field.strip()))
+    return ",".join(unique if keep_order else sorted(unique))
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and drop parentheses that do not change a query's meaning.
+
+    Parentheses are removed around a single term (`(gene:INS)`), around the
+    whole query, and when doubled (`((a OR b))`). Parentheses attached to a
+    field (`gene:(INS OR GCG)`) and quoted phrases are left untouched.
+    """
+    tokens: List[str] = []
+    for token in _query_token.findall(query):
+        if token.isspace():
+            token = " "
+            if not tokens or tokens[-1] in (" ", "("):
+                continue
+        elif token == ")" and tokens and tokens[-1] == " ":
+            tokens.pop()
+        tokens.append(token)
+    if tokens and tokens[-1] == " ":
+        tokens.pop()
+
+    while (pair := _redundant_parentheses(tokens)) is not None:
+        start, end = pair
+        del tokens[end], tokens[start]
+    return "".join(tokens)
+
+
+def _redundant_parentheses(tokens: List[str]) -> tuple[int, int] | None:
+    """Find a pair of parentheses that can be dropped, as token positions."""
+    stack: List[int] = []
+    for position, token in enumerate(tokens):
+        if token == "(":
+            stack.append(position)
+        elif token == ")" and stack:
+            start = stack.pop()
+            glued_before = start > 0 and tokens[start - 1] not in (" ", "(")
+            glued_after = position + 1 < len(tokens) and tokens[position + 1] not in (" ", ")")
+            if glued_before or glued_after:
+                continue
+            inner = tokens[start + 1 : position]
+            if " " not in inner and "(" not in inner:
+                return start, position
+            if start == 0 and position == len(tokens) - 1:
+                return start, position
+            if start > 0 and tokens[start - 1] == "(" and position + 1 < len(tokens) and tokens[position + 1] == ")":
+                return start, position
+    return None
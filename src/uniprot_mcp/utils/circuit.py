@@ -0,0 +1,103 @@
+"""Circuit breakers that fail fast while an upstream host is unhealthy."""
+
+import time
+from collections import deque
+from typing import Deque, Dict, Literal
+
+from uniprot_mcp.settings import settings
+
+# Seconds, the shortest wait suggested to callers rejected by a breaker
+MIN_RETRY_IN = 1.0
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitBreaker:
+    """Track recent request outcomes for a host and stop calling it when failing.
+
+    The circuit opens once at least `min_requests` of the last `window`
+    attempts were made and the share of failures reaches `failure_threshold`.
+    While open, requests are rejected without touching the network. After
+    `reset_timeout` seconds a single probe is let through (half-open): success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: float, window: int, min_requests: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.state: Literal["closed", "open", "half-open"] = "closed"
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state == "closed":
+            return True
+
+        now = time.monotonic()
+        if self.state == "open":
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            self.state = "half-open"
+            self._probe_started_at = None
+
+        # Half-open: one probe at a time; a probe that never reported back
+        # (e.g. its task was cancelled) is replaced after reset_timeout.
+        if self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout:
+            self._probe_started_at = now
+            return True
+        return False
+
+    def record(self, success: bool) -> None:
+        """Record the outcome of a request sent after `allow()`."""
+        if self.state == "half-open":
+            if success:
+                self.state = "closed"
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.failure_threshold:
+            self._open()
+
+    def retry_in(self) -> float:
+        """Seconds a caller rejected by `allow()` should wait before trying again.
+
+        While open, until a probe is let through; while half-open with a probe
+        in flight, until that probe would be replaced. Never less than
+        `MIN_RETRY_IN`, so that rejected callers do not retry at once.
+        """
+        now = time.monotonic()
+        if self.state == "open":
+            remaining = self.reset_timeout - (now - self._opened_at)
+        elif self.state == "half-open" and self._probe_started_at is not None:
+            remaining = self.reset_timeout - (now - self._probe_started_at)
+        else:
+            return 0.0
+        return max(MIN_RETRY_IN, remaining)
+
+    def _open(self) -> None:
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self._probe_started_at = None
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker | None:
+    """Return the circuit breaker for a host, or None when disabled."""
+    if not settings.CIRCUIT_BREAKER_ENABLED:
+        return None
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            window=settings.CIRCUIT_WINDOW,
+            min_requests=settings.CIRCUIT_MIN_REQUESTS,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+        )
+        _breakers[host] = breaker
+    return breaker
@@ -0,0 +1,134 @@
+"""Column-oriented tables parsed from UniProt's TSV responses.
+
+For tabular field selections (`accession,gene_names,length,organism_id`)
+the TSV format is much smaller than JSON and needs no model validation.
+`ColumnarTable` keeps each column in one container instead of building a
+dict per row: numeric columns are `array.array`s of machine integers or
+doubles, other columns are tuples of strings.
+"""
+
+import json
+import math
+import re
+from array import array
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+# "11,981": UniProt formats masses with thousands separators
+_grouped_int = re.compile(r"^-?\d{1,3}(,\d{3})+$")
+# Identifiers such as "0042" must keep their leading zeros
+_leading_zero = re.compile(r"^-?0\d")
+
+Column = array | Tuple[str | None, ...]
+
+
+def _numeric_column(values: Sequence[str]) -> Tuple[array, Tuple[int, ...]] | None:
+    """Convert a column of strings to an array, or return None if a value is not a number.
+
+    Empty cells are stored as 0 and their row numbers returned as missing.
+    """
+    if not values:
+        return None
+    missing: Tuple[int, ...] = ()
+    present = values
+    if "" in values:
+        missing = tuple(row for row, value in enumerate(values) if not value)
+        present = [value for value in values if value]
+        if not present:
+            return None
+    if any(_leading_zero.match(value) for value in present):
+        return None
+    # Values below 1,000 have no separator, so any grouped value makes the column grouped
+    if any(_grouped_int.match(value) for value in present):
+        present = [value.replace(",", "") if _grouped_int.match(value) else value for value in present]
+
+    numbers = _to_array(present)
+    if numbers is None:
+        return None
+    if missing:
+        filled = array(numbers.typecode, bytes(numbers.itemsize * len(values)))
+        rows = iter(numbers)
+        for row, value in enumerate(values):
+            if value:
+                filled[row] = next(rows)
+        numbers = filled
+    return numbers, missing
+
+
+def _to_array(values: Sequence[str]) -> array | None:
+    """Return the values as an array of integers if they all are, else of finite doubles, else None."""
+    try:
+        return array("q", map(int, values))
+    except (ValueError, OverflowError):
+        pass
+    try:
+        numbers = array("d", map(float, values))
+    except ValueError:
+        return None
+    # "nan" and "inf" parse as floats but have no JSON representation
+    return numbers if all(map(math.isfinite, numbers)) else None
+
+
+class ColumnarTable:
+    """A TSV result set stored column by column.
+
+    Args:
+        names: Column headers, in order.
+        columns: One container per column, all of the same length.
+        missing: Row numbers of empty cells in numeric columns, by column name.
+    """
+
+    def __init__(self, names: List[str], columns: List[Column], missing: Dict[str, Tuple[int, ...]] | None = None):
+        self.names = names
+        self.columns = columns
+        self.missing = missing or {}
+
+    @classmethod
+    def from_tsv(cls, content: str) -> "ColumnarTable":
+        """Parse a TSV body with a header row.
+
+        UniProt does not quote or escape TSV cells, so lines are split on
+        tabs directly rather than through `csv`.
+        """
+        lines = content.split("\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        names = lines[0].rstrip("\r").split("\t") if lines else []
+        # Transposing with zip keeps the cells as `split` created them
+        cells = list(zip(*(line.rstrip("\r").split("\t") for line in lines[1:]), strict=True)) or [() for _ in names]
+
+        columns: List[Column] = []
+        missing: Dict[str, Tuple[int, ...]] = {}
+        for name, values in zip(names, cells, strict=True):
+            numeric = _numeric_column(values)
+            if numeric is None:
+                columns.append(tuple(value or None for value in values))
+                continue
+            columns.append(numeric[0])
+            if numeric[1]:
+                missing[name] = numeric[1]
+        return cls(names, columns, missing)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, name: str) -> List[Any]:
+        """Return a column's values, with None for empty cells."""
+        values = self.columns[self.names.index(name)]
+        if not isinstance(values, array):
+            return list(values)
+        numbers = values.tolist()
+        for row in self.missing.get(name, ()):
+            numbers[row] = None
+        return numbers
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Iterate over the rows as tuples, in column order."""
+        return zip(*(self.column(name) for name in self.names), strict=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return `{"columns": [...], "rows": n, "data": [[column values], ...]}`."""
+        return {"columns": self.names, "rows": len(self), "data": [self.column(name) for name in self.names]}
+
+    def to_json(self) -> str:
+        """Serialize compactly, one JSON array per column."""
+        return json.dumps(self.to_dict(), separators=(",", ":"))
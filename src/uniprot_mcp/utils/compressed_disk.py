@@ -0,0 +1,75 @@
+"""A diskcache `Disk` that compresses values before they are written."""
+
+import bz2
+import lzma
+import pickle
+import zlib
+from typing import Any, Callable, Dict, Tuple
+
+from diskcache import UNKNOWN, Disk
+from diskcache.core import MODE_BINARY, MODE_RAW
+
+# Codec name -> (marker byte, compress(data, level), decompress(data))
+CODECS: Dict[str, Tuple[bytes, Callable[[bytes, int], bytes], Callable[[bytes], bytes]]] = {
+    "none": (b"\x00", lambda data, level: data, lambda data: data),
+    "zlib": (b"\x01", lambda data, level: zlib.compress(data, level), zlib.decompress),
+    "bz2": (b"\x02", lambda data, level: bz2.compress(data, max(1, level)), bz2.decompress),
+    "lzma": (b"\x03", lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+_DECOMPRESSORS = {marker: decompress for marker, _, decompress in CODECS.values()}
+
+# Below this size compression saves too little to be worth the CPU
+MIN_COMPRESS_SIZE = 512
+
+
+class CompressedDisk(Disk):
+    """Pickle and compress cache values, transparently to `Cache` callers.
+
+    Each stored value is prefixed with a marker byte naming its codec, so
+    entries stay readable after the configured codec changes. Values written
+    by the plain `Disk` (before compression was enabled) are returned as-is.
+
+    Args:
+        directory: Cache directory, passed by `Cache`.
+        codec: One of the names in `CODECS`.
+        level: Compression level for the codec.
+    """
+
+    def __init__(self, directory: str, codec: str = "zlib", level: int = 6, **kwargs: Any):
+        super().__init__(directory, **kwargs)
+        if codec not in CODECS:
+            raise ValueError(f"Unknown cache compression codec: {codec}")
+        self.codec = codec
+        self.level = level
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def store(self, value: Any, read: bool, key: Any = UNKNOWN) -> Tuple[int, int, str | None, Any]:
+        if read:
+            return super().store(value, read, key)
+
+        data = pickle.dumps(value, protocol=self.pickle_protocol)
+        marker, compress, _ = CODECS[self.codec]
+        if len(data) >= MIN_COMPRESS_SIZE and self.codec != "none":
+            compressed = compress(data, self.level)
+            if len(compressed) < len(data):
+                encoded = marker + compressed
+            else:
+                encoded = CODECS["none"][0] + data
+        else:
+            encoded = CODECS["none"][0] + data
+
+        self.raw_bytes += len(data)
+        self.stored_bytes += len(encoded)
+        return super().store(encoded, read, key)
+
+    def fetch(self, mode: int, filename: str | None, value: Any, read: bool) -> Any:
+        data = super().fetch(mode, filename, value, read)
+        if read or mode not in (MODE_RAW, MODE_BINARY) or not isinstance(data, bytes):
+            return data
+        return pickle.loads(_DECOMPRESSORS[data[:1]](data[1:]))
+
+    @property
+    def compression_ratio(self) -> float:
+        """Uncompressed over stored size of the values written by this process."""
+        return self.raw_bytes / self.stored_bytes if self.stored_bytes else 1.0
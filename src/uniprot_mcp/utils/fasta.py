@@ -0,0 +1,167 @@
+"""Random access to records of a large FASTA file through a faidx-style index.
+
+The index is the `.fai` file `samtools faidx` writes next to the FASTA file
+(name, sequence length, byte offset, residues per line, bytes per line),
+built on first use if it is missing or older than the FASTA file. Records
+are read from a read-only `mmap` of the file, so a lookup is a dictionary
+probe and one slice of the page cache; nothing is read up front.
+
+The FASTA file must be uncompressed, with lines of equal length within each
+record (as UniProt's downloads are). Records are looked up by accession:
+`>sp|P01308|INS_HUMAN ...` is found under `P01308`.
+"""
+
+import asyncio
+import mmap
+import os
+from array import array
+from typing import Dict, List
+
+from uniprot_mcp.settings import settings
+
+
+def fasta_accession(header: str) -> str:
+    """Return the accession of a FASTA header line (or of its first word)."""
+    words = header.lstrip(">").split(None, 1)
+    parts = (words[0] if words else "").split("|")
+    return parts[1] if len(parts) >= 3 else parts[0]
+
+
+def split_fasta(text: str) -> Dict[str, str]:
+    """Split FASTA text into records (header and sequence lines) keyed by accession."""
+    records: Dict[str, str] = {}
+    for chunk in text.split("\n>"):
+        chunk = chunk.strip("\n")
+        if not chunk:
+            continue
+        record = chunk if chunk.startswith(">") else f">{chunk}"
+        records[fasta_accession(record.split("\n", 1)[0])] = f"{record}\n"
+    return records
+
+
+def build_fai(path: str, fai_path: str) -> None:
+    """Write a faidx index of a FASTA file.
+
+    Raises:
+        ValueError: If a record's lines are not all the same length (except its last).
+    """
+    rows: List[str] = []
+    name: str | None = None
+    length = seq_offset = line_bases = line_bytes = 0
+    short_line = False
+
+    def finish() -> None:
+        if name is not None:
+            rows.append(f"{name}\t{length}\t{seq_offset}\t{line_bases}\t{line_bytes}\n")
+
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(b">"):
+                finish()
+                name = line[1:].split(None, 1)[0].decode() if line[1:].strip() else ""
+                length, seq_offset, line_bases, line_bytes, short_line = 0, offset + len(line), 0, 0, False
+            elif name is not None:
+                bases = len(line.rstrip(b"\r\n"))
+                if not line_bytes:
+                    line_bases, line_bytes = bases, len(line)
+                elif bases and (short_line or bases > line_bases):
+                    raise ValueError(f"Lines of different lengths in record {name} of {path}")
+                short_line = short_line or bases < line_bases
+                length += bases
+            offset += len(line)
+    finish()
+
+    tmp_path = f"{fai_path}.tmp"
+    with open(tmp_path, "w") as out:
+        out.writelines(rows)
+    os.replace(tmp_path, fai_path)
+
+
+class FastaIndex:
+    """Memory-mapped, indexed FASTA file.
+
+    Args:
+        path: Uncompressed FASTA file.
+        fai_path: Its faidx index; defaults to `<path>.fai`, built if missing or stale.
+    """
+
+    def __init__(self, path: str, fai_path: str | None = None):
+        self.path = path
+        self.fai_path = fai_path or f"{path}.fai"
+        if not os.path.exists(self.fai_path) or os.path.getmtime(self.fai_path) < os.path.getmtime(path):
+            build_fai(path, self.fai_path)
+
+        self._rows: Dict[str, int] = {}
+        self._lengths = array("q")
+        self._offsets = array("q")
+        self._line_bases = array("q")
+        self._line_bytes = array("q")
+        with open(self.fai_path) as f:
+            for row, line in enumerate(f):
+                name, length, offset, line_bases, line_bytes = line.rstrip("\n").split("\t")[:5]
+                self._rows[fasta_accession(name)] = row
+                self._lengths.append(int(length))
+                self._offsets.append(int(offset))
+                self._line_bases.append(int(line_bases))
+                self._line_bytes.append(int(line_bytes))
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, accession: str) -> bool:
+        return accession in self._rows
+
+    def length(self, accession: str) -> int | None:
+        """Return the sequence length of a record, or None if it is not in the file."""
+        row = self._rows.get(accession)
+        return None if row is None else self._lengths[row]
+
+    def record(self, accession: str) -> memoryview | None:
+        """Return a record's bytes (header and sequence lines) as a view of the mapped file."""
+        row = self._rows.get(accession)
+        if row is None or self._mmap is None:
+            return None
+        offset, length = self._offsets[row], self._lengths[row]
+        line_bases, line_bytes = self._line_bases[row], self._line_bytes[row]
+        end = offset
+        if line_bases:
+            full_lines, rest = divmod(length, line_bases)
+            end += full_lines * line_bytes + (rest + line_bytes - line_bases if rest else 0)
+        start = self._mmap.rfind(b"\n>", 0, offset) + 1
+        return memoryview(self._mmap)[start:end]
+
+    def get(self, accession: str) -> str | None:
+        """Return a record as FASTA text ending with a newline, or None if it is not in the file."""
+        view = self.record(accession)
+        if view is None:
+            return None
+        text = str(view, "ascii")
+        return text if text.endswith("\n") else f"{text}\n"
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+
+
+_fasta_index: FastaIndex | None = None
+
+
+def get_fasta_index() -> FastaIndex | None:
+    """Return the index of `FASTA_PATH`, or None if no local FASTA file is configured."""
+    global _fasta_index
+    if _fasta_index is None and settings.FASTA_PATH:
+        _fasta_index = FastaIndex(settings.FASTA_PATH)
+    return _fasta_index
+
+
+async def aget_fasta_index() -> FastaIndex | None:
+    """Return the index of `FASTA_PATH`, loading (or building) it off the event loop the first time."""
+    if _fasta_index is not None or not settings.FASTA_PATH:
+        return _fasta_index
+    from uniprot_mcp.utils.cache import get_cache_executor
+
+    return await asyncio.get_running_loop().run_in_executor(get_cache_executor(), get_fasta_index)
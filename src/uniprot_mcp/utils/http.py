@@ -1,23 +1,73 @@
 import asyncio
 import csv
-import hashlib
 import json
 import logging
-import os
+import math
 import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+from functools import partial
 from io import StringIO
-from typing import Any, Dict, Literal, Tuple, Type, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Literal,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+from urllib.parse import urlsplit
 
-import httpx
-from diskcache import Cache
-from platformdirs import user_cache_dir
 from pydantic import BaseModel
 
 from uniprot_mcp.settings import settings
+from uniprot_mcp.utils.cache import (
+    CACHED_HEADERS,
+    NEGATIVE_CACHE_STATUS_CODES,
+    STALE_WARNING,
+    aget_cache_response,
+    aget_superset_response,
+    cache_negative_response,
+    cache_response_in_background,
+    generate_cache_key,
+    get_memory_cache,
+    get_negative_cache,
+    index_cached_fields_in_background,
+)
+from uniprot_mcp.utils.canonical import canonicalize_params
+from uniprot_mcp.utils.circuit import get_circuit_breaker
+from uniprot_mcp.utils.columnar import ColumnarTable
+from uniprot_mcp.utils.metrics import (
+    STAGE_SECONDS,
+    UPSTREAM_BYTES,
+    UPSTREAM_REJECTED,
+    UPSTREAM_RESPONSES,
+    UPSTREAM_RETRIES,
+    stage,
+)
+from uniprot_mcp.utils.ratelimit import get_rate_limiter
+
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger(__name__)
-_cache: Cache | None = None
-T = TypeVar("T", bound=BaseModel)
+_client: "httpx.AsyncClient | None" = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_inflight: Dict[str, asyncio.Task] = {}
+_background_refreshes: set[asyncio.Task] = set()
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_next_link_pattern = re.compile(r'<([^>]+)>\s*;\s*rel="?next"?')
+_empty_results_pattern = re.compile(r'\s*\{\s*"results"\s*:\s*\[\s*\]')
+# A model, or `str` for the raw body or `ColumnarTable` for a TSV body
+T = TypeVar("T", bound=Union[BaseModel, str, ColumnarTable])
+R = TypeVar("R")
 
 
 class RequestError(BaseModel):
@@ -26,42 +76,42 @@ class RequestError(BaseModel):
 
 
 # --------------------------------
-# CACHING
+# HTTP CLIENT
 # --------------------------------
-def get_cache() -> Cache:
-    """Initialize and return the cache."""
-    global _cache
-    if _cache is None:
-        cache_path = os.path.join(
-            settings.CACHE_DIR or user_cache_dir("alphafold-mcp"),
-            "cache",
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the shared HTTP client, creating it on first use.
+
+    The client keeps connections alive between calls, so repeated requests to
+    rest.uniprot.org reuse pooled TCP/TLS connections (multiplexed over HTTP/2
+    when enabled). A client is bound to the event loop it was created on; if
+    the running loop changes, a fresh client is created for the new loop.
+    """
+    global _client, _client_loop
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            verify=False,
+            http2=settings.HTTP2,
+            timeout=settings.REQUEST_TIMEOUT,
+            trust_env=False,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
         )
-        _cache = Cache(cache_path)
-    return _cache
+        _client_loop = loop
+    return _client
 
 
-def generate_cache_key(
-    method: str,
-    url: str,
-    params: Dict[str, Any] | None = None,
-) -> str:
-    """Generate a cache key for a given HTTP request."""
-    sha256_hash = hashlib.sha256()
-    params_dump: str = json.dumps(params, sort_keys=True)
-    key_source: str = f"{method.upper()}:{url}:{params_dump}"
-    data: bytes = key_source.encode("utf-8")
-    sha256_hash.update(data)
-    return sha256_hash.hexdigest()
-
-
-def get_cache_response(cache_key: str) -> str | None:
-    """Retrieve the cache response if avialable."""
-    return get_cache().get(cache_key)
-
-
-def cache_response(cache_key: str, content: str, cache_ttl: int) -> None:
-    """Store the response content in cache."""
-    get_cache().set(cache_key, content, expire=cache_ttl)
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _client, _client_loop
+    if _client is not None:
+        client, _client, _client_loop = _client, None, None
+        await client.aclose()
 
 
 # --------------------------------
@@ -72,45 +122,181 @@ async def call_http(
     url: str,
     params: Dict[str, Any] | None = None,
     timeout: int | None = None,
-    retries: int = 3,
-    backoff_factor: float = 0.5,
-    rate_limit_delay: float | None = None,
-) -> Tuple[int, str]:
-    """Perform an HTTP request(GET/POST) with retries and optional rate limit."""
+    retries: int | None = None,
+    backoff_factor: float | None = None,
+) -> Tuple[int, str, Dict[str, str]]:
+    """Perform an HTTP request(GET/POST) with retries, rate limited per host.
+
+    Connection errors, timeouts and the statuses in `RETRYABLE_STATUS_CODES`
+    are retried up to `retries` times (default `MAX_RETIRES`), waiting for the
+    server's `Retry-After` when given and a jittered exponential backoff
+    otherwise. A call gives up once its waits would exceed `RETRY_BUDGET`
+    seconds. While the host's circuit breaker is open, requests fail fast
+    with a 503 instead of reaching the network.
+
+    Returns the status code, the body text and the response headers (with
+    lower-cased names).
+
+    Each attempt's round trip is recorded as the `http` stage, and the wait
+    for a rate limit token by the limiter; responses are counted by status.
+    """
     timeout = timeout or settings.REQUEST_TIMEOUT
+    retries = settings.MAX_RETIRES if retries is None else retries
+    backoff_factor = settings.RETRY_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+
+    if method.upper() not in ("GET", "POST"):
+        logger.error(f"Unsupported HTTP method: {method}")
+        return 405, f"Unsupported Method: {method}", {}
 
-    if rate_limit_delay:
-        await asyncio.sleep(rate_limit_delay)
+    import httpx
 
-    last_error: Exception | None = None
+    client = get_http_client()
+    host = urlsplit(url).hostname or ""
+    limiter = get_rate_limiter(host)
+    breaker = get_circuit_breaker(host)
+    backoff_spent = 0.0
+    status, content, headers = 599, "", {}
     for attempt in range(retries + 1):
+        if breaker is not None and not breaker.allow():
+            logger.warning(f"Circuit open for {host}, failing fast")
+            UPSTREAM_REJECTED.inc()
+            retry_in = math.ceil(breaker.retry_in())
+            return 503, f"Circuit open: {host} is failing, retry in {retry_in}s", {"retry-after": str(retry_in)}
+
+        if limiter is not None:
+            await limiter.acquire()
+
+        retry_after: float | None = None
         try:
-            async with httpx.AsyncClient(
-                verify=False,
-                http2=False,
-                timeout=timeout,
-                trust_env=False,
-            ) as client:
+            with stage("http"):
                 if method.upper() == "GET":
-                    resp = await client.get(url, params=params)
-                elif method.upper() == "POST":
-                    resp = await client.post(url, json=params or {})
+                    resp = await client.get(url, params=params, timeout=timeout)
                 else:
-                    logger.error(f"Unsupported HTTP method: {method}")
-                    return 405, f"Unsupported Method: {method}"
-
-                return resp.status_code, resp.text
+                    resp = await client.post(url, json=params or {}, timeout=timeout)
+
+            status, content = resp.status_code, resp.text
+            headers = {k.lower(): v for k, v in resp.headers.items()}
+            UPSTREAM_RESPONSES.inc(str(status))
+            UPSTREAM_BYTES.inc(amount=len(resp.content))
+            if breaker is not None:
+                breaker.record(status not in RETRYABLE_STATUS_CODES)
+            if status not in RETRYABLE_STATUS_CODES:
+                return status, content, headers
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            reason = f"HTTP {status}"
 
         except (httpx.RequestError, httpx.TimeoutException) as e:
-            last_error = e
-            if attempt < retries:  # Not the last attempt
-                backoff = backoff_factor * (2**attempt) + random.uniform(0, 0.1)
-                logger.warning(f"Request failed (attempt {attempt + 1}/{retries + 1}): {str(e)}")
-                await asyncio.sleep(backoff)
-            else:
-                logger.error(f"Request failed after {retries + 1} attempts: {str(e)}")
+            if breaker is not None:
+                breaker.record(False)
+            status, content, headers = 599, f"All retry attempts failed: {str(e)}", {}
+            reason = str(e)
+            UPSTREAM_RESPONSES.inc("599")
+
+        if attempt == retries:
+            logger.error(f"Request failed after {retries + 1} attempts: {reason}")
+            break
+
+        if retry_after is not None:
+            backoff = retry_after
+        else:
+            backoff = random.uniform(0, backoff_factor * (2**attempt))
+        if backoff_spent + backoff > settings.RETRY_BUDGET:
+            logger.error(f"Request failed (attempt {attempt + 1}/{retries + 1}): {reason}; retry budget exhausted")
+            break
+
+        backoff_spent += backoff
+        UPSTREAM_RETRIES.inc()
+        logger.warning(f"Request failed (attempt {attempt + 1}/{retries + 1}): {reason}; retrying in {backoff:.2f}s")
+        with stage("retry_wait"):
+            await asyncio.sleep(backoff)
+
+    return status, content, headers
+
 
-    return 599, f"All retry attempts failed: {str(last_error)}"
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+async def stream_http(
+    url: str,
+    params: Dict[str, Any] | None = None,
+    timeout: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Perform a GET request and yield the response body as it arrives.
+
+    The body is never buffered as a whole, so arbitrarily large downloads run
+    in constant memory.
+
+    Raises:
+        RuntimeError: If the request fails or returns a non-200 status.
+    """
+    timeout = timeout or settings.REQUEST_TIMEOUT
+    import httpx
+
+    client = get_http_client()
+    host = urlsplit(url).hostname or ""
+    breaker = get_circuit_breaker(host)
+    if breaker is not None and not breaker.allow():
+        raise RuntimeError(f"API Error 503: Circuit open: {host} is failing, retry in {math.ceil(breaker.retry_in())}s")
+    if (limiter := get_rate_limiter(host)) is not None:
+        await limiter.acquire()
+    try:
+        async with client.stream("GET", url, params=params, timeout=timeout) as resp:
+            if breaker is not None:
+                breaker.record(resp.status_code not in RETRYABLE_STATUS_CODES)
+            if resp.status_code != 200:
+                content = (await resp.aread()).decode(errors="replace")
+                raise RuntimeError(f"API Error {resp.status_code}: {content}")
+            async for chunk in resp.aiter_bytes():
+                yield chunk
+    except (httpx.RequestError, httpx.TimeoutException) as e:
+        if breaker is not None:
+            breaker.record(False)
+        raise RuntimeError(f"Streaming request failed: {str(e)}") from e
+
+
+def parse_next_link(headers: Dict[str, str]) -> str | None:
+    """Return the URL of the next page from a `Link: <...>; rel="next"` header."""
+    match = _next_link_pattern.search(headers.get("link", ""))
+    return match.group(1) if match else None
+
+
+# --------------------------------
+# REQUEST COALESCING
+# --------------------------------
+async def single_flight(key: str, fetch: Callable[[], Awaitable[R]]) -> R:
+    """Run `fetch` once for all concurrent callers sharing the same key.
+
+    The first caller starts `fetch` as a task; callers arriving while it is
+    still running await the same task instead of starting their own. Results
+    and exceptions are delivered to every waiter, and a cancelled waiter does
+    not cancel the shared task for the others.
+    """
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        task.add_done_callback(partial(_forget_inflight, key))
+    return await asyncio.shield(task)
+
+
+def _forget_inflight(key: str, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # Mark the exception as retrieved even if every waiter was cancelled
+        task.exception()
 
 
 # --------------------------------
@@ -122,10 +308,50 @@ async def request_api(
     response_model_type: Type[T] | None = None,
     method: Literal["GET", "POST"] = "GET",
     cache_ttl: int | None = None,
-    retries: int = 3,
-    rate_limit_delay: float | None = None,
+    retries: int | None = None,
 ) -> Tuple[T | None, RequestError | None]:
     """Main method for API request with cache, retry, and parsing."""
+    parsed, error, _ = await request_api_with_headers(
+        url=url,
+        request=request,
+        response_model_type=response_model_type,
+        method=method,
+        cache_ttl=cache_ttl,
+        retries=retries,
+    )
+    return parsed, error
+
+
+async def request_api_with_headers(
+    url: str,
+    request: Union[BaseModel, Dict] | None = None,
+    response_model_type: Type[T] | None = None,
+    method: Literal["GET", "POST"] = "GET",
+    cache_ttl: int | None = None,
+    retries: int | None = None,
+    superset_lookup: bool = False,
+) -> Tuple[T | None, RequestError | None, Dict[str, str]]:
+    """Same as `request_api`, also returning the response headers.
+
+    Parameters are canonicalized (see `utils.canonical`) before the request
+    is keyed and sent, so equivalent requests share cache entries.
+
+    Cached responses carry the subset of headers listed in `CACHED_HEADERS`
+    (e.g. the pagination `Link` header), so callers see them on cache hits too.
+
+    Past its soft TTL an entry is stale. Within `CACHE_STALE_WHILE_REVALIDATE`
+    it is returned immediately and refreshed in the background; after that it
+    is refreshed first, and returned only if UniProt fails. Stale responses
+    carry a `warning` header set to `STALE_WARNING`.
+
+    Empty results and the client errors in `NEGATIVE_CACHE_STATUS_CODES` are
+    kept for `NEGATIVE_CACHE_TTL` in the in-memory negative cache instead.
+
+    With `superset_lookup`, a request selecting `fields` that is not cached
+    may be answered from a cached response to the same request with more
+    fields. Only enable it when `response_model_type` ignores the fields
+    that were not asked for.
+    """
 
     cache_ttl = cache_ttl or settings.CACHE_TTL
     params: Dict[str, Any] | None = None
@@ -136,38 +362,139 @@ async def request_api(
             params = request.model_dump(exclude_none=True, by_alias=True)
         else:
             params = request
+    params = canonicalize_params(params)
 
     # No cache: always make the request
     if cache_ttl == 0:
-        status, content = await call_http(
+        status, content, headers = await call_http(
             method=method,
             url=url,
             params=params,
             retries=retries,
-            rate_limit_delay=rate_limit_delay,
         )
-        return parse_response(status, content, response_model_type)
+        return *parse_response(status, content, response_model_type), headers
 
-    # Handle caching
+    # Handle caching: parsed models in memory first, then raw content on disk
+    lookup_start = time.perf_counter()
     cache_key = generate_cache_key(method=method, url=url, params=params)
-    cached_content = get_cache_response(cache_key=cache_key)
-    if cached_content:
-        return parse_response(200, cached_content, response_model_type)
-
-    # Not cached, make HTTP request
-    status, content = await call_http(
-        method=method,
-        url=url,
-        params=params,
-        retries=retries,
-        rate_limit_delay=rate_limit_delay,
-    )
-    parsed_response = parse_response(status, content, response_model_type)
-
-    if status == 200:
-        cache_response(cache_key, content, cache_ttl)
-
-    return parsed_response
+    memory_key = (cache_key, response_model_type)
+    if response_model_type is not None:
+        remembered = get_memory_cache().get(memory_key)
+        if remembered is not None:
+            STAGE_SECONDS.observe(time.perf_counter() - lookup_start, "cache")
+            parsed, headers = remembered
+            return parsed, None, headers
+
+    negative = get_negative_cache().get(cache_key)
+    if negative is not None:
+        STAGE_SECONDS.observe(time.perf_counter() - lookup_start, "cache")
+        status, content, headers = negative
+        return *parse_response(status, content, response_model_type), headers
+
+    cached_content, headers, fresh_until = await aget_cache_response(cache_key=cache_key)
+    STAGE_SECONDS.observe(time.perf_counter() - lookup_start, "cache")
+    now = time.time()
+    if cached_content and (fresh_until is None or fresh_until > now):
+        parsed_response = parse_response(200, cached_content, response_model_type)
+        _remember(memory_key, parsed_response, headers, cached_content, fresh_until or now + cache_ttl)
+        return *parsed_response, headers
+
+    # Not cached: look for a cached response with more fields
+    fields = params.get("fields") if superset_lookup and params else None
+    if fields is not None:
+        base_params = {name: value for name, value in params.items() if name != "fields"}
+        base_key = generate_cache_key(method=method, url=url, params=base_params)
+
+        def key_for(known_fields: str | None) -> str:
+            known_params = base_params if known_fields is None else {**base_params, "fields": known_fields}
+            return generate_cache_key(method=method, url=url, params=known_params)
+
+        if not cached_content:
+            with stage("cache"):
+                superset = await aget_superset_response(base_key, fields, key_for)
+            superset_content, superset_headers, superset_fresh_until = superset
+            if superset_content:
+                parsed_response = parse_response(200, superset_content, response_model_type)
+                if parsed_response[1] is None:
+                    expires_at = superset_fresh_until or now + cache_ttl
+                    _remember(memory_key, parsed_response, superset_headers, superset_content, expires_at)
+                    return *parsed_response, superset_headers
+
+    # Not cached, make HTTP request (shared with identical in-flight requests)
+    async def fetch() -> Tuple[T | None, RequestError | None, Dict[str, str]]:
+        status, content, headers = await call_http(
+            method=method,
+            url=url,
+            params=params,
+            retries=retries,
+        )
+        parsed_response = parse_response(status, content, response_model_type)
+        if status == 200 and not is_empty_result(content):
+            headers = {name: headers[name] for name in CACHED_HEADERS if name in headers}
+            cache_response_in_background(cache_key, content, cache_ttl, headers)
+            if fields is not None:
+                index_cached_fields_in_background(base_key, fields)
+            _remember(memory_key, parsed_response, headers, content, time.time() + cache_ttl)
+        elif status == 200 or status in NEGATIVE_CACHE_STATUS_CODES:
+            headers = {name: headers[name] for name in CACHED_HEADERS if name in headers}
+            cache_negative_response(cache_key, status, content, headers)
+        return *parsed_response, headers
+
+    flight_key = f"{cache_key}:{getattr(response_model_type, '__qualname__', None)}"
+    if not cached_content:
+        return await single_flight(flight_key, fetch)
+
+    # Stale: serve it right away while revalidating, or if UniProt is failing
+    stale_parsed, stale_error = parse_response(200, cached_content, response_model_type)
+    if stale_error is not None:
+        return await single_flight(flight_key, fetch)
+    stale_headers = {**headers, "warning": STALE_WARNING}
+
+    if now < fresh_until + settings.CACHE_STALE_WHILE_REVALIDATE:
+        refresh_in_background(flight_key, fetch)
+        return stale_parsed, None, stale_headers
+
+    parsed, error, headers = await single_flight(flight_key, fetch)
+    if error is not None and is_upstream_failure(error.code):
+        logger.warning(f"Serving stale response for {url}: {error.code} {error.message}")
+        return stale_parsed, None, stale_headers
+    return parsed, error, headers
+
+
+def is_empty_result(content: str) -> bool:
+    """Whether a response body is a result set without any results."""
+    return _empty_results_pattern.match(content) is not None
+
+
+def is_upstream_failure(status_code: int) -> bool:
+    """Whether a status means UniProt failed, rather than rejected the request."""
+    return status_code in RETRYABLE_STATUS_CODES or status_code == 599
+
+
+def refresh_in_background(key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+    """Start `fetch` without waiting for it, sharing it with in-flight callers."""
+    task = asyncio.ensure_future(single_flight(key, fetch))
+    _background_refreshes.add(task)
+    task.add_done_callback(_finish_refresh)
+
+
+def _finish_refresh(task: asyncio.Task) -> None:
+    _background_refreshes.discard(task)
+    if not task.cancelled() and (error := task.exception()) is not None:
+        logger.error(f"Background cache refresh failed: {error}")
+
+
+def _remember(
+    memory_key: Tuple[str, Type[Any] | None],
+    parsed_response: Tuple[Any, RequestError | None],
+    headers: Dict[str, str],
+    content: str,
+    expires_at: float,
+) -> None:
+    """Keep a successfully parsed model in the in-memory cache."""
+    parsed, error = parsed_response
+    if memory_key[1] is not None and error is None:
+        get_memory_cache().set(memory_key, (parsed, headers), expires_at=expires_at, size=len(content))
 
 
 # --------------------------------
@@ -178,9 +505,19 @@ def parse_response(
     content: str,
     response_model_type: Type[T] | None = None,
 ) -> Tuple[T | None, RequestError | None]:
-    """Parse the HTTP response based on the content type."""
+    """Parse the HTTP response based on the content type.
+
+    Pass `str` as `response_model_type` to get the body back as-is, or
+    `ColumnarTable` to parse a TSV body column by column. Parsing is
+    recorded as the `parse` stage.
+    """
     if status_code != 200:
         return None, RequestError(code=status_code, message=content)
+    with stage("parse"):
+        return _parse_body(content, response_model_type)
+
+
+def _parse_body(content: str, response_model_type: Type[T] | None) -> Tuple[T | None, RequestError | None]:
     try:
         if response_model_type is None:
             if content.startswith("{") or content.startswith("["):
@@ -191,9 +528,12 @@ def parse_response(
             else:
                 response_dict = {"text": content}
             return response_dict, None
-        
-        parsed: T = response_model_type.model_validate_json(content)
-        return parsed, None
+        if issubclass(response_model_type, BaseModel):
+            return response_model_type.model_validate_json(content), None
+        if issubclass(response_model_type, ColumnarTable):
+            return cast(T, ColumnarTable.from_tsv(content)), None
+        # The upstream body, passed through untouched
+        return cast(T, content), None
 
     except Exception as e:
         logger.error("Error parsing HTTP response")
@@ -0,0 +1,118 @@
+"""Incremental decoding of large JSON documents, one array item at a time."""
+
+import codecs
+import json
+import re
+from typing import Any, List
+
+# A complete string, a bracket, or the opening quote of a string that is cut
+# off at the end of the buffer (the last alternative only matches then).
+_token = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]|"', re.DOTALL)
+_separator = re.compile(r"[\s,]*")
+# What may follow a complete number, true, false or null inside the array
+_scalar_end = re.compile(r"[\s,\]]")
+
+_SEEKING, _ITEMS, _DONE = range(3)
+
+
+class JSONArrayItemDecoder:
+    """Decode the items of a top-level array field from a JSON byte stream.
+
+    UniProt returns result sets as `{"results": [{...}, {...}, ...]}`. Feeding
+    the body chunk by chunk returns each item of `results` as soon as it is
+    complete, so only the item currently being received is ever buffered.
+    Items are decoded with the C JSON scanner; an item that is still
+    incomplete is retried once the buffer has doubled, which keeps very large
+    items linear rather than quadratic to decode.
+
+    Args:
+        key: Name of the top-level field holding the array.
+    """
+
+    def __init__(self, key: str = "results"):
+        self._key = f'"{key}"'
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _SEEKING
+        self._depth = 0
+        self._last_key = ""
+        self._retry_at = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume a chunk of the document and return the items it completed."""
+        if self._state == _DONE:
+            return []
+        self._buffer += self._text_decoder.decode(chunk)
+        if self._state == _SEEKING:
+            self._seek_array()
+        if self._state != _ITEMS:
+            return []
+        return self._decode_items(final=False)
+
+    def close(self) -> List[Any]:
+        """Flush the remaining items at the end of the stream.
+
+        Raises:
+            ValueError: If the document ends in the middle of the array.
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._decode_items(final=True) if self._state == _ITEMS else []
+        if self._state == _ITEMS:
+            raise ValueError("JSON stream ended before the end of the array")
+        return items
+
+    def _seek_array(self) -> None:
+        """Scan the document prefix for the opening bracket of the array."""
+        depth, pos = self._depth, self._pos
+        for match in _token.finditer(self._buffer, pos):
+            token = match.group()
+            if token[0] == '"':
+                if len(token) == 1:
+                    break  # unterminated string, wait for more data
+                if depth == 1:
+                    self._last_key = token
+            elif token in "{[":
+                depth += 1
+                if depth == 2 and token == "[" and self._last_key == self._key:
+                    self._state = _ITEMS
+                    pos = match.end()
+                    break
+            else:
+                depth -= 1
+            pos = match.end()
+
+        self._depth = depth
+        self._buffer = self._buffer[pos:]
+        self._pos = 0
+
+    def _decode_items(self, final: bool) -> List[Any]:
+        items: List[Any] = []
+        buffer, pos, end = self._buffer, 0, len(self._buffer)
+
+        while True:
+            pos = _separator.match(buffer, pos).end()
+            if pos >= end:
+                break
+            if buffer[pos] == "]":
+                self._state = _DONE
+                pos = end
+                break
+            if not final and end < self._retry_at:
+                break
+            try:
+                item, item_end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("Malformed or truncated item in JSON stream") from None
+                self._retry_at = pos + 2 * (end - pos)
+                break
+            if not final and buffer[pos] not in '{["' and not _scalar_end.match(buffer, item_end):
+                break  # a number cut off by the chunk boundary ("3" of "3.5") would decode early
+            items.append(item)
+            pos = item_end
+
+        self._buffer = buffer[pos:]
+        self._retry_at = max(0, self._retry_at - pos)
+        return items
@@ -0,0 +1,211 @@
+"""In-process counters and latency histograms, exported in Prometheus text format.
+
+Metrics are module-level objects updated on the request path, so recording
+is a dictionary update under a lock: there are no background threads and
+nothing is sent anywhere. `render()` formats everything recorded so far for
+the `/metrics` endpoint of the streamable-http server.
+
+Per-stage latency is recorded with `stage()`:
+
+    with stage("parse"):
+        ...
+
+which adds the elapsed time to `uniprot_mcp_stage_seconds{stage="parse"}`,
+and whole tool calls by registering tools wrapped in `timed_tool()`.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple, TypeVar
+
+# Upper bounds in seconds, from a memory cache hit to a slow UniProt response
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: List["Counter | Histogram"] = []
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """A monotonically increasing count, optionally split by labels.
+
+    Args:
+        name: Metric name, ending in `_total` by convention.
+        documentation: One-line description for the `# HELP` line.
+        labels: Names of the labels values are recorded under.
+    """
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Add `amount` to the count of the given label values (in `labels` order)."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.labels:
+            values = [((), 0)]
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """A distribution of observed values in cumulative buckets, optionally split by labels.
+
+    Args:
+        name: Metric name, ending in the unit (`_seconds`, `_bytes`).
+        documentation: One-line description for the `# HELP` line.
+        labels: Names of the labels values are recorded under.
+        buckets: Increasing upper bounds; `+Inf` is added.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # Per label values: a count per bucket (not cumulative), the sum and the count
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one value for the given label values (in `labels` order)."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = ([0] * (len(self.buckets) + 1), [0.0, 0])
+            series[0][index] += 1
+            series[1][0] += value
+            series[1][1] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self._values.get(label_values)
+        return int(series[1][1]) if series else 0
+
+    def total(self, *label_values: str) -> float:
+        series = self._values.get(label_values)
+        return series[1][0] if series else 0.0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            values = sorted((labels, (list(counts), list(totals))) for labels, (counts, totals) in self._values.items())
+        for label_values, (counts, (total, count)) in values:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {_format_value(count)}")
+        return lines
+
+
+def render() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    return "\n".join(line for metric in _registry for line in metric.render()) + "\n"
+
+
+# --------------------------------
+# METRICS
+# --------------------------------
+TOOL_SECONDS = Histogram(
+    "uniprot_mcp_tool_seconds",
+    "Duration of MCP tool calls.",
+    labels=("tool",),
+)
+STAGE_SECONDS = Histogram(
+    "uniprot_mcp_stage_seconds",
+    "Time spent in each stage of serving a request.",
+    labels=("stage",),
+)
+CACHE_LOOKUPS = Counter(
+    "uniprot_mcp_cache_lookups_total",
+    "Cache lookups by tier and result (hit, miss or stale).",
+    labels=("tier", "result"),
+)
+UPSTREAM_RESPONSES = Counter(
+    "uniprot_mcp_upstream_responses_total",
+    "Responses from UniProt by status code; 599 counts connection errors and timeouts.",
+    labels=("status",),
+)
+UPSTREAM_RETRIES = Counter("uniprot_mcp_upstream_retries_total", "Upstream requests retried after a failure.")
+UPSTREAM_REJECTED = Counter(
+    "uniprot_mcp_upstream_rejected_total",
+    "Upstream requests failed fast because the host's circuit was open.",
+)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "uniprot_mcp_rate_limit_wait_seconds",
+    "Time upstream requests waited for a rate limit token, by host.",
+    labels=("host",),
+)
+UPSTREAM_BYTES = Counter("uniprot_mcp_upstream_bytes_total", "Bytes of response bodies received from UniProt.")
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Record the time spent in the block as stage `name`, also when it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, name)
+
+
+def timed_tool(tool: F) -> F:
+    """Wrap an async tool function so its calls are recorded in `TOOL_SECONDS`.
+
+    The wrapper keeps the tool's name, signature and docstring, which MCP
+    clients see.
+    """
+
+    @functools.wraps(tool)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await tool(*args, **kwargs)
+        finally:
+            TOOL_SECONDS.observe(time.perf_counter() - start, tool.__name__)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,162 @@
+"""Opt-in cProfile profiling of MCP tool calls.
+
+Off by default. With `PROFILE=call` (or `mcp-uniprot run --profile call`)
+each profiled tool call is written to `<PROFILE_DIR>/<time>-<tool>-<n>.prof`.
+With `PROFILE=aggregate` all profiled calls accumulate into one
+`aggregate-<pid>.prof`, rewritten every `AGGREGATE_WRITE_EVERY` calls and
+when the server stops. Each file written is summarized in the log by the
+`PROFILE_TOP` functions with the most own time. The files are `pstats`
+dumps, for `python -m pstats` or viewers such as snakeviz.
+
+`PROFILE_SAMPLE_RATE` profiles a random fraction of the calls, to bound
+the overhead under heavy traffic.
+
+cProfile is deterministic and per thread, so disk cache reads running in
+the cache executor's threads are not included. Tool calls share the event
+loop, so a profile also contains whatever other calls ran while it was
+waiting. A thread can only run one profiler at a time: in `call` mode, a
+call that starts while another is being profiled is not profiled.
+"""
+
+import functools
+import io
+import itertools
+import logging
+import os
+import random
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from uniprot_mcp.settings import settings
+
+if TYPE_CHECKING:
+    import cProfile
+
+AGGREGATE_WRITE_EVERY = 100
+
+logger = logging.getLogger(__name__)
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+_call_numbers = itertools.count(1)
+_active: "cProfile.Profile | None" = None
+_aggregate: "cProfile.Profile | None" = None
+_aggregate_depth = 0
+_aggregate_calls = 0
+_aggregate_written = 0
+
+
+def get_profile_dir() -> str:
+    """Return the directory profiles are written to."""
+    from uniprot_mcp.utils.cache import get_cache_dir
+
+    return settings.PROFILE_DIR or os.path.join(get_cache_dir(), "profiles")
+
+
+def summarize(profile: "cProfile.Profile", top: int) -> str:
+    """Return the `top` functions of a profile by own time, as printed by `pstats`."""
+    import pstats
+
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).strip_dirs().sort_stats("tottime").print_stats(top)
+    return out.getvalue().strip("\n")
+
+
+def write_profile(profile: "cProfile.Profile", name: str, description: str) -> str:
+    """Dump a (disabled) profile to the profile directory and log its summary."""
+    directory = get_profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    profile.dump_stats(path)
+    logger.info(f"Profile of {description} written to {path}\n{summarize(profile, settings.PROFILE_TOP)}")
+    return path
+
+
+def profiled_tool(tool: F) -> F:
+    """Wrap an async tool function to profile its calls as configured by `PROFILE`.
+
+    Returns the function unchanged when profiling is off.
+    """
+    if settings.PROFILE == "off":
+        return tool
+    _show_logs()
+
+    @functools.wraps(tool)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if random.random() >= settings.PROFILE_SAMPLE_RATE:
+            return await tool(*args, **kwargs)
+        if settings.PROFILE == "aggregate":
+            return await _profile_aggregate(tool, args, kwargs)
+        return await _profile_call(tool, args, kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+async def _profile_call(tool: F, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    import cProfile
+
+    global _active
+    if _active is not None:
+        return await tool(*args, **kwargs)
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Another profiler (e.g. a debugger's) is running on this thread
+        return await tool(*args, **kwargs)
+
+    _active = profile
+    start = time.perf_counter()
+    try:
+        return await tool(*args, **kwargs)
+    finally:
+        profile.disable()
+        _active = None
+        elapsed = time.perf_counter() - start
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{tool.__name__}-{next(_call_numbers)}.prof"
+        write_profile(profile, name, f"{tool.__name__} ({elapsed:.3f}s)")
+
+
+async def _profile_aggregate(tool: F, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    import cProfile
+
+    global _aggregate, _aggregate_depth, _aggregate_calls
+    if _aggregate is None:
+        _aggregate = cProfile.Profile()
+    # Overlapping calls share the profiler, which runs while any of them is in flight
+    if _aggregate_depth == 0:
+        try:
+            _aggregate.enable()
+        except ValueError:
+            return await tool(*args, **kwargs)
+    _aggregate_depth += 1
+    try:
+        return await tool(*args, **kwargs)
+    finally:
+        _aggregate_depth -= 1
+        _aggregate_calls += 1
+        if _aggregate_depth == 0:
+            _aggregate.disable()
+            if _aggregate_calls - _aggregate_written >= AGGREGATE_WRITE_EVERY:
+                write_aggregate_profile()
+
+
+def write_aggregate_profile() -> str | None:
+    """Write the aggregated profile, if any calls were profiled since it was last written."""
+    global _aggregate_written
+    if _aggregate is None or _aggregate_calls == _aggregate_written:
+        return None
+    _aggregate.disable()
+    _aggregate_written = _aggregate_calls
+    return write_profile(_aggregate, f"aggregate-{os.getpid()}.prof", f"{_aggregate_calls} tool calls")
+
+
+def _show_logs() -> None:
+    """Make sure profile summaries reach stderr when logging is not configured."""
+    if logger.level == logging.NOTSET or logger.level > logging.INFO:
+        logger.setLevel(logging.INFO)
+    if not logging.getLogger().handlers and not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
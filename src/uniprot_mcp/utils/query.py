@@ -0,0 +1,347 @@
+"""Parsing and local evaluation of UniProt's advanced query syntax.
+
+`parse_query` turns a query such as
+`(gene:INS OR gene:GCG) AND organism_id:9606 NOT reviewed:false` into an
+AST of `Term`, `Range`, `And`, `Or` and `Not` nodes, raising
+`QuerySyntaxError` for queries UniProt would reject, so they can be
+refused without a round trip.
+
+`QueryPlanner` evaluates an AST against a `PostingIndex`: each term maps to
+a posting list (a set of entry IDs), conjunctions are intersected cheapest
+term first and stop as soon as the result is empty, and negations are
+subtracted last; a query matching all but some entries evaluates to a
+complement instead of enumerating the index. Indexes raise `UnsupportedQueryError` for terms they
+cannot answer; planning checks every term up front, so an unsupported
+query fails before any posting list is read.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Protocol, Set, Tuple, Union
+
+from pydantic import BaseModel, ConfigDict
+
+OPERATORS = ("AND", "OR", "NOT")
+
+# One token: a parenthesis, or a term with an optional `field:` prefix whose
+# value is a quoted phrase, a range, a word or the opening parenthesis of a
+# field group (`gene:(INS OR GCG)`).
+_token = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<lparen>\()
+    | (?P<rparen>\))
+    | (?:(?P<field>[A-Za-z_]\w*):)?
+      (?:
+        (?P<group>\()
+        | (?P<quoted>"(?:[^"\\]|\\.)*")
+        | (?P<range>[\[{][^\]}]*[\]}])
+        | (?P<word>[^\s()"\[\]{}][^\s()"]*)
+      )
+    """,
+    re.VERBOSE,
+)
+_range = re.compile(r"^([\[{])\s*(\S+)\s+TO\s+(\S+)\s*([\]}])$")
+
+
+class QuerySyntaxError(ValueError):
+    """The query is not valid UniProt query syntax."""
+
+
+class UnsupportedQueryError(ValueError):
+    """The query uses syntax or fields a local index cannot evaluate."""
+
+
+class Term(BaseModel):
+    """A `field:value` term, or free text when `field` is None.
+
+    `value` is unquoted; `phrase` is set when it was quoted, `prefix` when
+    it ends with an unquoted `*`.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    field: str | None = None
+    value: str
+    phrase: bool = False
+
+    @property
+    def prefix(self) -> bool:
+        return not self.phrase and self.value.endswith("*") and self.value != "*"
+
+    def __str__(self) -> str:
+        value = '"' + self.value.replace('"', '\\"') + '"' if self.phrase else self.value
+        return f"{self.field}:{value}" if self.field else value
+
+
+class Range(BaseModel):
+    """A `field:[low TO high]` term; `*` leaves a bound open."""
+
+    model_config = ConfigDict(frozen=True)
+
+    field: str | None = None
+    low: str
+    high: str
+    include_low: bool = True
+    include_high: bool = True
+
+    def __str__(self) -> str:
+        value = f"{'[' if self.include_low else '{'}{self.low} TO {self.high}{']' if self.include_high else '}'}"
+        return f"{self.field}:{value}" if self.field else value
+
+
+class And(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    children: Tuple["Node", ...]
+
+    def __str__(self) -> str:
+        return " AND ".join(f"({child})" if isinstance(child, Or) else str(child) for child in self.children)
+
+
+class Or(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    children: Tuple["Node", ...]
+
+    def __str__(self) -> str:
+        return " OR ".join(f"({child})" if isinstance(child, And) else str(child) for child in self.children)
+
+
+class Not(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    child: "Node"
+
+    def __str__(self) -> str:
+        return f"NOT ({self.child})" if isinstance(self.child, (And, Or)) else f"NOT {self.child}"
+
+
+Node = Union[Term, Range, And, Or, Not]
+for _model in (And, Or, Not):
+    _model.model_rebuild()
+
+
+def terms(node: Node) -> List[Term | Range]:
+    """Return the leaf terms of a query, left to right."""
+    if isinstance(node, (Term, Range)):
+        return [node]
+    if isinstance(node, Not):
+        return terms(node.child)
+    return [term for child in node.children for term in terms(child)]
+
+
+# --------------------------------
+# PARSER
+# --------------------------------
+def parse_query(query: str) -> Node:
+    """Parse a UniProt advanced search query.
+
+    Operators are `AND`, `OR` and `NOT` (upper case, as UniProt requires);
+    adjacent terms are joined with `AND`, and `a NOT b` means `a AND NOT b`.
+    `AND` binds tighter than `OR`.
+
+    Raises:
+        QuerySyntaxError: For unbalanced parentheses or quotes, dangling
+            operators, missing values, malformed ranges or an empty query.
+    """
+    parser = _Parser(_tokenize(query), query)
+    if not parser.tokens:
+        raise QuerySyntaxError("Empty query")
+    node = parser.parse_or(None)
+    if parser.position < len(parser.tokens):
+        kind, _, _, offset = parser.tokens[parser.position]
+        raise QuerySyntaxError(f"Unexpected {'`)`' if kind == 'rparen' else 'token'} at position {offset}: {query}")
+    return node
+
+
+Token = Tuple[str, str | None, str, int]  # kind, field, text, offset
+
+
+def _tokenize(query: str) -> List[Token]:
+    tokens: List[Token] = []
+    position = 0
+    while position < len(query):
+        match = _token.match(query, position)
+        if match is None:
+            what = "quote" if query[position] == '"' else "range" if query[position] in "[{" else "character"
+            raise QuerySyntaxError(f"Unterminated {what} at position {position}: {query}")
+        kind = match.lastgroup or ""
+        text = match[kind]
+        if kind == "word" and text.endswith(":"):
+            raise QuerySyntaxError(f"Missing value for `{match[0]}` at position {position}: {query}")
+        if kind == "word" and (":[" in text or ":{" in text):
+            raise QuerySyntaxError(f"Unterminated range at position {position}: {query}")
+        if kind == "word" and match["field"] is None and text in OPERATORS:
+            kind = text
+        if kind != "space":
+            tokens.append((kind, match["field"], text, position))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over the token list; `field` is the enclosing field group's field."""
+
+    def __init__(self, tokens: List[Token], query: str):
+        self.tokens = tokens
+        self.query = query
+        self.position = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def error(self, message: str) -> QuerySyntaxError:
+        offset = self.tokens[self.position][3] if self.position < len(self.tokens) else len(self.query)
+        return QuerySyntaxError(f"{message} at position {offset}: {self.query}")
+
+    def parse_or(self, field: str | None) -> Node:
+        children = [self.parse_and(field)]
+        while self.peek() == "OR":
+            self.position += 1
+            children.append(self.parse_and(field))
+        return children[0] if len(children) == 1 else Or(children=tuple(children))
+
+    def parse_and(self, field: str | None) -> Node:
+        children = [self.parse_unary(field)]
+        while self.peek() not in (None, "OR", "rparen"):
+            if self.peek() == "AND":
+                self.position += 1
+            children.append(self.parse_unary(field))
+        return children[0] if len(children) == 1 else And(children=tuple(children))
+
+    def parse_unary(self, field: str | None) -> Node:
+        kind = self.peek()
+        if kind == "NOT":
+            self.position += 1
+            return Not(child=self.parse_unary(field))
+        if kind is None:
+            raise self.error("Query ends where a term was expected")
+        if kind in ("AND", "OR"):
+            raise self.error(f"`{kind}` without a term before it")
+        if kind == "rparen":
+            raise self.error("Empty parentheses")
+
+        kind, token_field, text, _ = self.tokens[self.position]
+        self.position += 1
+        if kind in ("lparen", "group"):
+            node = self.parse_or(token_field or field)
+            if self.peek() != "rparen":
+                raise self.error("Unbalanced `(`")
+            self.position += 1
+            return node
+
+        token_field = token_field or field
+        if kind == "quoted":
+            return Term(field=token_field, value=re.sub(r"\\(.)", r"\1", text[1:-1]), phrase=True)
+        if kind == "range":
+            match = _range.match(text)
+            if match is None:
+                raise QuerySyntaxError(f"Malformed range `{text}`, expected `[low TO high]`: {self.query}")
+            opening, low, high, closing = match.groups()
+            return Range(field=token_field, low=low, high=high, include_low=opening == "[", include_high=closing == "]")
+        return Term(field=token_field, value=text)
+
+
+# --------------------------------
+# PLANNER
+# --------------------------------
+class PostingIndex(Protocol):
+    """An index that can evaluate single terms to sets of entry IDs."""
+
+    def estimate(self, term: Term | Range) -> int:
+        """Return an upper bound on the number of entries matching `term`.
+
+        Raises:
+            UnsupportedQueryError: If the index cannot evaluate `term`.
+        """
+        ...
+
+    def postings(self, term: Term | Range) -> Set[int]:
+        """Return the IDs of the entries matching `term`."""
+        ...
+
+    def count(self) -> int:
+        """Return the number of entries, the cost of a negation."""
+        ...
+
+
+class Postings(NamedTuple):
+    """The entries matching a query: `ids`, or every entry but `ids` when `complement` is set."""
+
+    ids: Set[int]
+    complement: bool = False
+
+    def __and__(self, other: "Postings") -> "Postings":
+        if self.complement and other.complement:
+            return Postings(self.ids | other.ids, complement=True)
+        if self.complement:
+            return Postings(other.ids - self.ids)
+        return Postings(self.ids - other.ids if other.complement else self.ids & other.ids)
+
+    def __invert__(self) -> "Postings":
+        return Postings(self.ids, not self.complement)
+
+
+class QueryPlanner:
+    """Evaluate query ASTs against a `PostingIndex`.
+
+    Args:
+        index: The index answering terms.
+    """
+
+    def __init__(self, index: PostingIndex):
+        self.index = index
+        self._estimates: Dict[Term | Range, int] = {}
+        self._count: int | None = None
+
+    def evaluate(self, node: Node) -> Postings:
+        """Return the entries matching a query.
+
+        Negations never enumerate the index: the result is a complement when
+        the query matches everything except some posting lists, such as
+        `NOT reviewed:false`, and the caller resolves it.
+
+        Raises:
+            UnsupportedQueryError: If any term cannot be evaluated by the index.
+        """
+        for term in terms(node):
+            self.cost(term)
+        return self._evaluate(node)
+
+    def cost(self, node: Node) -> int:
+        """Estimated number of entries a node matches, used to order intersections."""
+        if isinstance(node, (Term, Range)):
+            if node not in self._estimates:
+                self._estimates[node] = self.index.estimate(node)
+            return self._estimates[node]
+        if isinstance(node, Not):
+            if self._count is None:
+                self._count = self.index.count()
+            return self._count
+        costs = [self.cost(child) for child in node.children]
+        return min(costs) if isinstance(node, And) else sum(costs)
+
+    def _evaluate(self, node: Node) -> Postings:
+        if isinstance(node, Term) and node.field is None and node.value == "*":
+            return Postings(set(), complement=True)
+        if isinstance(node, (Term, Range)):
+            return Postings(self.index.postings(node) if self.cost(node) else set())
+        if isinstance(node, Not):
+            return ~self._evaluate(node.child)
+        if isinstance(node, Or):
+            children = [self._evaluate(child) for child in node.children]
+            included: Set[int] = set().union(*(child.ids for child in children if not child.complement))
+            excluded = [child.ids for child in children if child.complement]
+            if not excluded:
+                return Postings(included)
+            # a OR NOT b OR NOT c == NOT ((b AND c) NOT a)
+            return Postings(set.intersection(*excluded) - included, complement=True)
+
+        positive = sorted((child for child in node.children if not isinstance(child, Not)), key=self.cost)
+        negative = [child for child in node.children if isinstance(child, Not)]
+        result = Postings(set(), complement=True)
+        for child in [*positive, *negative]:
+            if not result.complement and not result.ids:
+                break
+            result &= self._evaluate(child)
+        return result
@@ -0,0 +1,78 @@
+"""Process-wide rate limiting of upstream requests, one token bucket per host."""
+
+import asyncio
+import time
+from typing import Dict
+
+from pydantic import BaseModel
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.utils.metrics import RATE_LIMIT_WAIT_SECONDS
+
+_limiters: Dict[str, "TokenBucket"] = {}
+
+
+class RateLimitStats(BaseModel):
+    acquired: int = 0
+    total_wait: float = 0.0
+
+
+class TokenBucket:
+    """An async token bucket refilled at `rate` tokens per second.
+
+    Up to `burst` requests go through immediately when the bucket is full;
+    after that requests are spaced out to `rate` per second. Waiters queue
+    on an `asyncio.Lock`, which wakes them in arrival order. Waits are
+    recorded in `RATE_LIMIT_WAIT_SECONDS` under `host`.
+    """
+
+    def __init__(self, rate: float, burst: int, host: str = ""):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.host = host
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._loop = asyncio.get_running_loop()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token and return the time spent waiting, in seconds."""
+        start = time.monotonic()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+        waited = time.monotonic() - start
+        RATE_LIMIT_WAIT_SECONDS.observe(waited, self.host)
+        return waited
+
+    @property
+    def stats(self) -> RateLimitStats:
+        return RateLimitStats(
+            acquired=RATE_LIMIT_WAIT_SECONDS.count(self.host),
+            total_wait=RATE_LIMIT_WAIT_SECONDS.total(self.host),
+        )
+
+
+def get_rate_limiter(host: str) -> TokenBucket | None:
+    """Return the token bucket for a host, or None when rate limiting is disabled."""
+    if settings.RATE_LIMIT_PER_SECOND <= 0:
+        return None
+    limiter = _limiters.get(host)
+    if limiter is None or limiter._loop is not asyncio.get_running_loop():
+        limiter = TokenBucket(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST, host)
+        _limiters[host] = limiter
+    return limiter
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    """Return the number of acquired tokens and the total queue wait per host."""
+    return {host: limiter.stats.model_dump() for host, limiter in _limiters.items()}
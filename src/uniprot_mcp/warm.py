@@ -0,0 +1,255 @@
+"""Fill the response cache ahead of traffic, e.g. as a pre-start job.
+
+Three sources are supported: a file of search queries, a file of accessions
+and a proteome. Requests go through the same code paths (and so the same
+cache keys, rate limits and retries) as the MCP tools. Progress is saved in
+the cache directory as work completes, so an interrupted run picks up where
+it stopped; a run that finishes without errors removes its saved progress.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Iterable, List, Literal
+
+from pydantic import BaseModel
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.tools.search_uniprot import (
+    BASE_URL,
+    DEFAULT_FIELDS,
+    DEFAULT_SIZE,
+    build_search_params,
+    next_cursor,
+    search_request,
+)
+from uniprot_mcp.utils.cache import get_cache_dir
+
+Report = Callable[[str], None]
+# Seconds between progress lines
+REPORT_INTERVAL = 2.0
+
+
+class WarmProgress(BaseModel):
+    total: int | None = None
+    done: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    errors: int = 0
+    started: float = 0.0
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        rate = self.done / elapsed
+        line = f"warmed {self.done}"
+        if self.total:
+            line += f"/{self.total - self.skipped} ({self.done / max(self.total - self.skipped, 1):.0%})"
+        line += f", {rate:.1f}/s, {self.errors} errors, {self.rejected} rejected, {elapsed:.0f}s elapsed"
+        if self.total and rate > 0:
+            line += f", ~{(self.total - self.skipped - self.rejected - self.done) / rate:.0f}s left"
+        return line
+
+
+class WarmState:
+    """Completed work units of a warm-up run, persisted to survive interruptions.
+
+    Args:
+        path: JSON file holding the state.
+        restart: Ignore (and overwrite) any saved state.
+    """
+
+    def __init__(self, path: str, restart: bool = False):
+        self.path = path
+        self.done: set[str] = set()
+        self.cursor: str | None = None
+        if not restart and os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            self.done = set(saved.get("done", []))
+            self.cursor = saved.get("cursor")
+        self._last_saved = time.monotonic()
+
+    def mark(self, *items: str) -> None:
+        self.done.update(items)
+        if time.monotonic() - self._last_saved >= REPORT_INTERVAL:
+            self.save()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"done": sorted(self.done), "cursor": self.cursor}, f)
+        os.replace(tmp_path, self.path)
+        self._last_saved = time.monotonic()
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def warm_state_path(kind: Literal["queries", "accessions", "proteome"], source: str, **options: Any) -> str:
+    """Where the progress of warming `source` with the given options is saved."""
+    digest = hashlib.sha256(json.dumps([kind, source, options], sort_keys=True).encode()).hexdigest()
+    return os.path.join(get_cache_dir(), "warm", f"{kind}-{digest[:16]}.json")
+
+
+def read_lines(path: str) -> List[str]:
+    """Read non-empty, non-comment lines of a file."""
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def read_accessions(path: str) -> List[str]:
+    """Read accessions separated by whitespace or commas, uppercased and deduplicated."""
+    accessions: Iterable[str] = (
+        token.strip().upper() for line in read_lines(path) for token in line.replace(",", " ").split()
+    )
+    return list(dict.fromkeys(accessions))
+
+
+async def _report_progress(progress: WarmProgress, report: Report) -> None:
+    while True:
+        await asyncio.sleep(REPORT_INTERVAL)
+        report(progress.line())
+
+
+async def _run_workers(
+    items: List[Any],
+    work: Callable[[Any], Any],
+    concurrency: int,
+    progress: WarmProgress,
+    report: Report,
+) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+
+    async def worker() -> None:
+        while not queue.empty():
+            await work(queue.get_nowait())
+
+    reporter = asyncio.create_task(_report_progress(progress, report))
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        reporter.cancel()
+
+
+async def warm_queries(
+    queries: List[str],
+    state: WarmState,
+    fields: List[str] | str | None = DEFAULT_FIELDS,
+    size: int | None = DEFAULT_SIZE,
+    concurrency: int = 8,
+    report: Report = print,
+) -> WarmProgress:
+    """Cache the search results of each query, as `search_uniprot` would request them.
+
+    The request is built by the tool's own `search_request`, and `fields` and
+    `size` default to the tool's, so later calls with the same arguments read
+    what was cached.
+
+    Queries UniProt rejects (e.g. with a syntax error) are reported and
+    marked done; only upstream failures count as errors to retry.
+    """
+    from uniprot_mcp.utils.http import is_upstream_failure, request_api_with_headers
+
+    pending = [query for query in dict.fromkeys(queries) if query not in state.done]
+    progress = WarmProgress(total=len(queries), skipped=len(queries) - len(pending), started=time.monotonic())
+
+    async def work(query: str) -> None:
+        _, error_obj, _ = await request_api_with_headers(**search_request(query, fields, size), response_model_type=str)
+        if error_obj and is_upstream_failure(error_obj.code):
+            progress.errors += 1
+            report(f"failed to warm {query!r}: API Error {error_obj.code}")
+            return
+        if error_obj:
+            progress.rejected += 1
+            report(f"UniProt rejected {query!r}: API Error {error_obj.code}")
+        else:
+            progress.done += 1
+        state.mark(query)
+
+    await _run_workers(pending, work, concurrency, progress, report)
+    return progress
+
+
+async def warm_accessions(
+    accessions: List[str],
+    state: WarmState,
+    fields: List[str] | None = None,
+    concurrency: int = 8,
+    report: Report = print,
+) -> WarmProgress:
+    """Cache entries by accession, in the batches `fetch_entries` uses."""
+    from uniprot_mcp.tools.fetch_entries import fetch_entries
+
+    pending = [accession for accession in accessions if accession not in state.done]
+    progress = WarmProgress(total=len(accessions), skipped=len(accessions) - len(pending), started=time.monotonic())
+    batches = [pending[i : i + settings.BATCH_SIZE] for i in range(0, len(pending), settings.BATCH_SIZE)]
+
+    async def work(batch: List[str]) -> None:
+        result = json.loads(await fetch_entries(batch, fields))
+        failed = {accession for error in result.get("errors", []) for accession in error["accessions"]}
+        for error in result.get("errors", []):
+            report(f"failed to warm {len(error['accessions'])} accessions: {error['error']}")
+        progress.errors += len(failed)
+        progress.done += len(batch) - len(failed)
+        state.mark(*(accession for accession in batch if accession not in failed))
+
+    await _run_workers(batches, work, concurrency, progress, report)
+    return progress
+
+
+async def warm_proteome(
+    proteome: str,
+    state: WarmState,
+    fields: List[str] | None = None,
+    page_size: int = 500,
+    report: Report = print,
+) -> WarmProgress:
+    """Cache every entry of a proteome by accession, walking the search cursor chain.
+
+    Pages are fetched one after the other (each needs the previous page's
+    cursor); the saved cursor lets an interrupted walk resume mid-proteome.
+    """
+    from uniprot_mcp.tools.fetch_entries import entry_cache_key
+    from uniprot_mcp.tools.models import UniProtSearchResponse
+    from uniprot_mcp.utils.cache import cache_response_in_background
+    from uniprot_mcp.utils.canonical import canonicalize_fields
+    from uniprot_mcp.utils.http import request_api_with_headers
+
+    fields_param = canonicalize_fields(fields) if fields else None
+    progress = WarmProgress(done=len(state.done), started=time.monotonic())
+    reporter = asyncio.create_task(_report_progress(progress, report))
+    try:
+        while True:
+            params = build_search_params(f"proteome:{proteome}", fields, page_size, cursor=state.cursor)
+            parsed_data, error_obj, headers = await request_api_with_headers(
+                url=f"{BASE_URL}/search",
+                request=params,
+                response_model_type=UniProtSearchResponse,
+            )
+            if error_obj:
+                progress.errors += 1
+                report(f"failed to warm proteome {proteome}: API Error {error_obj.code}")
+                break
+
+            if (total := headers.get("x-total-results", "")).isdigit():
+                progress.total = int(total)
+            for entry in parsed_data.results:
+                cache_response_in_background(
+                    entry_cache_key(entry.primaryAccession, fields_param),
+                    entry.model_dump_json(exclude_none=True),
+                    settings.CACHE_TTL,
+                )
+            progress.done += len(parsed_data.results)
+            state.cursor = next_cursor(headers)
+            state.mark(*(entry.primaryAccession for entry in parsed_data.results))
+            if state.cursor is None:
+                break
+    finally:
+        reporter.cancel()
+    return progress
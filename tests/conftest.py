@@ -0,0 +1,52 @@
+from typing import Callable, List
+
+import httpx
+import pytest
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.utils import cache, http
+
+
+class Upstream:
+    """Stands in for rest.uniprot.org: answers requests with `handler` and records them."""
+
+    def __init__(self):
+        self.requests: List[httpx.Request] = []
+        self.handler: Callable[[httpx.Request], httpx.Response] = lambda request: httpx.Response(404)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.handler(request)
+
+    def flush(self) -> None:
+        """Wait for the cache writes queued so far."""
+        cache.get_cache_executor().submit(lambda: None).result()
+
+
+def close_disk_cache(disk) -> None:
+    # FanoutCache.close forgets its sub-caches (the fields index) without closing them
+    for sub_cache in disk._caches.values():
+        sub_cache.close()
+    disk.close()
+
+
+@pytest.fixture
+def upstream(monkeypatch, tmp_path):
+    """Route the shared HTTP client to an `Upstream`, with empty caches and no rate limit or retries."""
+    monkeypatch.setattr(settings, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "CACHE_IO_WORKERS", 1)
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_SECOND", 0)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_ENABLED", False)
+    monkeypatch.setattr(settings, "MAX_RETIRES", 0)
+    for name in ("_cache", "_cache_executor", "_memory_cache", "_negative_cache"):
+        monkeypatch.setattr(cache, name, None)
+    fake = Upstream()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+    monkeypatch.setattr(http, "get_http_client", lambda: client)
+    yield fake
+    if cache._cache is not None:
+        # diskcache keeps a connection per thread, closed by the thread that opened it
+        cache.get_cache_executor().submit(close_disk_cache, cache._cache).result()
+        close_disk_cache(cache._cache)
+    if cache._cache_executor is not None:
+        cache._cache_executor.shutdown(wait=True)
@@ -0,0 +1,49 @@
+import pytest
+
+from uniprot_mcp.utils.cache import generate_cache_key
+from uniprot_mcp.utils.canonical import canonicalize_fields, canonicalize_params, normalize_query
+
+
+def key(params):
+    return generate_cache_key("GET", "https://rest.uniprot.org/uniprotkb/search", canonicalize_params(params))
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("(gene:INS)", "gene:INS"),
+        ("((a OR b))", "a OR b"),
+        ("  gene:INS   AND  (x) ", "gene:INS AND x"),
+        ("gene:(INS OR GCG)", "gene:(INS OR GCG)"),
+        ('"a  b"', '"a  b"'),
+        ("(a OR b) AND c", "(a OR b) AND c"),
+    ],
+)
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+
+def test_equivalent_requests_share_a_key():
+    assert key({"query": "(gene:INS)", "fields": "gene_names,accession,accession"}) == key({
+        "query": "gene:INS",
+        "fields": ["accession", "gene_names"],
+        "includeIsoform": "false",
+        "format": "json",
+    })
+
+
+def test_empty_and_default_params_are_dropped():
+    assert canonicalize_params({"query": "a", "size": None, "sort": "", "includeIsoform": False}) == {"query": "a"}
+    assert canonicalize_params(None) is None
+
+
+def test_field_order_is_kept_for_tabular_formats():
+    assert canonicalize_params({"fields": "b,a", "format": "tsv"}) == {"fields": "b,a", "format": "tsv"}
+    assert canonicalize_params({"fields": "b,a"}) == {"fields": "a,b"}
+    assert canonicalize_fields(" b, a ,b", keep_order=True) == "b,a"
+
+
+def test_different_requests_keep_different_keys():
+    assert key({"query": "gene:INS"}) != key({"query": "gene:ins"})
+    assert key({"query": "a OR (b AND c)"}) != key({"query": "(a OR b) AND c"})
+    assert key({"fields": "a,b", "format": "tsv"}) != key({"fields": "b,a", "format": "tsv"})
@@ -0,0 +1,108 @@
+import pytest
+
+from uniprot_mcp.utils import circuit
+from uniprot_mcp.utils.circuit import MIN_RETRY_IN, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=0.5, window=4, min_requests=4, reset_timeout=10)
+
+
+def trip(breaker):
+    for success in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(success)
+
+
+def test_stays_closed_below_min_requests(breaker):
+    for _ in range(3):
+        breaker.record(False)
+    assert breaker.state == "closed"
+    assert breaker.allow()
+    assert breaker.retry_in() == 0.0
+
+
+def test_opens_at_failure_threshold(breaker):
+    trip(breaker)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_failures_leave_the_window(breaker):
+    for success in (False, True, True, True, True, False):
+        breaker.record(success)
+    assert breaker.state == "closed"
+
+
+def test_open_retry_in_counts_down(breaker, clock):
+    trip(breaker)
+    assert breaker.retry_in() == 10
+    clock.now += 4
+    assert breaker.retry_in() == 6
+    clock.now += 5.5
+    assert breaker.retry_in() == MIN_RETRY_IN
+
+
+def test_single_probe_after_reset_timeout(breaker, clock):
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    assert breaker.state == "half-open"
+    assert not breaker.allow()
+
+
+def test_rejected_during_probe_are_told_to_wait(breaker, clock):
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    clock.now += 3
+    assert not breaker.allow()
+    assert breaker.retry_in() == 7
+    clock.now += 6.9
+    assert breaker.retry_in() == MIN_RETRY_IN
+
+
+def test_successful_probe_closes(breaker, clock):
+    trip(breaker)
+    clock.now += 10
+    breaker.allow()
+    breaker.record(True)
+    assert breaker.state == "closed"
+    # The failures before the circuit opened no longer count
+    for _ in range(3):
+        breaker.record(False)
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens(breaker, clock):
+    trip(breaker)
+    clock.now += 10
+    breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_in() == 10
+
+
+def test_lost_probe_is_replaced_after_reset_timeout(breaker, clock):
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    clock.now += 10
+    assert breaker.allow()
@@ -0,0 +1,38 @@
+import json
+from array import array
+
+import pytest
+
+from uniprot_mcp.utils.columnar import ColumnarTable
+
+
+def column(tsv: str, name: str = "X"):
+    table = ColumnarTable.from_tsv(tsv)
+    return table.columns[table.names.index(name)]
+
+
+def test_numeric_columns_are_arrays():
+    table = ColumnarTable.from_tsv("Entry\tLength\tMass\nA\t110\t11,981\nB\t5\t900\n")
+    assert table.columns[1] == array("q", [110, 5])
+    assert table.columns[2] == array("q", [11981, 900])
+    assert json.loads(table.to_json())["data"] == [["A", "B"], [110, 5], [11981, 900]]
+
+
+def test_grouped_integers_after_ungrouped_ones():
+    assert column("Entry\tX\nA\t981\nB\t11,981\nC\t\n") == array("q", [981, 11981, 0])
+    assert column("Entry\tX\nA\t981\nB\t1,5\n") == ("981", "1,5")
+
+
+@pytest.mark.parametrize(
+    "values",
+    [["0042", "1"], ["1", "x"], ["nan", "1"], ["inf", "2"], ["-Infinity", "1"], ["1e400", "1"]],
+)
+def test_non_numeric_columns_stay_strings(values):
+    tsv = "Entry\tX\n" + "".join(f"{row}\t{value}\n" for row, value in enumerate(values))
+    assert column(tsv) == tuple(values)
+    json.loads(ColumnarTable.from_tsv(tsv).to_json(), parse_constant=pytest.fail)
+
+
+def test_missing_numbers_are_null():
+    table = ColumnarTable.from_tsv("Entry\tX\nA\t1.5\nB\t\n")
+    assert json.loads(table.to_json())["data"][1] == [1.5, None]
@@ -0,0 +1,36 @@
+import json
+
+import httpx
+
+from uniprot_mcp.tools.fetch_entries import fetch_entries
+
+
+def entries_handler(known):
+    """Answer `/accessions` with the known entries, keyed by primary accession."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        wanted = request.url.params["accessions"].split(",")
+        results = [
+            entry for entry in known if {entry["primaryAccession"], *entry.get("secondaryAccessions", [])} & set(wanted)
+        ]
+        if any(not accession[:1].isalpha() for accession in wanted):
+            return httpx.Response(400, text="Invalid accession")
+        return httpx.Response(200, json={"results": results})
+
+    return handler
+
+
+async def test_malformed_accessions_are_not_sent(upstream):
+    upstream.handler = entries_handler([{"primaryAccession": "P01308"}])
+    result = json.loads(await fetch_entries(["P01308", "12345", "not an accession", "Q99999"]))
+    assert [entry and entry["primaryAccession"] for entry in result["results"]] == ["P01308", None, None, None]
+    assert result["not_found"] == ["12345", "NOT AN ACCESSION", "Q99999"]
+    assert "errors" not in result
+    assert [request.url.params["accessions"] for request in upstream.requests] == ["P01308,Q99999"]
+
+
+async def test_secondary_accessions_resolve_to_the_merged_entry(upstream):
+    upstream.handler = entries_handler([{"primaryAccession": "P01308", "secondaryAccessions": ["Q5EEX2"]}])
+    result = json.loads(await fetch_entries(["Q5EEX2"], fields=["accession"]))
+    assert result["results"] == [{"primaryAccession": "P01308"}]
+    assert result["not_found"] == []
@@ -0,0 +1,51 @@
+import json
+
+import httpx
+
+from uniprot_mcp.tools.get_sequences import get_sequences, sequence_cache_key
+from uniprot_mcp.utils.cache import get_negative_cache
+
+INS = ">sp|P01308|INS_HUMAN Insulin\nMALWMRLLPLL\n"
+
+
+def merged_handler(sec_acc_status=200):
+    """UniProt with P01308, into which Q5EEX2 was merged."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        wanted = request.url.params["accessions"].split(",")
+        found = bool({"P01308", "Q5EEX2"} & set(wanted))
+        if request.url.params.get("format") == "fasta":
+            return httpx.Response(200, text=INS if found else "")
+        results = [{"primaryAccession": "P01308", "secondaryAccessions": ["Q5EEX2"]}] if found else []
+        return httpx.Response(sec_acc_status, json={"results": results})
+
+    return handler
+
+
+async def test_secondary_accessions_get_the_merged_record(upstream):
+    upstream.handler = merged_handler()
+    result = json.loads(await get_sequences(["Q5EEX2", "Q99999"]))
+    assert result["fasta"] == INS
+    assert result["not_found"] == ["Q99999"]
+    assert get_negative_cache().get(sequence_cache_key("Q5EEX2")) is None
+    assert get_negative_cache().get(sequence_cache_key("Q99999")) is not None
+
+    upstream.flush()
+    upstream.requests.clear()
+    assert json.loads(await get_sequences(["Q5EEX2"]))["fasta"] == INS
+    assert upstream.requests == []
+
+
+async def test_unresolved_secondary_accessions_are_errors_not_misses(upstream):
+    upstream.handler = merged_handler(sec_acc_status=500)
+    result = json.loads(await get_sequences(["Q5EEX2"]))
+    assert result["not_found"] == []
+    assert result["errors"][0]["accessions"] == ["Q5EEX2"]
+    assert get_negative_cache().get(sequence_cache_key("Q5EEX2")) is None
+
+
+async def test_malformed_accessions_are_not_sent(upstream):
+    upstream.handler = merged_handler()
+    result = json.loads(await get_sequences(["P01308", "bad accession"]))
+    assert result == {"fasta": INS, "not_found": ["BAD ACCESSION"]}
+    assert [request.url.params["accessions"] for request in upstream.requests] == ["P01308"]
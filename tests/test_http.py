@@ -0,0 +1,235 @@
+import asyncio
+import time
+from typing import List
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.utils import http
+from uniprot_mcp.utils.cache import STALE_WARNING, get_memory_cache
+from uniprot_mcp.utils.columnar import ColumnarTable
+from uniprot_mcp.utils.http import parse_response, request_api, request_api_with_headers, single_flight
+
+SEARCH_URL = "https://rest.uniprot.org/uniprotkb/search"
+SEARCH_RESULT = {"results": [{"primaryAccession": "P01308"}]}
+
+
+class Entry(BaseModel):
+    primaryAccession: str
+
+
+class Search(BaseModel):
+    results: List[Entry]
+
+
+def test_parse_response_types():
+    assert parse_response(200, '{"primaryAccession": "P01308"}', Entry) == (Entry(primaryAccession="P01308"), None)
+    assert parse_response(200, '{"a": 1}', str) == ('{"a": 1}', None)
+    table, error = parse_response(200, "Entry\tLength\nP01308\t110\n", ColumnarTable)
+    assert error is None and table is not None and table.column("Length") == [110]
+    assert parse_response(200, '{"a": 1}') == ({"a": 1}, None)
+
+
+def test_parse_response_errors():
+    parsed, error = parse_response(404, "not found", Entry)
+    assert parsed is None and error is not None and error.code == 404
+    parsed, error = parse_response(200, "{}", Entry)
+    assert parsed is None and error is not None and error.code == 500
+
+
+# --------------------------------
+# REQUEST COALESCING
+# --------------------------------
+async def test_single_flight_runs_fetch_once_for_concurrent_callers():
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    waiters = [asyncio.ensure_future(single_flight("once", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == [1, 1, 1]
+
+
+async def test_single_flight_error_reaches_every_waiter():
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        raise RuntimeError("upstream broke")
+
+    waiters = [asyncio.ensure_future(single_flight("error", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    waiters[0].cancel()
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert [str(result) for result in results[1:]] == ["upstream broke", "upstream broke"]
+    assert "error" not in http._inflight
+
+
+async def test_identical_requests_share_one_upstream_call(upstream):
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json=SEARCH_RESULT)
+
+    upstream.handler = handler
+    calls = [asyncio.ensure_future(request_api(SEARCH_URL, {"query": "gene:INS"}, Search)) for _ in range(5)]
+    while not upstream.requests:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)
+    release.set()
+    results = await asyncio.gather(*calls)
+    assert len(upstream.requests) == 1
+    assert all(result == (Search(results=[Entry(primaryAccession="P01308")]), None) for result in results)
+
+
+# --------------------------------
+# CACHE TIERS
+# --------------------------------
+def search_handler(request: httpx.Request) -> httpx.Response:
+    """Answer every search with an entry named after the query."""
+    return httpx.Response(200, json={"results": [{"primaryAccession": request.url.params["query"]}]})
+
+
+async def test_memory_cache_returns_the_parsed_model(upstream):
+    upstream.handler = search_handler
+    first, _ = await request_api(SEARCH_URL, {"query": "P01308"}, Search)
+    hits = get_memory_cache().stats.hits
+    second, _ = await request_api(SEARCH_URL, {"query": "P01308"}, Search)
+    assert second is first
+    assert len(upstream.requests) == 1
+    assert get_memory_cache().stats.hits == hits + 1
+
+
+async def test_evicted_models_are_parsed_again_from_disk(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "MEMORY_CACHE_MAX_ENTRIES", 1)
+    upstream.handler = search_handler
+    first, _ = await request_api(SEARCH_URL, {"query": "P01308"}, Search)
+    await request_api(SEARCH_URL, {"query": "P69905"}, Search)
+    assert len(get_memory_cache()) == 1
+    upstream.flush()
+
+    again, _ = await request_api(SEARCH_URL, {"query": "P01308"}, Search)
+    assert again == first and again is not first
+    assert len(upstream.requests) == 2
+
+
+# --------------------------------
+# STALE RESPONSES
+# --------------------------------
+class WallClock:
+    """`time.time()`, moved forward by `offset` seconds."""
+
+    def __init__(self):
+        self.offset = 0.0
+        self._time = time.time
+
+    def __call__(self) -> float:
+        return self._time() + self.offset
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = WallClock()
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+async def search(query: str):
+    """A search cached for 100 seconds, parsed to a dict so only the disk cache is involved."""
+    parsed, error, headers = await request_api_with_headers(SEARCH_URL, {"query": query}, cache_ttl=100)
+    return parsed and parsed["results"][0]["primaryAccession"], error, headers
+
+
+async def test_stale_entries_are_served_while_revalidating(upstream, clock):
+    versions = iter(["v1", "v2"])
+    upstream.handler = lambda request: httpx.Response(200, json={"results": [{"primaryAccession": next(versions)}]})
+    await search("x")
+    upstream.flush()
+
+    clock.offset = 150
+    assert await search("x") == ("v1", None, {"warning": STALE_WARNING})
+    await asyncio.gather(*http._background_refreshes)
+    upstream.flush()
+    assert await search("x") == ("v2", None, {})
+    assert len(upstream.requests) == 2
+
+
+async def test_stale_entries_are_served_when_upstream_fails(upstream, clock):
+    upstream.handler = search_handler
+    await search("x")
+    upstream.flush()
+
+    clock.offset = 100 + settings.CACHE_STALE_WHILE_REVALIDATE + 1
+    upstream.handler = lambda request: httpx.Response(503, text="unavailable")
+    assert await search("x") == ("x", None, {"warning": STALE_WARNING})
+    # A rejected request is reported rather than answered from the stale entry
+    upstream.handler = lambda request: httpx.Response(400, text="bad query")
+    parsed, error, _ = await search("x")
+    assert parsed is None and error == http.RequestError(code=400, message="bad query")
+
+
+# --------------------------------
+# NEGATIVE CACHE
+# --------------------------------
+@pytest.mark.parametrize(
+    "response",
+    [httpx.Response(404, text="not found"), httpx.Response(200, json={"results": []})],
+)
+async def test_missing_results_are_negatively_cached_until_they_expire(upstream, clock, response):
+    upstream.handler = lambda request: response
+    first = await request_api_with_headers(SEARCH_URL, {"query": "x"}, Search)
+    assert await request_api_with_headers(SEARCH_URL, {"query": "x"}, Search) == first
+    assert len(upstream.requests) == 1
+
+    clock.offset = settings.NEGATIVE_CACHE_TTL + 1
+    upstream.handler = search_handler
+    parsed, error, _ = await request_api_with_headers(SEARCH_URL, {"query": "x"}, Search)
+    assert parsed == Search(results=[Entry(primaryAccession="x")]) and error is None
+    assert len(upstream.requests) == 2
+
+
+async def test_upstream_failures_are_not_negatively_cached(upstream):
+    upstream.handler = lambda request: httpx.Response(503, text="unavailable")
+    await request_api(SEARCH_URL, {"query": "x"}, Search)
+    await request_api(SEARCH_URL, {"query": "x"}, Search)
+    assert len(upstream.requests) == 2
+
+
+# --------------------------------
+# SUPERSET LOOKUP
+# --------------------------------
+async def test_fields_are_answered_from_a_cached_superset(upstream):
+    upstream.handler = search_handler
+
+    async def fetch(fields):
+        request = {"query": "x", "fields": fields}
+        return await request_api_with_headers(SEARCH_URL, request, Search, superset_lookup=True)
+
+    full = await fetch("accession,gene_names,length")
+    upstream.flush()
+    assert await fetch("gene_names,accession") == full
+    assert len(upstream.requests) == 1
+    # Fields outside the cached selection need a request of their own
+    await fetch("accession,sequence")
+    assert len(upstream.requests) == 2
+
+
+async def test_superset_lookup_is_opt_in(upstream):
+    upstream.handler = search_handler
+    await request_api_with_headers(
+        SEARCH_URL, {"query": "x", "fields": "accession,length"}, Search, superset_lookup=True
+    )
+    upstream.flush()
+    await request_api_with_headers(SEARCH_URL, {"query": "x", "fields": "accession"}, Search)
+    assert len(upstream.requests) == 2
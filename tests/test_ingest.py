@@ -0,0 +1,64 @@
+import gzip
+import json
+
+import httpx
+import pytest
+
+from uniprot_mcp.ingest import ingest, ingest_query
+from uniprot_mcp.store import LocalStore
+
+ENTRIES = [
+    {"primaryAccession": "P01308", "genes": [{"geneName": {"value": "INS"}}], "organism": {"taxonId": 9606}},
+    {"primaryAccession": "P01275", "genes": [{"geneName": {"value": "GCG"}}], "organism": {"taxonId": 9606}},
+    {"primaryAccession": "P01315", "genes": [{"geneName": {"value": "Ins1"}}], "organism": {"taxonId": 10090}},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalStore(str(tmp_path / "store.sqlite"))
+    yield store
+    store.connection.close()
+
+
+def accessions(store, query):
+    return sorted(result["primaryAccession"] for result in store.search(query))
+
+
+def test_ingest_gzipped_json_dump(tmp_path, store):
+    path = tmp_path / "dump.json.gz"
+    path.write_bytes(gzip.compress(json.dumps({"results": ENTRIES}).encode()))
+    assert ingest(str(path), store, batch_size=2, report=lambda line: None) == 3
+    assert accessions(store, "organism_id:9606") == ["P01275", "P01308"]
+
+
+def test_ingest_tsv_dump(tmp_path, store):
+    path = tmp_path / "dump.tsv"
+    path.write_text("Entry\tGene Names\tOrganism (ID)\nP01308\tINS\t9606\nP01315\tIns1 Ins-1\t10090\n")
+    assert ingest(str(path), store, report=lambda line: None) == 2
+    assert accessions(store, "gene:Ins-1") == ["P01315"]
+
+
+async def test_ingest_query_streams_every_entry(upstream, store):
+    body = json.dumps({"results": ENTRIES}).encode()
+
+    async def chunks():
+        # One byte per chunk, so entries are decoded across chunk boundaries
+        for i in range(len(body)):
+            yield body[i : i + 1]
+
+    upstream.handler = lambda request: httpx.Response(200, content=chunks())
+    assert await ingest_query("gene:INS OR gene:GCG OR gene:Ins1", store, batch_size=2, report=lambda line: None) == 3
+    assert accessions(store, "organism_id:10090") == ["P01315"]
+    [request] = upstream.requests
+    assert request.url.path == "/uniprotkb/stream"
+    assert request.url.params["query"] == "gene:INS OR gene:GCG OR gene:Ins1"
+    assert "fields" not in request.url.params
+
+
+async def test_ingest_query_errors(upstream, store):
+    upstream.handler = lambda request: httpx.Response(500, text="down")
+    with pytest.raises(RuntimeError, match="API Error 500"):
+        await ingest_query("gene:INS", store, report=lambda line: None)
+    with pytest.raises(ValueError):
+        await ingest_query("gene:(INS", store, report=lambda line: None)
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from uniprot_mcp.utils.jsonstream import JSONArrayItemDecoder
+
+ITEMS = [
+    {"primaryAccession": "P01308", "names": ["Insulin", "ÄÖü ✓"], "nested": {"a": [1, {"b": "]}"}]}},
+    {"primaryAccession": "P69905", "quote": 'say "hi" \\ [', "empty": {}},
+    [],
+    "string item",
+    3.5,
+]
+DOCUMENT = json.dumps({"facets": {"results": [0]}, "results": ITEMS, "after": [1, 2]}, ensure_ascii=False).encode()
+
+
+def decode(chunks):
+    decoder = JSONArrayItemDecoder()
+    items = [item for chunk in chunks for item in decoder.feed(chunk)]
+    return items + decoder.close()
+
+
+def test_whole_document():
+    assert decode([DOCUMENT]) == ITEMS
+
+
+def test_every_split_point():
+    # Includes splits inside strings, escapes, multi-byte characters and the key itself
+    for split in range(len(DOCUMENT) + 1):
+        assert decode([DOCUMENT[:split], DOCUMENT[split:]]) == ITEMS, split
+
+
+def test_byte_by_byte():
+    assert decode([DOCUMENT[i : i + 1] for i in range(len(DOCUMENT))]) == ITEMS
+
+
+def test_complete_items_are_returned_before_the_end():
+    decoder = JSONArrayItemDecoder()
+    first, second = (json.dumps(item).encode() for item in ITEMS[:2])
+    assert decoder.feed(b'{"results": [' + first + b", " + second[:-1]) == [ITEMS[0]]
+    # An incomplete item is retried once the buffer has doubled, or at the end
+    assert decoder.feed(second[-1:] + b"]}") + decoder.close() == [ITEMS[1]]
+
+
+def test_numbers_split_across_chunks():
+    assert decode([b'{"results": [12', b"3.4", b"5e1", b"0, 7]}"]) == [123.45e10, 7]
+    assert decode([b'{"results": [true, nu', b"ll, 1]", b"}"]) == [True, None, 1]
+
+
+def test_other_key():
+    assert decode([b'{"results": [1], "items": [2, 3]}']) == [1]
+    decoder = JSONArrayItemDecoder("items")
+    assert decoder.feed(b'{"results": [1], "items": [2, 3]}') + decoder.close() == [2, 3]
+
+
+def test_empty_array():
+    assert decode([b'{"results": []}']) == []
+
+
+@pytest.mark.parametrize("document", [b'{"results": [{"a": 1}, {"b"', b'{"results": [1, 2'])
+def test_truncated_stream_raises(document):
+    with pytest.raises(ValueError):
+        decode([document])
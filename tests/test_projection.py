@@ -0,0 +1,53 @@
+import pytest
+
+from uniprot_mcp.tools.models import UniProtSearchResponse
+from uniprot_mcp.tools.projection import entry_keys, projected_response_model
+
+ENTRY = {
+    "entryType": "UniProtKB reviewed (Swiss-Prot)",
+    "primaryAccession": "P01308",
+    "secondaryAccessions": ["Q5EEX2"],
+    "uniProtkbId": "INS_HUMAN",
+    "annotationScore": 5.0,
+    "organism": {"scientificName": "Homo sapiens", "taxonId": 9606, "lineages": ["Eukaryota", "Metazoa"]},
+    "proteinExistence": "1: Evidence at protein level",
+    "proteinDescription": {"recommendedName": {"fullName": {"value": "Insulin"}}},
+    "genes": [{"geneName": {"value": "INS"}}],
+    "comments": [{"commentType": "FUNCTION", "texts": [{"value": "Decreases blood glucose."}]}],
+    "features": [
+        {
+            "type": "Chain",
+            "location": {"start": {"value": 25, "modifier": "EXACT"}, "end": {"value": 54, "modifier": "EXACT"}},
+            "description": "Insulin B chain",
+        }
+    ],
+    "keywords": [{"id": "KW-0119", "category": "Biological process", "name": "Carbohydrate metabolism"}],
+    "uniProtKBCrossReferences": [{"database": "PDB", "id": "1A7F", "properties": [{"key": "Method", "value": "NMR"}]}],
+    "sequence": {"value": "MALWMRLLPLL", "length": 11, "molWeight": 1000, "crc64": "0", "md5": "0"},
+    "extraAttributes": {"uniParcId": "UPI000002A1E8"},
+}
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        "accession",
+        "accession,gene_names,organism_name",
+        "sequence,length,sec_acc",
+        "cc_function,ft_chain,xref_pdb,keyword",
+        "accession,protein_name,annotation_score,protein_existence,id",
+    ],
+)
+def test_projection_matches_the_full_model_filtered_to_the_fields(fields):
+    keys = entry_keys(fields)
+    assert keys is not None
+    full = UniProtSearchResponse.model_validate({"results": [ENTRY]}).model_dump(exclude_none=True)
+    expected = [{key: value for key, value in entry.items() if key in keys} for entry in full["results"]]
+    projected = projected_response_model(fields).model_validate({"results": [ENTRY]})
+    assert projected.model_dump(exclude_none=True)["results"] == expected
+
+
+def test_unknown_fields_use_the_full_model():
+    assert entry_keys("accession,some_new_field") is None
+    assert projected_response_model("accession,some_new_field") is UniProtSearchResponse
+    assert projected_response_model("accession,gene_names") is projected_response_model("accession,gene_names")
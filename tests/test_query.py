@@ -0,0 +1,157 @@
+from typing import Dict, Set
+
+import pytest
+
+from uniprot_mcp.utils.query import (
+    And,
+    Not,
+    Or,
+    Postings,
+    QueryPlanner,
+    QuerySyntaxError,
+    Range,
+    Term,
+    UnsupportedQueryError,
+    parse_query,
+)
+
+
+def term(value: str, field: str | None = None) -> Term:
+    return Term(field=field, value=value)
+
+
+# --------------------------------
+# PARSER
+# --------------------------------
+def test_and_binds_tighter_than_or():
+    assert parse_query("a OR b c") == Or(children=(term("a"), And(children=(term("b"), term("c")))))
+    assert parse_query("a b OR c") == Or(children=(And(children=(term("a"), term("b"))), term("c")))
+
+
+def test_explicit_and_matches_implicit_and():
+    assert parse_query("a AND b") == parse_query("a b")
+
+
+def test_not_applies_to_the_next_term_only():
+    assert parse_query("NOT a b") == And(children=(Not(child=term("a")), term("b")))
+    assert parse_query("a NOT b") == And(children=(term("a"), Not(child=term("b"))))
+
+
+def test_parentheses_override_precedence():
+    assert parse_query("(a OR b) c") == And(children=(Or(children=(term("a"), term("b"))), term("c")))
+
+
+def test_field_group_applies_field_to_each_term():
+    assert parse_query("gene:(INS OR GCG) organism_id:9606") == And(
+        children=(Or(children=(term("INS", "gene"), term("GCG", "gene"))), term("9606", "organism_id"))
+    )
+
+
+def test_phrases_ranges_and_prefixes():
+    phrase, prefix = parse_query('"x y" z*').children
+    assert phrase == Term(value="x y", phrase=True)
+    assert prefix.prefix and not phrase.prefix
+    assert parse_query("length:[10 TO *}") == Range(field="length", low="10", high="*", include_high=False)
+
+
+def test_lowercase_operators_are_terms():
+    assert parse_query("a or b") == And(children=(term("a"), term("or"), term("b")))
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["", "   ", "(a", "a)", "()", "a AND", "OR a", "a OR OR b", "NOT", "gene:", '"unterminated', "length:[1 TO"],
+)
+def test_malformed_queries_are_rejected(query):
+    with pytest.raises(QuerySyntaxError):
+        parse_query(query)
+
+
+def test_malformed_range_is_rejected():
+    with pytest.raises(QuerySyntaxError, match="Malformed range"):
+        parse_query("length:[1 2]")
+
+
+def test_str_round_trips():
+    for query in ["a OR b AND c", "gene:INS NOT reviewed:false", '(a OR b) AND "x y"', "length:{1 TO 5]"]:
+        assert parse_query(str(parse_query(query))) == parse_query(query)
+
+
+# --------------------------------
+# PLANNER
+# --------------------------------
+class DictIndex:
+    """Posting lists held in a dict, recording which terms were read."""
+
+    def __init__(self, postings: Dict[str, Set[int]], universe: Set[int]):
+        self._postings = postings
+        self._universe = universe
+        self.read: list[str] = []
+
+    def estimate(self, term):
+        if str(term) not in self._postings:
+            raise UnsupportedQueryError(str(term))
+        return len(self._postings[str(term)])
+
+    def postings(self, term):
+        self.read.append(str(term))
+        return self._postings[str(term)]
+
+    def count(self):
+        return len(self._universe)
+
+
+@pytest.fixture
+def index():
+    return DictIndex(
+        {"a": {1, 2, 3}, "b": {2, 3, 4}, "c": {3}, "empty": set(), "*": {1, 2, 3, 4, 5}}, universe={1, 2, 3, 4, 5}
+    )
+
+
+def evaluate(index, query: str) -> Set[int]:
+    result = QueryPlanner(index).evaluate(parse_query(query))
+    return index._universe - result.ids if result.complement else result.ids
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("a b", {2, 3}),
+        ("a OR b", {1, 2, 3, 4}),
+        ("a NOT b", {1}),
+        ("NOT a", {4, 5}),
+        ("NOT a NOT b", {5}),
+        ("NOT (a OR b)", {5}),
+        ("a NOT (b NOT c)", {1, 3}),
+        ("(a OR b) NOT c", {1, 2, 4}),
+        ("a OR NOT b", {1, 2, 3, 5}),
+        ("NOT a OR NOT c", {1, 2, 4, 5}),
+        ("* NOT a", {4, 5}),
+        ("* OR a", {1, 2, 3, 4, 5}),
+    ],
+)
+def test_evaluation(index, query, expected):
+    assert evaluate(index, query) == expected
+
+
+def test_intersection_starts_with_cheapest_term(index):
+    assert evaluate(index, "a b c") == {3}
+    assert index.read[0] == "c"
+
+
+def test_negations_evaluate_to_complements(index):
+    assert QueryPlanner(index).evaluate(parse_query("NOT a NOT b")) == Postings({1, 2, 3, 4}, complement=True)
+    assert QueryPlanner(index).evaluate(parse_query("b NOT a")) == Postings({4})
+    assert QueryPlanner(index).evaluate(parse_query("*")) == Postings(set(), complement=True)
+    assert "*" not in index.read
+
+
+def test_empty_term_short_circuits(index):
+    assert evaluate(index, "a b empty") == set()
+    assert index.read == []
+
+
+def test_unsupported_term_fails_before_reading_postings(index):
+    with pytest.raises(UnsupportedQueryError):
+        evaluate(index, "a OR unknown")
+    assert index.read == []
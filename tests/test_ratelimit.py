@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from uniprot_mcp.settings import settings
+from uniprot_mcp.utils import ratelimit
+from uniprot_mcp.utils.ratelimit import RateLimitStats, TokenBucket, get_rate_limiter
+
+
+class Clock:
+    """A monotonic clock that `asyncio.sleep` advances instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock)
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+async def test_burst_goes_through_immediately(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [await bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert clock.sleeps == []
+
+
+async def test_requests_after_the_burst_are_spaced_out(clock):
+    bucket = TokenBucket(rate=2, burst=1, host="spaced.example.org")
+    waits = [await bucket.acquire() for _ in range(4)]
+    assert waits == [0, 0.5, 0.5, 0.5]
+    assert bucket.stats == RateLimitStats(acquired=4, total_wait=1.5)
+
+
+async def test_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    await bucket.acquire()
+    await bucket.acquire()
+    clock.now += 0.75
+    assert await bucket.acquire() == 0
+    assert await bucket.acquire() == pytest.approx(0.25)
+
+
+async def test_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    clock.now += 60
+    waits = [await bucket.acquire() for _ in range(3)]
+    assert waits[:2] == [0, 0]
+    assert waits[2] == pytest.approx(0.1)
+
+
+async def test_concurrent_waiters_are_served_in_order(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    order: list[int] = []
+
+    async def acquire(n: int) -> None:
+        await bucket.acquire()
+        order.append(n)
+
+    await asyncio.gather(*(acquire(n) for n in range(4)))
+    assert order == [0, 1, 2, 3]
+    assert clock.now == pytest.approx(1003)
+
+
+async def test_get_rate_limiter(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_SECOND", 0)
+    assert get_rate_limiter("rest.uniprot.org") is None
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_SECOND", 5)
+    limiter = get_rate_limiter("rest.uniprot.org")
+    assert limiter is get_rate_limiter("rest.uniprot.org")
+    assert limiter is not get_rate_limiter("other.example.org")
@@ -0,0 +1,92 @@
+import pytest
+
+from uniprot_mcp.store import LocalStore
+from uniprot_mcp.utils.query import UnsupportedQueryError
+
+
+def entry(accession, gene, taxon_id=9606, name="Insulin", reviewed=True, proteome="UP000005640"):
+    return {
+        "primaryAccession": accession,
+        "entryType": "UniProtKB reviewed (Swiss-Prot)" if reviewed else "UniProtKB unreviewed (TrEMBL)",
+        "organism": {"taxonId": taxon_id},
+        "genes": [{"geneName": {"value": gene}, "synonyms": [{"value": f"{gene}-SYN"}]}],
+        "proteinDescription": {"recommendedName": {"fullName": {"value": name}}},
+        "uniProtKBCrossReferences": [{"database": "Proteomes", "id": proteome}],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalStore(str(tmp_path / "store.sqlite"))
+    store.add_entries([
+        entry("P01308", "INS"),
+        entry("F8WCM5", "INS-IGF2", reviewed=False),
+        entry("P01315", "Ins1", taxon_id=10090, proteome="UP000000589"),
+        entry("P01275", "GCG", name="Glucagon"),
+    ])
+    store.finish()
+    yield store
+    store.connection.close()
+
+
+def search(store, query):
+    return sorted(result["primaryAccession"] for result in store.search(query))
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("gene:INS", ["F8WCM5", "P01308"]),
+        ("gene_exact:INS", ["P01308"]),
+        ("gene_exact:ins", ["P01308"]),
+        ("gene_exact:INS-SYN", ["P01308"]),
+        ("gene_exact:INS-IGF2", ["F8WCM5"]),
+        ("insulin NOT gene_exact:INS", ["F8WCM5", "P01315"]),
+        ("NOT reviewed:false", ["P01275", "P01308", "P01315"]),
+        ("NOT insulin", ["P01275"]),
+        ("*", ["F8WCM5", "P01275", "P01308", "P01315"]),
+        ("accession:P01308", ["P01308"]),
+        ("organism_id:10090", ["P01315"]),
+        ("proteome:UP000000589", ["P01315"]),
+        ("reviewed:false", ["F8WCM5"]),
+        ("glucagon OR gene:ins1", ["P01275", "P01315"]),
+    ],
+)
+def test_fielded_queries(store, query, expected):
+    assert search(store, query) == expected
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("P01308", ["P01308"]),
+        ("p01308", ["P01308"]),
+        ("10090", ["P01315"]),
+        ("UP000000589", ["P01315"]),
+        ("P01308 insulin", ["P01308"]),
+        ("insulin", ["F8WCM5", "P01308", "P01315"]),
+    ],
+)
+def test_free_text_matches_key_columns(store, query, expected):
+    assert search(store, query) == expected
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Q99999",  # possibly a secondary accession, or not ingested
+        "P01308-2",
+        "gene_exact:IN*",
+        "organism_name:human",
+        "length:[1 TO 100]",
+    ],
+)
+def test_unanswerable_queries_fall_back(store, query):
+    with pytest.raises(UnsupportedQueryError):
+        store.search(query)
+
+
+def test_replaced_entries_are_reindexed(store):
+    store.add_entries([entry("P01308", "INSX")])
+    assert search(store, "gene_exact:INS") == []
+    assert search(store, "gene_exact:INSX") == ["P01308"]